@@ -0,0 +1,63 @@
+"""ParallelZipWriter ile tek çekirdekli zipfile karşılaştırması.
+
+Kullanım: python benchmarks/bench_archiver.py [dosya sayısı] [dosya boyutu MB]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from archiver import DEFAULT_LEVEL, ParallelZipWriter
+
+
+def main():
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    file_mb = float(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    workdir = tempfile.mkdtemp(prefix="archiver_bench_")
+    try:
+        words = [bytes(random.choices(b"abcdefghijklmnopqrstuvwxyz", k=random.randint(2, 9))) for _ in range(5000)]
+        sources = []
+        for i in range(file_count):
+            path = os.path.join(workdir, f"kaynak_{i}.txt")
+            with open(path, "wb") as f:
+                written = 0
+                while written < file_mb * 1024 * 1024:
+                    line = b" ".join(random.choices(words, k=12)) + b"\n"
+                    f.write(line)
+                    written += len(line)
+            sources.append(path)
+        total_mb = sum(os.path.getsize(p) for p in sources) / (1024 * 1024)
+        print(f"{file_count} dosya, toplam {total_mb:.0f} MB, {os.cpu_count()} çekirdek")
+
+        target = os.path.join(workdir, "zipfile.zip")
+        started = time.perf_counter()
+        with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED, compresslevel=DEFAULT_LEVEL) as zipf:
+            for path in sources:
+                zipf.write(path, arcname=os.path.basename(path))
+        baseline = time.perf_counter() - started
+        print(f"zipfile (tek çekirdek): {baseline:6.2f} sn  {total_mb / baseline:7.1f} MB/sn  "
+              f"{os.path.getsize(target) / (1024 * 1024):.1f} MB")
+
+        for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+            target = os.path.join(workdir, f"parallel_{workers}.zip")
+            started = time.perf_counter()
+            with ParallelZipWriter(target, workers=workers) as writer:
+                for member in writer.write_members((p, os.path.basename(p)) for p in sources):
+                    assert member.ok, member.error
+            elapsed = time.perf_counter() - started
+            with zipfile.ZipFile(target) as zipf:
+                assert zipf.testzip() is None
+            print(f"paralel, {workers} işçi:     {elapsed:6.2f} sn  {total_mb / elapsed:7.1f} MB/sn  "
+                  f"{os.path.getsize(target) / (1024 * 1024):.1f} MB  (x{baseline / elapsed:.2f})")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
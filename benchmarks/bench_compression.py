@@ -0,0 +1,76 @@
+"""Sıkıştırma politikası ile "her şeyi deflate et" ve tar biçimlerinin karşılaştırması.
+
+Kullanım: python benchmarks/bench_compression.py [her türden dosya sayısı] [dosya boyutu MB]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from archiver import DEFAULT_LEVEL, ParallelZipWriter, open_tar, tar_mode
+from classifier import get_classifier
+from compression import CompressionPolicy
+
+
+def main():
+    per_kind = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    file_mb = float(sys.argv[2]) if len(sys.argv) > 2 else 4
+    size = int(file_mb * 1024 * 1024)
+
+    workdir = tempfile.mkdtemp(prefix="compression_bench_")
+    try:
+        words = [bytes(random.choices(b"abcdefghijklmnopqrstuvwxyz", k=random.randint(2, 9))) for _ in range(5000)]
+        text = b"\n".join(b" ".join(random.choices(words, k=12)) for _ in range(size // 60 + 1))[:size]
+        sources = []
+        # Sıkıştırılmış medya/arşiv (rastgele), metin ve uzantısı bilinmeyen iki tür
+        for ext, payload in ((".jpg", None), (".mp4", None), (".zip", None),
+                             (".txt", text), (".csv", text), (".bin", None), (".dat", text)):
+            for i in range(per_kind):
+                path = os.path.join(workdir, f"dosya_{i}{ext}")
+                with open(path, "wb") as f:
+                    f.write(payload if payload is not None else os.urandom(size))
+                sources.append(path)
+        total = sum(os.path.getsize(p) for p in sources)
+        print(f"{len(sources)} dosya, toplam {total / (1024 * 1024):.0f} MB")
+
+        def run(label, policy):
+            target = os.path.join(workdir, f"{label}.zip")
+            cpu, wall = time.process_time(), time.perf_counter()
+            with ParallelZipWriter(target, workers=1, policy=policy) as writer:
+                for member in writer.write_members((p, os.path.basename(p)) for p in sources):
+                    assert member.ok, member.error
+            cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+            with zipfile.ZipFile(target) as zipf:
+                assert zipf.testzip() is None
+            saved = total - os.path.getsize(target)
+            print(f"{label:<22} {wall:6.2f} sn  CPU {cpu:6.2f} sn  kazanç {saved / (1024 * 1024):7.1f} MB  "
+                  f"{saved / (1024 * 1024) / max(cpu, 1e-9):7.1f} MB/CPU-sn")
+
+        def run_tar(name):
+            target = os.path.join(workdir, name)
+            cpu, wall = time.process_time(), time.perf_counter()
+            with open_tar(target, tar_mode(name)) as tar:
+                for path in sources:
+                    tar.add(path, arcname=os.path.basename(path))
+            cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+            saved = total - os.path.getsize(target)
+            print(f"{name:<22} {wall:6.2f} sn  CPU {cpu:6.2f} sn  kazanç {saved / (1024 * 1024):7.1f} MB  "
+                  f"{saved / (1024 * 1024) / max(cpu, 1e-9):7.1f} MB/CPU-sn")
+
+        classifier = get_classifier()
+        run("hepsi deflate (eski)", lambda path: (zipfile.ZIP_DEFLATED, DEFAULT_LEVEL))
+        run("politika", CompressionPolicy(classifier))
+        run("politika, probe yok", CompressionPolicy(classifier, probe=False))
+        for name in ("arsiv.tar.gz", "arsiv.tar.bz2", "arsiv.tar.xz"):
+            run_tar(name)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
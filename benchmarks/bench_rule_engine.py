@@ -0,0 +1,53 @@
+"""Kural indeksi ile her dosyayı tüm kurallarda sırayla denemenin karşılaştırması.
+
+Kullanım: python benchmarks/bench_rule_engine.py
+"""
+import fnmatch
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from rule_engine import RuleEngine, _split_pattern
+
+
+def models_for(count):
+    models = []
+    for i in range(count):
+        kind = i % 3
+        pattern = f"*.e{i}" if kind == 0 else (f"p{i}_*" if kind == 1 else f"*.e{i}, report{i}.txt")
+        models.append({"name": f"kural {i}", "pattern": pattern, "target": f"Hedef{i}", "active": True})
+    # Birkaç indekslenemeyen kalıp da her dosyada denenir
+    models.append({"name": "genel", "pattern": "*backup*", "target": "Yedek", "active": True})
+    return models
+
+
+def main():
+    names = [f"{prefix}{i}.{ext}" for i in range(5000)
+             for prefix, ext in (("IMG_", "jpg"), ("scan", "pdf"), ("p17_", "e42"), ("note", "txt"))]
+
+    print(f"{'kural':>6} | {'indeksli µs/dosya':>18} | {'doğrusal µs/dosya':>18}")
+    for count in (10, 100, 1000, 5000):
+        models = models_for(count)
+        engine = RuleEngine(models)
+        started = time.perf_counter()
+        matched = sum(1 for name in names if engine.match(name) is not None)
+        indexed = (time.perf_counter() - started) / len(names) * 1e6
+
+        # Karşılaştırma: her dosya tüm kurallara sırayla
+        linear_rules = [(fnmatch.translate(glob), model) for model in models
+                        for glob in _split_pattern(model["pattern"])]
+        linear_rules = [(re.compile(rx).match, model) for rx, model in linear_rules]
+        sample = names[:2000]
+        started = time.perf_counter()
+        for name in sample:
+            lname = name.lower()
+            next((model for test, model in linear_rules if test(lname)), None)
+        linear = (time.perf_counter() - started) / len(sample) * 1e6
+        print(f"{count:>6} | {indexed:>18.2f} | {linear:>18.2f}   ({matched} eşleşme)")
+
+
+if __name__ == "__main__":
+    main()
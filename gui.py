@@ -8,6 +8,8 @@ import os
 import datetime
 import asyncio
 from organizer import Organizer
+from rule_engine import load_models, save_models
+from reporter import get_stats, get_summary, format_bytes
 
 
 # Renk Paleti - Modern & Premium Dark
@@ -22,6 +24,17 @@ COLOR_TEXT_PRIMARY = "#ffffff"    # Ana metin
 COLOR_TEXT_SECONDARY = "#9ca3af"  # İkincil metin
 COLOR_INFO = "#3b82f6"        # Bilgi mavisi
 
+# Panoda gösterilen kategori kartı ve son işlem sayısı
+DASHBOARD_CATEGORY_CARDS = 4
+DASHBOARD_RECENT_ROWS = 8
+CATEGORY_ICONS = {
+    "Images": (ft.Icons.IMAGE, "blue500"),
+    "Video": (ft.Icons.VIDEO_FILE, "purple500"),
+    "Documents": (ft.Icons.DESCRIPTION, "teal500"),
+    "Audio": (ft.Icons.AUDIO_FILE, "pink500"),
+    "Archives": (ft.Icons.ARCHIVE, "amber500"),
+}
+
 async def main(page: ft.Page):
     # ========================================================================
     # AYARLAR & DURUM
@@ -42,11 +55,8 @@ async def main(page: ft.Page):
             "same_folder": True,
             "selected_tab": 0,
             "is_monitoring": False,
-            "models": [
-                {"id": 1, "name": "Resim Düzenleyici", "pattern": "*.jpg, *.png", "target": "Resimler", "active": True},
-                {"id": 2, "name": "Belge Tasnifi", "pattern": "*.pdf, *.docx", "target": "Belgeler", "active": True},
-                {"id": 3, "name": "Video Arşivi", "pattern": "*.mp4, *.mkv", "target": "Videolar", "active": False},
-            ],
+            # Modeller config.json'da saklanır; Watcher ve toplu düzenleme bunlara göre yönlendirir
+            "models": load_models(),
             "logs": [],
             "stats": {
                 "total": 0,
@@ -167,7 +177,10 @@ async def main(page: ft.Page):
             
         try:
             org = Organizer()
-            preview_files = org.get_preview(source, dest)
+            # Büyük klasörlerde ilk sayfa hemen gösterilir, kalanı imleçle yüklenir
+            first_page = org.get_preview_page(source, dest)
+            preview_files = first_page["items"]
+            next_cursor = {"value": first_page["next_cursor"]}
             
             if not preview_files:
                 show_notification("Organize edilecek dosya bulunamadı.", "warning")
@@ -188,8 +201,31 @@ async def main(page: ft.Page):
                 selected_files[path] = val
 
             file_list_container = ft.Column(scroll="always", max_height=400, spacing=10)
+            count_text = ft.Text(size=14, color=c["secondary"])
+            load_more_button = ft.TextButton("Daha Fazla Yükle")
+
+            def update_count_text():
+                suffix = " (devamı var)" if next_cursor["value"] else ""
+                count_text.value = f"Toplam {len(preview_files)} dosya bulundu{suffix}."
+                load_more_button.visible = bool(next_cursor["value"])
+
+            def load_more(_):
+                result = org.get_preview_page(cursor=next_cursor["value"])
+                if result is None:
+                    # İmlecin süresi dolmuş
+                    next_cursor["value"] = None
+                    show_notification("Önizleme süresi doldu, lütfen tekrar başlatın.", "warning")
+                else:
+                    for f in result["items"]:
+                        selected_files[f["path"]] = True
+                    preview_files.extend(result["items"])
+                    next_cursor["value"] = result["next_cursor"]
+                update_dialog_content()
+
+            load_more_button.on_click = load_more
 
             def update_dialog_content():
+                update_count_text()
                 file_list_container.controls.clear()
                 for f in preview_files:
                     is_selected = selected_files[f["path"]]
@@ -236,11 +272,12 @@ async def main(page: ft.Page):
                     width=600,
                     content=ft.Column([
                         ft.Row([
-                            ft.Text(f"Toplam {len(preview_files)} dosya bulundu.", size=14, color=c["secondary"]),
+                            count_text,
                             ft.Checkbox(label="Tümünü Seç", value=True, on_change=toggle_all)
                         ], alignment="spaceBetween"),
                         ft.Divider(color=c["border"]),
-                        file_list_container
+                        file_list_container,
+                        load_more_button
                     ], tight=True)
                 ),
                 actions=[
@@ -319,6 +356,20 @@ async def main(page: ft.Page):
 
     def build_dashboard():
         c = get_colors()
+        # İstatistikler olay journal'ından (artımlı okunur, metin ayrıştırma yok)
+        try:
+            summary = get_summary()
+        except Exception:
+            summary = {"categories": {}, "recent": []}
+        # Dönem toplamları saatlik/günlük özet deposundan (milisaniyeler)
+        period_totals = {}
+        for period in ("24h", "week"):
+            try:
+                stats = get_stats(period, top=1) or {}
+            except Exception:
+                stats = {}
+            by_category = stats.get("by_category", {}).values()
+            period_totals[period] = (sum(v["files"] for v in by_category), sum(v["bytes"] for v in by_category))
         return ft.Column([
             # Organizasyon İlerlemesi
             ft.Container(
@@ -332,6 +383,10 @@ async def main(page: ft.Page):
                     ft.Container(height=10),
                     ft.ProgressBar(value=1.0 if (page.app_state['stats']['total'] or 0) <= 0 else page.app_state['stats']['organized'] / page.app_state['stats']['total'], color=COLOR_SUCCESS, bgcolor=c["border"], height=10, border_radius=5),
                     ft.Text(f"%{(0.0 if (page.app_state['stats']['total'] or 0) <= 0 else page.app_state['stats']['organized'] / page.app_state['stats']['total'] * 100):.1f} tamamlandı", size=12, italic=True, color=c["secondary"]),
+                    ft.Text(
+                        f"Son 24 saat: {period_totals['24h'][0]} dosya ({format_bytes(period_totals['24h'][1])})  •  "
+                        f"Bu hafta: {period_totals['week'][0]} dosya ({format_bytes(period_totals['week'][1])})",
+                        size=12, color=c["secondary"]),
                 ], spacing=5)
             ),
             
@@ -340,26 +395,15 @@ async def main(page: ft.Page):
                     bgcolor=c["surface"], padding=20, border_radius=15, expand=True,
                     border=ft.Border.all(1, c["border"]),
                     content=ft.Row([
-                        ft.Container(ft.Icon(ft.Icons.IMAGE, color="white"), bgcolor="blue500", padding=12, border_radius=10),
+                        ft.Container(ft.Icon(CATEGORY_ICONS.get(cat, (ft.Icons.FOLDER, "grey500"))[0], color="white"),
+                                     bgcolor=CATEGORY_ICONS.get(cat, (ft.Icons.FOLDER, "grey500"))[1], padding=12, border_radius=10),
                         ft.Column([
-                            ft.Text("Görseller", weight="bold"),
-                            ft.Text("124 Dosya", size=12, color=c["secondary"]),
-                            ft.Text("2.4 GB", size=16, weight="bold")
+                            ft.Text(cat, weight="bold"),
+                            ft.Text(f"{info['count']} Dosya", size=12, color=c["secondary"]),
+                            ft.Text(format_bytes(info["bytes"]), size=16, weight="bold")
                         ], spacing=2)
                     ])
-                ),
-                ft.Container(
-                    bgcolor=c["surface"], padding=20, border_radius=15, expand=True,
-                    border=ft.Border.all(1, c["border"]),
-                    content=ft.Row([
-                        ft.Container(ft.Icon(ft.Icons.VIDEO_FILE, color="white"), bgcolor="purple500", padding=12, border_radius=10),
-                        ft.Column([
-                            ft.Text("Videolar", weight="bold"),
-                            ft.Text("18 Dosya", size=12, color=c["secondary"]),
-                            ft.Text("8.7 GB", size=16, weight="bold")
-                        ], spacing=2)
-                    ])
-                ),
+                ) for cat, info in list(summary["categories"].items())[:DASHBOARD_CATEGORY_CARDS]
             ], spacing=20),
 
             ft.Text("Son İşlemler", size=18, weight="bold", color=c["text"]),
@@ -372,16 +416,11 @@ async def main(page: ft.Page):
                 content=ft.Column([
                     ft.Row([
                         ft.Row([ft.Container(width=10, height=10, bgcolor=COLOR_SUCCESS, border_radius=5), 
-                               ft.Text("vacation_photo.jpg", color=c["text"], weight="w500")]),
-                        ft.Text("14:32:18", size=12, color=c["secondary"])
-                    ], alignment="spaceBetween"),
-                    ft.Divider(color=c["border"], height=20),
-                    ft.Row([
-                        ft.Row([ft.Container(width=10, height=10, bgcolor=COLOR_SUCCESS, border_radius=5), 
-                               ft.Text("project_backup.zip", color=c["text"], weight="w500")]),
-                        ft.Text("14:31:42", size=12, color=c["secondary"])
-                    ], alignment="spaceBetween"),
-                ])
+                               ft.Text(event["name"], color=c["text"], weight="w500")]),
+                        ft.Text(datetime.datetime.fromtimestamp(event["ts"]).strftime("%H:%M:%S"), size=12, color=c["secondary"])
+                    ], alignment="spaceBetween")
+                    for event in summary["recent"][:DASHBOARD_RECENT_ROWS]
+                ] or [ft.Text("Henüz işlem yok.", size=12, color=c["secondary"])])
             )
         ], spacing=20, expand=True, scroll="auto")
 
@@ -393,10 +432,12 @@ async def main(page: ft.Page):
                 if m["id"] == model_id:
                     m["active"] = not m["active"]
                     break
+            save_models(page.app_state["models"])
             await build_ui()
 
         async def delete_model(model_id):
             page.app_state["models"] = [m for m in page.app_state["models"] if m["id"] != model_id]
+            save_models(page.app_state["models"])
             show_notification("Model silindi.", "warning")
             await build_ui()
 
@@ -415,6 +456,7 @@ async def main(page: ft.Page):
                     "target": target_ref.current.value,
                     "active": True
                 })
+                save_models(page.app_state["models"])
                 dlg.open = False
                 show_notification("Yeni model eklendi.", "success")
                 asyncio.create_task(build_ui())
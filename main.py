@@ -1,5 +1,6 @@
 import sys
 import os
+import argparse
 
 # src klasörünü path'e ekle (Modüllerin birbirini bulması için)
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -10,6 +11,7 @@ from watcher import start_watching
 from reporter import generate_report
 from organizer import Organizer
 from filter_engine import FilterEngine
+from filter_expr import FilterExpressionError
 
 def prompt_list(prompt_text: str) -> list:
     raw = input(prompt_text + " (virgülle ayır, boş bırakma): ")
@@ -17,7 +19,14 @@ def prompt_list(prompt_text: str) -> list:
         return []
     return [p.strip() for p in raw.split(',') if p.strip()]
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Dosya Düzenleme Otomasyonu")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Paralel taşıma işçi sayısı (varsayılan: config.json batch.jobs)")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
     print("DOSYA DÜZENLEME OTOMASYONU v1.0")
     print("1. Mevcut Klasörü Düzenle (Tara ve Taşı)")
     print("2. Otomatik İzlemeyi Başlat (Watcher Modu)")
@@ -29,7 +38,7 @@ def main():
     
     if secim == '1':
         print("Tarama başlıyor...")
-        org = Organizer()
+        org = Organizer(jobs=args.jobs)
         org.scan_directory()
     elif secim == '2':
         start_watching()
@@ -37,10 +46,11 @@ def main():
         generate_report()
     elif secim == '4':
         # Interactive FilterEngine run
-        engine = FilterEngine()
+        engine = FilterEngine(jobs=args.jobs)
         print('\n== Filter Engine Çalıştırma ==')
         exts = prompt_list('Uzantılar (örn: .jpg,.png)')
         cats = prompt_list('Kategoriler (örn: Images,Documents)')
+        expression = input('Filtre ifadesi (opsiyonel, örn: (*.jpg, *.png) and size>1MB and mtime>7d): ').strip()
         try:
             min_mb = float(input('Min boyut (MB, boş bırak = 0): ') or 0)
         except ValueError:
@@ -61,11 +71,16 @@ def main():
             'size_max_mb': max_mb,
             'extensions': exts,
             'categories': cats,
+            'expression': expression,
             'use_category_folders': True,
             'archive_name': 'filtered_archive.zip'
         }
 
-        results = engine.execute(filter_conf, organize_mode=mode)
+        try:
+            results = engine.execute(filter_conf, organize_mode=mode)
+        except FilterExpressionError as e:
+            print(f'Geçersiz filtre ifadesi: {e}')
+            return
         print('\n== İşlem Sonuçları ==')
         print(results)
         # Rapor oluştur
@@ -0,0 +1,541 @@
+import os
+import struct
+import sys
+import tarfile
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+# Büyük dosyalar bu boyutta parçalara bölünüp paralel sıkıştırılır
+CHUNK_SIZE = 1024 * 1024
+# Her parça bir önceki parçanın son 32 KB'ı sözlük (zdict) olarak verilerek sıkıştırılır
+DICT_SIZE = 32 * 1024
+DEFAULT_LEVEL = 6
+
+ZIP64_LIMIT = (1 << 31) - 1
+_MAX_UINT32 = 0xFFFFFFFF
+_MAX_UINT16 = 0xFFFF
+
+_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+_CENTRAL_HEADER = struct.Struct("<4sHHHHHHIIIHHHHHII")
+_END_RECORD = struct.Struct("<4sHHHHIIH")
+_END_RECORD64 = struct.Struct("<4sQHHIIQQQQ")
+_END_LOCATOR64 = struct.Struct("<4sIQI")
+
+_STORED = 0
+_DEFLATED = 8
+_FLAG_UTF8 = 0x800
+_CREATE_SYSTEM = 0 if sys.platform == "win32" else 3
+
+
+# Arşiv adının sonuna göre tarfile yazma kipi (sıkıştırma tüm akışa uygulanır)
+TAR_MODES = {
+    ".tar": "w",
+    ".tar.gz": "w:gz", ".tgz": "w:gz",
+    ".tar.bz2": "w:bz2", ".tbz2": "w:bz2",
+    ".tar.xz": "w:xz", ".txz": "w:xz",
+}
+
+
+def tar_mode(archive_name: str) -> Optional[str]:
+    """Ad bir tar arşivini gösteriyorsa tarfile kipini, değilse (ZIP) None döner."""
+    lname = os.fspath(archive_name).lower()
+    for suffix, mode in TAR_MODES.items():
+        if lname.endswith(suffix):
+            return mode
+    return None
+
+
+def open_tar(path, mode: str, level: int = DEFAULT_LEVEL) -> tarfile.TarFile:
+    """tar/tar.gz/tar.bz2/tar.xz arşivi açar; level gz/bz2 için 1-9, xz için preset'tir."""
+    if mode == "w:xz":
+        return tarfile.open(path, mode, preset=level)
+    if mode in ("w:gz", "w:bz2"):
+        return tarfile.open(path, mode, compresslevel=max(1, level))
+    return tarfile.open(path, mode)
+
+
+# Var olan arşiv için davranış: yeni ad seç / sonuna ekle / bilerek değiştir
+ARCHIVE_MODES = ("new", "append", "overwrite")
+
+
+def volume_path(base, number: int) -> str:
+    """İlk cilt arşivin kendisi, sonrakiler 'ad.002.zip', 'ad.003.zip'... olur."""
+    base = os.fspath(base)
+    if number <= 1:
+        return base
+    stem, suffix = os.path.splitext(base)
+    return f"{stem}.{number:03d}{suffix}"
+
+
+def unique_archive_path(base) -> str:
+    """Arşiv (veya ikinci cildi) varsa 'ad_1.zip', 'ad_2.zip'... ile boş bir ad bulur."""
+    base = os.fspath(base)
+    candidate, counter = base, 1
+    stem, suffix = os.path.splitext(base)
+    if suffix.lower() in (".gz", ".bz2", ".xz") and stem.lower().endswith(".tar"):
+        stem, suffix = stem[:-4], ".tar" + suffix
+    while os.path.exists(candidate) or os.path.exists(volume_path(candidate, 2)):
+        candidate = f"{stem}_{counter}{suffix}"
+        counter += 1
+    return candidate
+
+
+def fsync_file(f):
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def fsync_dir(path):
+    """Yeni oluşturulan dosyanın dizin girdisini de diske yazar (Windows'ta desteklenmez)."""
+    if os.name == "nt":
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)) or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _read_end_record(f) -> Tuple[int, int, int]:
+    """Var olan ZIP'in (merkezi dizin konumu, boyutu, kayıt sayısı); ZIP64 dahil."""
+    f.seek(0, os.SEEK_END)
+    file_size = f.tell()
+    tail_size = min(file_size, _END_RECORD.size + _MAX_UINT16)
+    f.seek(file_size - tail_size)
+    tail = f.read(tail_size)
+    pos = tail.rfind(b"PK\x05\x06")
+    if pos < 0:
+        raise ValueError("Geçerli bir ZIP arşivi değil (merkezi dizin sonu bulunamadı)")
+    _, _, _, _, count, cd_size, cd_offset, _ = _END_RECORD.unpack_from(tail, pos)
+    if count == _MAX_UINT16 or cd_size == _MAX_UINT32 or cd_offset == _MAX_UINT32:
+        end_pos = file_size - tail_size + pos
+        f.seek(end_pos - _END_LOCATOR64.size)
+        signature, _, record_offset, _ = _END_LOCATOR64.unpack(f.read(_END_LOCATOR64.size))
+        if signature != b"PK\x06\x07":
+            raise ValueError("Bozuk ZIP64 arşivi")
+        f.seek(record_offset)
+        fields = _END_RECORD64.unpack(f.read(_END_RECORD64.size))
+        count, cd_size, cd_offset = fields[7], fields[8], fields[9]
+    return cd_offset, cd_size, count
+
+
+def _dos_datetime(mtime: float) -> Tuple[int, int]:
+    year, month, day, hour, minute, second = time.localtime(mtime)[:6]
+    if year < 1980:
+        year, month, day, hour, minute, second = 1980, 1, 1, 0, 0, 0
+    return (hour << 11 | minute << 5 | second // 2), ((year - 1980) << 9 | month << 5 | day)
+
+
+def _deflate_chunk(path: str, offset: int, length: int, level: Optional[int],
+                   final: bool) -> Tuple[bytes, Optional[bytes]]:
+    """
+    Dosyanın [offset, offset+length) aralığını ham deflate ile sıkıştırır
+    (işçi iş parçacığında; zlib sıkıştırırken GIL'i bırakır). level None
+    ise parça sadece okunur (saklanacak üye).
+
+    Son parça dışındakiler Z_SYNC_FLUSH ile bayt sınırında biter; parçaların
+    art arda eklenmesi tek ve geçerli bir deflate akışı verir (pigz yöntemi).
+    Önceki 32 KB sözlük olarak verildiği için oran tek parçadakine yakındır.
+    """
+    with open(path, "rb") as f:
+        zdict = b""
+        if level is None:
+            f.seek(offset)
+        elif offset:
+            start = max(0, offset - DICT_SIZE)
+            f.seek(start)
+            zdict = f.read(offset - start)
+        data = f.read(length)
+    if len(data) != length:
+        raise OSError(f"Dosya okunurken boyutu değişti: {path}")
+    if level is None:
+        return data, None
+    if zdict:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15, 8, zlib.Z_DEFAULT_STRATEGY, zdict)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    compressed = compressor.compress(data) + compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+    return data, compressed
+
+
+class ArchivedMember:
+    """Arşive yazılan (veya yazılamayan) tek bir dosyanın sonucu."""
+
+    __slots__ = ("source", "arcname", "size", "compressed_size", "error", "seconds", "volume",
+                 "_name", "_mtime", "_mode", "_zip64", "_offset", "_method", "_crc", "_started")
+
+    def __init__(self, source, arcname: str):
+        self.source = source
+        self.arcname = arcname
+        self.size = 0
+        self.compressed_size = 0
+        self.error: Optional[BaseException] = None
+        self.seconds = 0.0
+        # Üyenin yazıldığı cilt (arşiv dosyası) yolu
+        self.volume: Optional[str] = None
+        self._name = arcname.replace(os.sep, "/").encode("utf-8")
+        self._offset = None
+        self._crc = 0
+        self._started = time.perf_counter()
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ParallelZipWriter:
+    """
+    Akış halinde, ciltlere bölünebilen, paralel sıkıştıran ZIP yazıcı.
+
+    Dosyalar chunk_size parçalar halinde okunur ve parçalar iş parçacığı
+    havuzunda deflate edilir; yazıcı (çağıran iş parçacığı) sıkıştırılmış
+    parçaları sırayla dosyaya ekler ve CRC'yi hesaplar. Her üyenin yerel
+    başlığı üye bitince CRC ve boyutlarla güncellenir. Bellekte en fazla
+    workers * 4 parça bekler; dosya boyutundan bağımsızdır.
+
+    max_volume_bytes > 0 ise bir sonraki üye cildi bu boyutun üstüne
+    çıkaracaksa cilt kapatılır ve 'ad.002.zip' ile devam edilir. Her cilt
+    kendi başına standart bir ZIP'tir (gerektiğinde ZIP64).
+
+    Üyeler, bulundukları cildin merkezi dizini yazılıp fsync edildikten sonra
+    write_members'tan döner; kaynak dosyalar ancak o zaman silinmelidir.
+
+    mode:
+        "new"       arşiv varsa 'ad_1.zip' gibi yeni bir ad seçilir (üzerine yazılmaz)
+        "append"    var olan son cilde eklenir; eski üyeler yeniden sıkıştırılmaz.
+                    zipfile'ın 'a' kipi gibi yeni üyeler eski merkezi dizinin
+                    başladığı yerden yazılır, kapanışta eski dizin kayıtları ile
+                    yenileri sona yazılıp dosya oradan kesilir (ölü kopya kalmaz).
+                    İlk yeni üyenin yazılmasından cilt kapanana kadar çökme
+                    olursa cildin merkezi dizini yoktur; eski ve yeni üyeler
+                    yerel başlıklarından (ör. 'zip -FF') kurtarılabilir, kaynak
+                    dosyalar ise cilt fsync edilmeden silinmediği için yerindedir
+        "overwrite" arşiv (ve eski ciltleri) bilerek değiştirilir
+
+    policy verilirse her üye için (ZIP_STORED/ZIP_DEFLATED, seviye) döner
+    (bkz. compression.CompressionPolicy); saklanacak üyeler hiç sıkıştırılmaz.
+    """
+
+    def __init__(self, path, workers: int = 4, level: int = DEFAULT_LEVEL, chunk_size: int = CHUNK_SIZE,
+                 policy: Optional[Callable[[object], Tuple[int, int]]] = None,
+                 max_volume_bytes: int = 0, mode: str = "new"):
+        if mode not in ARCHIVE_MODES:
+            raise ValueError(f"Geçersiz arşiv modu: {mode} ({', '.join(ARCHIVE_MODES)})")
+        path = os.fspath(path)
+        if mode == "new":
+            path = unique_archive_path(path)
+        elif mode == "overwrite":
+            number = 2
+            while os.path.exists(volume_path(path, number)):
+                os.unlink(volume_path(path, number))
+                number += 1
+        self.path = path
+        self.mode = mode
+        self.workers = max(1, int(workers))
+        self.level = level
+        self.policy = policy
+        self.chunk_size = max(DICT_SIZE, int(chunk_size))
+        self.max_volume_bytes = max(0, int(max_volume_bytes or 0))
+        self.volumes = []
+        self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="zip")
+        self._committed = deque()
+        self._closed = False
+        self._file = None
+
+        number = 1
+        if mode == "append":
+            while os.path.exists(volume_path(path, number + 1)):
+                number += 1
+        self._open_volume(number, append=(mode == "append" and os.path.exists(volume_path(path, number))))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Ciltler
+    # ------------------------------------------------------------------
+    def _open_volume(self, number: int, append: bool = False):
+        self._volume_number = number
+        self._volume_path = volume_path(self.path, number)
+        self._entries = []
+        self._old_directory = b""
+        self._old_count = 0
+        if append:
+            self._file = open(self._volume_path, "r+b")
+            try:
+                cd_offset, cd_size, self._old_count = _read_end_record(self._file)
+                self._file.seek(cd_offset)
+                self._old_directory = self._file.read(cd_size)
+            except Exception:
+                self._file.close()
+                raise
+            # Yeni üyeler eski dizinin yerine yazılır; dizin bellekte tutulup
+            # _finalize_volume'da yeniden yazılır, dosya da oradan kesilir
+            self._file.seek(cd_offset)
+        else:
+            self._file = open(self._volume_path, "wb")
+        self.volumes.append(self._volume_path)
+
+    def _volume_has_members(self) -> bool:
+        return bool(self._entries or self._old_count)
+
+    def _finalize_volume(self):
+        """Merkezi dizini yazar, fsync eder ve cildin üyelerini teslim kuyruğuna alır."""
+        f = self._file
+        self._file = None
+        try:
+            start = f.tell()
+            f.write(self._old_directory)
+            for member in self._entries:
+                f.write(self._central_header(member))
+            end = f.tell()
+            count, size = self._old_count + len(self._entries), end - start
+            if count >= _MAX_UINT16 or start >= _MAX_UINT32 or size >= _MAX_UINT32:
+                f.write(_END_RECORD64.pack(b"PK\x06\x06", 44, 45, 45, 0, 0, count, count, size, start))
+                f.write(_END_LOCATOR64.pack(b"PK\x06\x07", 0, end, 1))
+                count, size, start = min(count, _MAX_UINT16), min(size, _MAX_UINT32), min(start, _MAX_UINT32)
+            f.write(_END_RECORD.pack(b"PK\x05\x06", 0, 0, count, count, size, start, 0))
+            f.truncate()
+            fsync_file(f)
+        finally:
+            f.close()
+        fsync_dir(self._volume_path)
+        self._committed.extend(self._entries)
+        self._entries = []
+
+    def _roll_over(self, member: "ArchivedMember"):
+        # Üye mevcut cildi sınırın üstüne çıkaracaksa yeni cilde geç (tek başına büyük üye hariç)
+        if (self.max_volume_bytes and self._volume_has_members()
+                and self._file.tell() + member.size > self.max_volume_bytes):
+            self._finalize_volume()
+            self._open_volume(self._volume_number + 1,
+                              append=self.mode == "append"
+                              and os.path.exists(volume_path(self.path, self._volume_number + 1)))
+
+    # ------------------------------------------------------------------
+    # Üyeler
+    # ------------------------------------------------------------------
+    def _tasks(self, members: Iterable[Tuple[object, str]]):
+        """Her üye için (üye, parça no, son mu, future) üretir; havuza tembel gönderilir."""
+        for source, arcname in members:
+            member = ArchivedMember(source, arcname)
+            try:
+                st = os.stat(source)
+                method, level = self.policy(source) if self.policy is not None else (_DEFLATED, self.level)
+            except OSError as e:
+                member.error = e
+                yield member, 0, True, None
+                continue
+            member.size = st.st_size
+            member._mtime = st.st_mtime
+            member._mode = st.st_mode
+            member._method = method
+            if method == _STORED:
+                level = None
+            # zipfile ile aynı eşik: sıkıştırılmış boyut ham boyutu biraz aşabilir
+            member._zip64 = st.st_size > ZIP64_LIMIT * 1.05 or st.st_size > _MAX_UINT32 - 1024
+            path = os.fspath(source)
+            offset = 0
+            while True:
+                length = min(self.chunk_size, member.size - offset)
+                final = offset + length >= member.size
+                future = self._pool.submit(_deflate_chunk, path, offset, length, level, final)
+                yield member, offset, final, future
+                if final:
+                    break
+                offset += length
+
+    def write_members(self, members: Iterable[Tuple[object, str]]) -> Iterator[ArchivedMember]:
+        """
+        (kaynak yol, arşivdeki ad) çiftlerini arşive yazar ve bitince arşivi
+        kapatır (bir kez çağrılır). Üyeler cildin merkezi dizini diske
+        yazıldıktan sonra döner; okunamayan dosyalar hemen error alanıyla
+        döner ve arşive eklenmez.
+        """
+        tasks = self._tasks(members)
+        pending = deque()
+        max_pending = self.workers * 4
+        exhausted = False
+
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                task = next(tasks, None)
+                if task is None:
+                    exhausted = True
+                else:
+                    pending.append(task)
+            if not pending:
+                break
+
+            member, offset, final, future = pending.popleft()
+            if member.error is None:
+                try:
+                    data, compressed = future.result()
+                    self._write_chunk(member, offset == 0, final, data, compressed)
+                except Exception as e:
+                    member.error = e
+                    self._rollback(member)
+            elif future is not None:
+                future.cancel()
+
+            if final:
+                member.seconds = time.perf_counter() - member._started
+                if member.error is None:
+                    self._finish(member)
+                else:
+                    yield member
+            while self._committed:
+                yield self._committed.popleft()
+
+        self.close()
+        while self._committed:
+            yield self._committed.popleft()
+
+    def _write_chunk(self, member: ArchivedMember, first: bool, final: bool, data: bytes, compressed: bytes):
+        if first:
+            self._roll_over(member)
+            # Tek parçalık üyede sıkıştırma kazanç sağlamıyorsa ham saklanır
+            if member._method == _DEFLATED and final and len(compressed) >= len(data):
+                member._method = _STORED
+            member._offset = self._file.tell()
+            self._file.write(self._local_header(member, 0, 0, 0))
+        payload = data if member._method == _STORED else compressed
+        member._crc = zlib.crc32(data, member._crc)
+        member.compressed_size += len(payload)
+        self._file.write(payload)
+
+    def _rollback(self, member: ArchivedMember):
+        # Yarım yazılmış üyeyi dosyadan at
+        if member._offset is not None:
+            self._file.seek(member._offset)
+            self._file.truncate()
+            member._offset = None
+
+    def _local_header(self, member: ArchivedMember, crc: int, compressed_size: int, size: int) -> bytes:
+        dostime, dosdate = _dos_datetime(member._mtime)
+        flags = _FLAG_UTF8 if not member.arcname.isascii() else 0
+        if member._zip64:
+            extra = struct.pack("<HHQQ", 1, 16, size, compressed_size)
+            version, compressed_size, size = 45, _MAX_UINT32, _MAX_UINT32
+        else:
+            extra = b""
+            version = 20 if member._method == _DEFLATED else 10
+        return _LOCAL_HEADER.pack(b"PK\x03\x04", version, flags, member._method, dostime, dosdate,
+                                  crc, compressed_size, size, len(member._name), len(extra)) + member._name + extra
+
+    def _finish(self, member: ArchivedMember):
+        end = self._file.tell()
+        self._file.seek(member._offset)
+        self._file.write(self._local_header(member, member._crc, member.compressed_size, member.size))
+        self._file.seek(end)
+        member.volume = self._volume_path
+        self._entries.append(member)
+
+    # ------------------------------------------------------------------
+    # Merkezi dizin
+    # ------------------------------------------------------------------
+    def _central_header(self, member: ArchivedMember) -> bytes:
+        dostime, dosdate = _dos_datetime(member._mtime)
+        flags = _FLAG_UTF8 if not member.arcname.isascii() else 0
+        size, compressed_size, offset = member.size, member.compressed_size, member._offset
+        fields = []
+        if size >= _MAX_UINT32:
+            fields.append(size)
+            size = _MAX_UINT32
+        if compressed_size >= _MAX_UINT32:
+            fields.append(compressed_size)
+            compressed_size = _MAX_UINT32
+        if offset >= _MAX_UINT32:
+            fields.append(offset)
+            offset = _MAX_UINT32
+        extra = struct.pack(f"<HH{len(fields)}Q", 1, 8 * len(fields), *fields) if fields else b""
+        if fields or member._zip64:
+            version = 45
+        else:
+            version = 20 if member._method == _DEFLATED else 10
+        return _CENTRAL_HEADER.pack(b"PK\x01\x02", _CREATE_SYSTEM << 8 | version, version, flags,
+                                    member._method, dostime, dosdate, member._crc, compressed_size, size,
+                                    len(member._name), len(extra), 0, 0, 0,
+                                    (member._mode & 0xFFFF) << 16, offset) + member._name + extra
+
+    def close(self):
+        """
+        Son cildin merkezi dizinini yazıp kapatır. Yarıda bırakılsa da
+        yazılmış üyeler geçerli kalır; teslim edilmemiş kaynaklar silinmez.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        if self._file is not None:
+            self._finalize_volume()
+
+
+class TarArchiveWriter:
+    """
+    tar/tar.gz/tar.bz2/tar.xz için ParallelZipWriter ile aynı arayüz.
+
+    Sıkıştırma tüm akışa uygulandığından ciltlere bölme ve paralel sıkıştırma
+    yoktur. Üyeler arşiv kapatılıp fsync edildikten sonra döner. "append"
+    yalnızca sıkıştırılmamış .tar için mümkündür (tarfile 'a' kipi).
+    """
+
+    def __init__(self, path, level: int = DEFAULT_LEVEL, mode: str = "new"):
+        if mode not in ARCHIVE_MODES:
+            raise ValueError(f"Geçersiz arşiv modu: {mode} ({', '.join(ARCHIVE_MODES)})")
+        path = os.fspath(path)
+        kind = tar_mode(path)
+        if mode == "new":
+            path = unique_archive_path(path)
+        if mode == "append" and os.path.exists(path):
+            if kind != "w":
+                raise ValueError(f"Sıkıştırılmış tar arşivine ekleme yapılamaz: {os.path.basename(path)}")
+            self._tar = tarfile.open(path, "a")
+        else:
+            self._tar = open_tar(path, kind, level)
+        self.path = path
+        self.volumes = [path]
+        self._written = []
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write_members(self, members: Iterable[Tuple[object, str]]) -> Iterator[ArchivedMember]:
+        """(kaynak yol, arşivdeki ad) çiftlerini yazar; bkz. ParallelZipWriter.write_members."""
+        for source, arcname in members:
+            member = ArchivedMember(source, arcname)
+            try:
+                member.size = os.stat(source).st_size
+                self._tar.add(os.fspath(source), arcname=arcname)
+            except Exception as e:
+                member.error = e
+                yield member
+                continue
+            member.seconds = time.perf_counter() - member._started
+            member.volume = self.path
+            self._written.append(member)
+        self.close()
+        written, self._written = self._written, []
+        yield from written
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._tar.close()
+        with open(self.path, "rb+") as f:
+            fsync_file(f)
+        fsync_dir(self.path)
+
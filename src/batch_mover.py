@@ -0,0 +1,169 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+from journal import record_event
+from mover import move_file
+from naming import DestinationNames
+
+DEFAULT_JOBS = 4
+# Hedef ad dışarıdan doldurulursa kaç kez yeni ad denenir
+MAX_NAME_ATTEMPTS = 3
+
+
+class MovePlan:
+    """Planlanmış tek bir taşıma işlemi (kaynak, kategori, hedef klasör, temiz ad)."""
+
+    __slots__ = ("source", "category", "target_folder", "clean_name")
+
+    def __init__(self, source, category: str, target_folder: Path, clean_name: str):
+        self.source = source  # FileInfo veya Path
+        self.category = category
+        self.target_folder = Path(target_folder)
+        self.clean_name = clean_name
+
+    def __repr__(self):
+        return f"MovePlan({self.source.name!r} -> {self.target_folder / self.clean_name})"
+
+
+def resolve_jobs(config, jobs: Optional[int] = None) -> int:
+    """--jobs / parametre verilmediyse config'deki batch.jobs değerini kullanır."""
+    if jobs is None:
+        jobs = config.get("batch", {}).get("jobs", DEFAULT_JOBS)
+    try:
+        return max(1, int(jobs))
+    except (TypeError, ValueError):
+        return DEFAULT_JOBS
+
+
+def _source_size(source) -> Optional[int]:
+    # FileInfo taramadan gelen stat'ı kullanır; Path için tek bir stat yapılır
+    try:
+        return source.size if hasattr(source, "size") else Path(source).stat().st_size
+    except OSError:
+        return None
+
+
+class BatchMover:
+    """
+    Planlanmış taşımaları sınırlı bir iş parçacığı havuzunda uygular.
+
+    Hedef adlar çalışma anında DestinationNames ile kilit altında ayrılır,
+    böylece iki işçi aynı adı seçemez. İstatistikler her işin sonucundan
+    ana iş parçacığında toplanır.
+    """
+
+    def __init__(self, logger, jobs: int = 1, names: Optional[DestinationNames] = None,
+                 log_tag: str = "TASINDI", operation: str = "move",
+                 on_moved: Optional[Callable[[MovePlan, Path], None]] = None,
+                 progress: Optional[Callable[[MovePlan, int, int], None]] = None):
+        self.logger = logger
+        self.jobs = max(1, jobs)
+        self.names = names or DestinationNames()
+        self.log_tag = log_tag
+        self.operation = operation  # journal'daki "op" alanı
+        self.on_moved = on_moved
+        # Bayt bazında ilerleme: (plan, kopyalanan, toplam); cihazlar arası kopyada parça parça
+        self.progress = progress
+        self._known_folders = set()
+        self._folder_lock = threading.Lock()
+
+    def _ensure_folder(self, folder: Path):
+        if folder in self._known_folders:
+            return
+        with self._folder_lock:
+            if folder not in self._known_folders:
+                folder.mkdir(parents=True, exist_ok=True)
+                self._known_folders.add(folder)
+
+    def execute(self, plan: MovePlan) -> Optional[Dict]:
+        """Tek bir planı uygular. Başarılıysa detay sözlüğü, değilse None döner."""
+        name = plan.source.name
+        destination_path = None
+        size = _source_size(plan.source)
+        started = time.perf_counter()
+        progress = None
+        if self.progress is not None:
+            progress = lambda done, total: self.progress(plan, done, total)
+        try:
+            self._ensure_folder(plan.target_folder)
+            for attempt in range(MAX_NAME_ATTEMPTS):
+                destination_path = self.names.reserve(plan.target_folder, plan.clean_name)
+                try:
+                    move_file(plan.source, destination_path, progress)
+                    break
+                except FileExistsError:
+                    # İndeks dışından eklenmiş bir dosya: ad diskte dolu, klasörü
+                    # yeniden listele ve yeni bir adla tekrar dene
+                    self.names.commit(destination_path)
+                    self.names.invalidate(plan.target_folder)
+                    destination_path = None
+                    if attempt == MAX_NAME_ATTEMPTS - 1:
+                        raise
+            self.names.commit(destination_path)
+        except PermissionError:
+            self._release(destination_path)
+            self.logger.error(f"ERİŞİM HATASI | {name} dosyası kullanımda.")
+            return None
+        except Exception as e:
+            self._release(destination_path)
+            self.logger.error(f"HATA | {name} taşınamadı: {e}")
+            return None
+
+        self.logger.info(f"{self.log_tag} | {plan.category} | {name} -> {destination_path.name}")
+        record_event(self.operation, plan.category, plan.source, destination_path,
+                     size, time.perf_counter() - started)
+        if self.on_moved:
+            self.on_moved(plan, destination_path)
+        return {
+            "file": name,
+            "category": plan.category,
+            "destination": str(destination_path)
+        }
+
+    def _release(self, destination_path):
+        if destination_path is not None:
+            self.names.release(destination_path)
+
+    def iter_run(self, plans: Iterable[MovePlan]) -> Iterator[Tuple[MovePlan, Optional[Dict]]]:
+        """
+        Planları uygular ve her biri bittikçe (plan, detay) üretir; hata için detay None.
+        Planlar tembel tüketilir: aynı anda en fazla jobs * 4 iş kuyrukta bekler,
+        böylece milyonlarca dosyada da bellek sınırlı kalır ve ilk taşıma
+        tarama bitmeden başlar.
+        """
+        if self.jobs == 1:
+            for plan in plans:
+                yield plan, self.execute(plan)
+            return
+
+        max_in_flight = self.jobs * 4
+        with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="mover") as pool:
+            in_flight = {}
+            for plan in plans:
+                if len(in_flight) >= max_in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield in_flight.pop(future), future.result()
+                in_flight[pool.submit(self.execute, plan)] = plan
+            for future in as_completed(in_flight):
+                yield in_flight[future], future.result()
+
+    def run(self, plans: Iterable[MovePlan], collect_details: bool = True,
+            sink: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """
+        Planları uygular ve toplu istatistik döner.
+        Detaylar collect_details ile listede toplanır veya sink'e tek tek verilir.
+        """
+        stats = {"moved": 0, "errors": 0, "details": []}
+        for _, detail in self.iter_run(plans):
+            if detail is None:
+                stats["errors"] += 1
+                continue
+            stats["moved"] += 1
+            if sink is not None:
+                sink(detail)
+            if collect_details:
+                stats["details"].append(detail)
+        return stats
@@ -0,0 +1,147 @@
+import os
+import threading
+from typing import Dict, List, Optional
+from config_loader import load_config
+from logger import get_logger
+from sniffer import ContentSniffer
+
+DEFAULT_CATEGORY = "Others"
+
+
+def normalize_extension(ext: str) -> str:
+    """Uzantıyı küçük harfe çevirir ve başına nokta ekler ('JPG' -> '.jpg')."""
+    ext = ext.strip().lower()
+    return ext if ext.startswith('.') else f'.{ext}'
+
+
+class CategoryClassifier:
+    """
+    config'deki file_extensions tablosundan derlenen uzantı -> kategori eşlemesi.
+
+    Kategori tek bir sözlük aramasıyla bulunur. '.tar.gz' gibi çok parçalı
+    uzantılar desteklenir (en uzun eşleşme kazanır). Birden fazla kategoride
+    tanımlı uzantılar yükleme anında raporlanır; kazanan kategori
+    category_priorities ile (büyük değer önce), eşitlikte config sırasıyla seçilir.
+
+    sniffer verilirse uzantıdan kategori bulunamayan dosyaların (yalnızca
+    isim değil yol/FileInfo verildiğinde) ilk baytlarına bakılır.
+    """
+
+    def __init__(self, extensions_map, priorities=None, sniffer: Optional[ContentSniffer] = None):
+        self.extensions_map = extensions_map
+        self.priorities = dict(priorities or {})
+        self.sniffer = sniffer
+        self.table: Dict[str, str] = {}
+        self.conflicts: Dict[str, List[str]] = {}
+        self.max_parts = 1
+        self._build()
+
+    def _build(self):
+        order = {category: index for index, category in enumerate(self.extensions_map)}
+        owners: Dict[str, List[str]] = {}
+
+        for category, extensions in self.extensions_map.items():
+            for ext in extensions:
+                ext = normalize_extension(ext)
+                categories = owners.setdefault(ext, [])
+                if category not in categories:
+                    categories.append(category)
+
+        for ext, categories in owners.items():
+            if len(categories) > 1:
+                self.conflicts[ext] = categories
+            self.table[ext] = max(categories, key=lambda c: (self.priorities.get(c, 0), -order[c]))
+            self.max_parts = max(self.max_parts, ext.count('.'))
+
+    def report_conflicts(self, logger=None):
+        """Çakışan uzantıları ve seçilen kategoriyi loglar."""
+        if not self.conflicts:
+            return
+        logger = logger or get_logger()
+        for ext, categories in self.conflicts.items():
+            logger.warning(
+                f"KATEGORİ ÇAKIŞMASI | {ext} -> {', '.join(categories)} "
+                f"(seçilen: {self.table[ext]}, category_priorities ile değiştirilebilir)"
+            )
+
+    def extension_of(self, name: str) -> str:
+        """Tabloda bilinen en uzun uzantıyı, yoksa son uzantıyı döner."""
+        lname = name.lower()
+        pos = len(lname)
+        last = ""
+        for _ in range(self.max_parts):
+            # Baştaki nokta gizli dosya demektir, uzantı sayılmaz ('.bashrc')
+            pos = lname.rfind('.', 0, pos)
+            if pos <= 0:
+                break
+            ext = lname[pos:]
+            if not last:
+                last = ext
+            if ext in self.table:
+                last = ext
+        return last
+
+    def classify(self, file) -> str:
+        """
+        Dosyanın (isim, Path veya name özelliği olan nesne) kategorisini döner.
+        Uzantı bilinmiyorsa ve içerik tanıma açıksa dosyanın başı okunur;
+        bunun için str olarak tam yol, Path veya FileInfo verilmelidir.
+        """
+        name = os.path.basename(file) if isinstance(file, str) else file.name
+        lname = name.lower()
+
+        # Son uzantıdan geriye doğru dene ('.gz' -> '.tar.gz'); en uzun eşleşme kazanır
+        pos = len(lname)
+        found = DEFAULT_CATEGORY
+        for _ in range(self.max_parts):
+            pos = lname.rfind('.', 0, pos)
+            if pos <= 0:
+                break
+            category = self.table.get(lname[pos:])
+            if category is not None:
+                found = category
+        if found == DEFAULT_CATEGORY and self.sniffer is not None and (
+                not isinstance(file, str) or os.path.isabs(file)):
+            found = self.sniffer.category_of(file, self.table, self.extensions_map) or DEFAULT_CATEGORY
+        return found
+
+    def begin_scan(self):
+        """Yeni bir tarama başlıyor: içerik tanımanın okuma bütçesini yeniler."""
+        if self.sniffer is not None:
+            self.sniffer.begin_scan()
+
+    def categories(self) -> List[str]:
+        return list(self.extensions_map.keys())
+
+
+_cached_config = None
+_cached_classifier: Optional[CategoryClassifier] = None
+_cache_lock = threading.Lock()
+
+
+def get_classifier(config=None) -> CategoryClassifier:
+    """
+    Config anlık görüntüsü için derlenmiş sınıflandırıcıyı döner.
+    Aynı anlık görüntü için tablo bir kez derlenir; config yeniden
+    yüklenince yeni tablo derlenir ve çakışmalar tekrar raporlanır.
+    """
+    global _cached_config, _cached_classifier
+    config = config if config is not None else load_config()
+
+    with _cache_lock:
+        if _cached_config is not config:
+            classifier = CategoryClassifier(
+                config.get("file_extensions", {}),
+                config.get("category_priorities", {}),
+                ContentSniffer.from_config(config),
+            )
+            classifier.report_conflicts()
+            _cached_config = config
+            _cached_classifier = classifier
+        return _cached_classifier
+
+
+if __name__ == "__main__":
+    c = get_classifier()
+    for name in ["photo.JPG", "backup.tar.gz", "script.sh", "README", ".bashrc", "data.bin"]:
+        print(f"{name:<16} -> {c.classify(name)}")
@@ -0,0 +1,97 @@
+import math
+import os
+from collections import Counter
+from typing import Dict, Optional, Tuple
+from zipfile import ZIP_DEFLATED, ZIP_STORED
+from classifier import CategoryClassifier, get_classifier, normalize_extension
+from archiver import DEFAULT_LEVEL
+
+# Zaten sıkıştırılmış biçimler: deflate bunları küçültmez, sadece CPU harcar
+DEFAULT_STORE_EXTENSIONS = (
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".avif",
+    ".mp3", ".aac", ".ogg", ".m4a", ".flac", ".opus", ".wma",
+    ".mp4", ".mkv", ".avi", ".mov", ".webm", ".m4v", ".wmv", ".flv",
+    ".zip", ".rar", ".7z", ".gz", ".tgz", ".bz2", ".xz", ".zst", ".lz4",
+    ".docx", ".xlsx", ".pptx", ".odt", ".ods", ".odp", ".epub", ".jar", ".apk",
+)
+# .wav, .tar, .iso gibi sıkıştırılabilir üyeleri olan kategoriler uzantıyla ayrılır
+DEFAULT_STORE_CATEGORIES = ("Video",)
+
+# Entropi örneği: ilk blok; bayt başına bu kadar bitin üstü rastgele (sıkıştırılmış) sayılır
+PROBE_BYTES = 16 * 1024
+ENTROPY_THRESHOLD = 7.5
+
+
+def shannon_entropy(data: bytes) -> float:
+    """Bayt başına Shannon entropisi (0-8 bit)."""
+    if not data:
+        return 0.0
+    total = len(data)
+    return -sum(count / total * math.log2(count / total) for count in Counter(data).values())
+
+
+class CompressionPolicy:
+    """
+    Arşivdeki her dosya için sıkıştırma yöntemi ve seviyesi seçer.
+
+    Karar önce uzantıdan verilir: zaten sıkıştırılmış biçimler (jpg, mp4,
+    zip, docx...) ve store_categories içindeki kategoriler ZIP_STORED ile
+    saklanır; uzantı tablosunda bilinen diğer dosyalar ZIP_DEFLATED ile
+    kategoriye özgü (category_levels) ya da genel seviyede sıkıştırılır.
+    Uzantısı bilinmeyen dosyalar için probe açıksa ilk blok okunur ve
+    entropisi eşiğin üstündeyse dosya saklanır.
+    """
+
+    def __init__(self, classifier: CategoryClassifier, level: int = DEFAULT_LEVEL,
+                 store_extensions=DEFAULT_STORE_EXTENSIONS, store_categories=DEFAULT_STORE_CATEGORIES,
+                 category_levels: Optional[Dict[str, int]] = None, probe: bool = True,
+                 probe_bytes: int = PROBE_BYTES, entropy_threshold: float = ENTROPY_THRESHOLD):
+        self.classifier = classifier
+        self.level = level
+        self.store_extensions = frozenset(normalize_extension(ext) for ext in store_extensions)
+        self.store_categories = frozenset(store_categories)
+        self.category_levels = dict(category_levels or {})
+        self.probe = probe
+        self.probe_bytes = probe_bytes
+        self.entropy_threshold = entropy_threshold
+
+    @classmethod
+    def from_config(cls, config, classifier: Optional[CategoryClassifier] = None) -> "CompressionPolicy":
+        settings = config.get("archive", {})
+        return cls(
+            classifier or get_classifier(config),
+            level=settings.get("level", DEFAULT_LEVEL),
+            store_extensions=settings.get("store_extensions", DEFAULT_STORE_EXTENSIONS),
+            store_categories=settings.get("store_categories", DEFAULT_STORE_CATEGORIES),
+            category_levels=settings.get("category_levels"),
+            probe=settings.get("entropy_probe", True),
+            probe_bytes=int(settings.get("probe_kb", PROBE_BYTES // 1024) * 1024),
+            entropy_threshold=settings.get("entropy_threshold", ENTROPY_THRESHOLD),
+        )
+
+    def _looks_compressed(self, file) -> bool:
+        try:
+            with open(file, "rb") as f:
+                sample = f.read(self.probe_bytes)
+        except OSError:
+            return False
+        # Çok küçük örneklerde entropi anlamlı değil; küçük dosya zaten ucuz
+        return len(sample) >= 1024 and shannon_entropy(sample) >= self.entropy_threshold
+
+    def choose(self, file) -> Tuple[int, int]:
+        """Dosya için (ZIP_STORED veya ZIP_DEFLATED, seviye) döner."""
+        name = os.path.basename(file) if isinstance(file, str) else file.name
+        ext = self.classifier.extension_of(name)
+        if ext in self.store_extensions:
+            return ZIP_STORED, 0
+        category = self.classifier.table.get(ext)
+        if category is not None:
+            if category in self.store_categories:
+                return ZIP_STORED, 0
+            return ZIP_DEFLATED, self.category_levels.get(category, self.level)
+        if self.probe and self._looks_compressed(file):
+            return ZIP_STORED, 0
+        return ZIP_DEFLATED, self.level
+
+    __call__ = choose
+
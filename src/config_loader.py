@@ -1,7 +1,9 @@
 import json
 import os
 import sys
+import threading
 from pathlib import Path
+from types import MappingProxyType
 
 # Proje kök dizinini bul: src'nin bir üstü
 ROOT_DIR = Path(__file__).resolve().parent.parent
@@ -11,37 +13,140 @@ def get_default_downloads_folder():
     """İşletim sistemine göre İndirilenler klasörünü bulur."""
     return str(Path.home() / "Downloads")
 
+def _freeze(value):
+    """Config ağacını değiştirilemez hale getirir (dict -> mappingproxy, list -> tuple)."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def _parse_config(config_path):
+    """Config dosyasını okur, yer tutucuları çözer ve ham sözlüğü döner."""
+    with open(config_path, 'r', encoding='utf-8') as file:
+        config = json.load(file)
+
+    user_downloads = get_default_downloads_folder()
+
+    # {path} yer tutucularını değiştir
+    if config.get("source_directory") == "{path}":
+        config["source_directory"] = user_downloads
+    if config.get("destination_directory") == "{path}":
+        config["destination_directory"] = user_downloads
+
+    # Log klasörünü de ana dizinde (logs) oluştur
+    log_dir = ROOT_DIR / "logs"
+    log_dir.mkdir(exist_ok=True)
+
+    # Path objesini string'e çevirerek kaydet
+    config["log_file_path"] = str(log_dir / config.get("log_file", "organizer.log"))
+    config["journal_file_path"] = str(log_dir / config.get("journal_file", "events.jsonl"))
+    config["rollup_file_path"] = str(log_dir / config.get("rollup_file", "rollup.db"))
+    config["metadata_index_path"] = str(log_dir / config.get("metadata_index", {}).get("file", "index.db"))
+    config["dedup_cache_path"] = str(log_dir / config.get("dedup", {}).get("cache_file", "hashes.db"))
+
+    return config
+
+
+class ConfigService:
+    """
+    config.json için süreç genelinde paylaşılan önbellek.
+
+    Dosya yalnızca bir kez ayrıştırılır ve değiştirilemez bir anlık görüntü
+    (snapshot) döner. Her erişimde sadece ucuz bir stat yapılır; mtime veya
+    boyut değiştiyse dosya yeniden yüklenir ve aboneler bilgilendirilir.
+    """
+
+    def __init__(self, config_path=CONFIG_FILE_PATH):
+        self.config_path = Path(config_path)
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._signature = None  # (st_mtime_ns, st_size)
+        self._subscribers = []
+
+    def get(self):
+        """Güncel config anlık görüntüsünü döner (gerekirse yeniden yükler)."""
+        self.refresh()
+        return self._snapshot
+
+    def refresh(self):
+        """Dosya değiştiyse yeniden yükler. Yükleme yapıldıysa True döner."""
+        try:
+            st = os.stat(self.config_path)
+        except FileNotFoundError:
+            if self._snapshot is None:
+                print(f"KRİTİK HATA: Config dosyası bulunamadı!")
+                print(f"Aranan Yer: {self.config_path}")
+                sys.exit(1)
+            # Dosya geçici olarak yoksa (editör kaydediyor olabilir) son geçerli ayarla devam et
+            return False
+
+        signature = (st.st_mtime_ns, st.st_size)
+        if signature == self._signature:
+            return False
+
+        with self._lock:
+            if signature == self._signature:
+                return False
+            try:
+                snapshot = _freeze(_parse_config(self.config_path))
+            except Exception as e:
+                if self._snapshot is None:
+                    print(f"Hata: {e}")
+                    sys.exit(1)
+                # Bozuk düzenlemede eski ayarları koru, dosya tekrar değişince yeniden dene
+                print(f"Config yeniden yüklenemedi, önceki ayarlar kullanılıyor: {e}")
+                self._signature = signature
+                return False
+
+            is_reload = self._snapshot is not None
+            self._snapshot = snapshot
+            self._signature = signature
+            subscribers = list(self._subscribers)
+
+        if is_reload:
+            for callback in subscribers:
+                try:
+                    callback(snapshot)
+                except Exception as e:
+                    print(f"Config aboneliği hatası: {e}")
+        return True
+
+    def subscribe(self, callback):
+        """Config yeniden yüklendiğinde callback(snapshot) çağrılır."""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+
+config_service = ConfigService()
+_save_lock = threading.Lock()
+
 def load_config():
-    """Config dosyasını okur ve ayarları döner."""
-    if not CONFIG_FILE_PATH.exists():
-        print(f"KRİTİK HATA: Config dosyası bulunamadı!")
-        print(f"Aranan Yer: {CONFIG_FILE_PATH}")
-        sys.exit(1)
-
-    try:
-        with open(CONFIG_FILE_PATH, 'r', encoding='utf-8') as file:
-            config = json.load(file)
-            
-            user_downloads = get_default_downloads_folder()
-            
-            # {path} yer tutucularını değiştir
-            if config.get("source_directory") == "{path}":
-                config["source_directory"] = user_downloads     
-            if config.get("destination_directory") == "{path}":
-                config["destination_directory"] = user_downloads
-
-            # Log klasörünü de ana dizinde (logs) oluştur
-            log_dir = ROOT_DIR / "logs"
-            log_dir.mkdir(exist_ok=True)
-            
-            # Path objesini string'e çevirerek kaydet
-            config["log_file_path"] = str(log_dir / config.get("log_file", "organizer.log"))
-
-            return config
-
-    except Exception as e:
-        print(f"Hata: {e}")
-        sys.exit(1)
+    """Config dosyasını okur ve ayarları döner (önbellekten, değiştirilemez)."""
+    return config_service.get()
+
+def save_config_value(key, value):
+    """
+    config.json'daki tek bir üst düzey anahtarı günceller ve önbelleği yeniler.
+    Dosya ham haliyle okunur ({path} gibi yer tutucular korunur) ve geçici
+    dosya üzerinden atomik olarak değiştirilir.
+    """
+    path = config_service.config_path
+    with _save_lock:
+        with open(path, 'r', encoding='utf-8') as file:
+            raw = json.load(file)
+        raw[key] = value
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(raw, file, ensure_ascii=False, indent=4)
+        os.replace(tmp_path, path)
+    config_service.refresh()
 
 if __name__ == "__main__":
     print(f"Proje Ana Dizini: {ROOT_DIR}")
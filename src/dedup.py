@@ -0,0 +1,558 @@
+import hashlib
+import mmap
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from config_loader import load_config
+from logger import get_logger
+from journal import record_event
+from metadata_index import get_metadata_index
+from scanner import FileInfo, as_file_info, is_ignored_name, scan
+from batch_mover import MAX_NAME_ATTEMPTS, MovePlan
+from naming import DestinationNames
+
+# Kısmi hash: dosyanın başından ve sonundan bu kadar bayt (küçük dosyada tamamı)
+EDGE_BYTES = 64 * 1024
+READ_BUFFER = 1024 * 1024
+# Bu boyutun üstündeki dosyalar tam hash için mmap ile okunur
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
+DEDUP_ACTIONS = ("skip", "hardlink", "move")
+DUPLICATES_FOLDER = "Duplicates"
+DEFAULT_WORKERS = 4
+# Akış modunda planlar bu büyüklükte pencerelerle değerlendirilir
+DEDUP_WINDOW = 4096
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    dev INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    edge TEXT,
+    full TEXT,
+    PRIMARY KEY (dev, inode, size, mtime_ns)
+);
+"""
+
+_UPSERT = """
+INSERT INTO hashes (dev, inode, size, mtime_ns, edge, full) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (dev, inode, size, mtime_ns) DO UPDATE SET
+    edge = COALESCE(excluded.edge, hashes.edge),
+    full = COALESCE(excluded.full, hashes.full)
+"""
+
+CacheKey = Tuple[int, int, int, int]
+
+
+def _new_hash():
+    return hashlib.blake2b(digest_size=20)
+
+
+def edge_digest(path, size: int) -> str:
+    """İlk ve son EDGE_BYTES baytın hash'i; 2 * EDGE_BYTES'tan küçük dosyada tam hash'tir."""
+    h = _new_hash()
+    with open(path, "rb") as f:
+        if size <= 2 * EDGE_BYTES:
+            h.update(f.read())
+        else:
+            h.update(f.read(EDGE_BYTES))
+            f.seek(-EDGE_BYTES, os.SEEK_END)
+            h.update(f.read(EDGE_BYTES))
+    return h.hexdigest()
+
+
+def full_digest(path, size: int) -> str:
+    """Tüm içeriğin hash'i (büyük dosyada mmap, diğerlerinde tek tampona okuma)."""
+    h = _new_hash()
+    with open(path, "rb") as f:
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                # hashlib büyük parçalarda GIL'i bırakır: işçiler gerçekten paralel çalışır
+                for offset in range(0, len(view), READ_BUFFER * 8):
+                    h.update(view[offset:offset + READ_BUFFER * 8])
+        else:
+            buffer = bytearray(READ_BUFFER)
+            with memoryview(buffer) as view:
+                while True:
+                    count = f.readinto(buffer)
+                    if not count:
+                        break
+                    h.update(view[:count])
+    return h.hexdigest()
+
+
+def cache_key(item: FileInfo) -> Optional[CacheKey]:
+    # inode bilinmiyorsa (ör. Windows'ta DirEntry) kayıt önbelleğe alınmaz
+    if not item.inode:
+        return None
+    return (item.dev, item.inode, item.size, item.mtime_ns)
+
+
+class HashCache:
+    """
+    İçerik hash'lerinin kalıcı SQLite önbelleği.
+
+    Anahtar (cihaz, inode, boyut, mtime_ns) olduğundan aynı cihazdaki
+    taşıma ve yeniden adlandırmalar hash'i geçersiz kılmaz; içerik
+    değişince mtime da değişir ve eski satır bir sonraki yazımda silinir.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def lookup(self, keys: Iterable[CacheKey]) -> Dict[CacheKey, Tuple[Optional[str], Optional[str]]]:
+        """Bilinen anahtarlar için (kısmi hash, tam hash) döner."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                row = self._conn.execute(
+                    "SELECT edge, full FROM hashes WHERE dev = ? AND inode = ? AND size = ? AND mtime_ns = ?",
+                    key).fetchone()
+                if row is not None:
+                    found[key] = row
+        return found
+
+    def store(self, rows: Iterable[Tuple[CacheKey, Optional[str], Optional[str]]]):
+        """(anahtar, kısmi hash, tam hash) satırlarını yazar; aynı inode'un eski sürümleri silinir."""
+        rows = list(rows)
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM hashes WHERE dev = ? AND inode = ? AND (size != ? OR mtime_ns != ?)",
+                [key for key, _, _ in rows])
+            self._conn.executemany(_UPSERT, [(*key, edge, full) for key, edge, full in rows])
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_hash_cache(config=None) -> Optional[HashCache]:
+    """Paylaşılan hash önbelleğini döner; açılamazsa None (hash'ler önbelleksiz hesaplanır)."""
+    global _cache
+    config = config if config is not None else load_config()
+    path = Path(config.get("dedup_cache_path", "hashes.db"))
+    with _cache_lock:
+        if _cache is None or _cache.path != path:
+            if _cache is not None:
+                _cache.close()
+            try:
+                _cache = HashCache(path)
+            except sqlite3.Error as e:
+                get_logger().warning(f"Hash önbelleği açılamadı, önbelleksiz devam ediliyor: {e}")
+                _cache = None
+        return _cache
+
+
+class FolderSizes:
+    """
+    Hedef klasörlerdeki dosyaların boyut -> yol indeksi.
+
+    Her klasör ilk kullanımda bir kez listelenir; sonraki çağrılarda yalnızca
+    klasörün mtime'ı karşılaştırılır. Kendi taşımalarımız record ile indekse
+    eklenir ve kayıtlı mtime yenilenir; klasör dışarıdan değiştiyse bir
+    sonraki çağrıda yeniden listelenir. Watcher'ın tek dosyalık çağrıları
+    böylece hedef klasördeki dosya sayısından bağımsız kalır.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._folders: Dict[str, Tuple[int, Dict[int, List[str]]]] = {}
+
+    def _sizes(self, folder: str) -> Optional[Dict[int, List[str]]]:
+        try:
+            mtime_ns = os.stat(folder).st_mtime_ns
+        except OSError:
+            with self._lock:
+                self._folders.pop(folder, None)
+            return None
+        with self._lock:
+            cached = self._folders.get(folder)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        sizes: Dict[int, List[str]] = {}
+        try:
+            for item in scan(folder):
+                if is_ignored_name(item.name):
+                    continue
+                try:
+                    sizes.setdefault(item.size, []).append(os.fspath(item))
+                except OSError:
+                    continue
+        except OSError:
+            return None
+        with self._lock:
+            self._folders[folder] = (mtime_ns, sizes)
+        return sizes
+
+    def same_size(self, folders: Iterable, sizes) -> Iterator[FileInfo]:
+        """Klasörlerde boyutu sizes içinde olan dosyalar (yalnızca bunlar stat'lanır)."""
+        for folder in folders:
+            folder = os.fspath(folder)
+            listing = self._sizes(folder)
+            if not listing:
+                continue
+            with self._lock:
+                paths = [(size, path) for size in sizes if size in listing for path in listing[size]]
+            for size, path in paths:
+                try:
+                    item = FileInfo.from_path(path)
+                except OSError:
+                    self._discard(listing, size, path)
+                    continue
+                if item.size == size:
+                    yield item
+
+    def _discard(self, listing: Dict[int, List[str]], size: int, path: str):
+        with self._lock:
+            paths = listing.get(size)
+            if paths and path in paths:
+                paths.remove(path)
+
+    def record(self, destination):
+        """Taşıma sonrası: dosyayı (klasörü indeksliyse) indekse ekler."""
+        destination = os.fspath(destination)
+        folder = os.path.dirname(destination)
+        with self._lock:
+            if folder not in self._folders:
+                return
+        try:
+            size = os.stat(destination).st_size
+            mtime_ns = os.stat(folder).st_mtime_ns
+        except OSError:
+            with self._lock:
+                self._folders.pop(folder, None)
+            return
+        with self._lock:
+            cached = self._folders.get(folder)
+            if cached is not None:
+                cached[1].setdefault(size, []).append(destination)
+                self._folders[folder] = (mtime_ns, cached[1])
+
+
+_folder_sizes = FolderSizes()
+
+# Aynı partide asıl dosyası da taşınan "hardlink" kopyaları: asılın kaynak
+# yolu -> (Deduplicator, plan, Duplicate, ad indeksi); asıl taşınınca bağlanır
+_pending_links: Dict[str, list] = {}
+_pending_lock = threading.Lock()
+
+
+def record_move(destination, source=None):
+    """
+    BatchMover on_moved kancası: taşınan dosyayı hedef klasör indeksine ekler.
+    source verilirse, bu dosyanın taşınmasını bekleyen kopyalar yeni yola bağlanır.
+    """
+    _folder_sizes.record(destination)
+    if source is None:
+        return
+    with _pending_lock:
+        waiting = _pending_links.pop(os.fspath(source), ())
+    for deduplicator, plan, duplicate, names in waiting:
+        deduplicator._link_into_place(plan, duplicate, names, destination)
+
+
+class Duplicate:
+    """Kopya olduğu anlaşılan bir dosya ve içeriği aynı olan asıl dosya."""
+
+    __slots__ = ("source", "original", "digest", "size")
+
+    def __init__(self, source: FileInfo, original: FileInfo, digest: str):
+        self.source = source
+        self.original = original
+        self.digest = digest
+        self.size = source.size
+
+    def __repr__(self):
+        return f"Duplicate({self.source.name!r} = {self.original.name!r})"
+
+
+class Deduplicator:
+    """
+    Taşıma planlarındaki kopya dosyaları bulur ve config'deki eyleme göre işler.
+
+    Adaylar üç aşamada elenir: önce boyuta göre gruplanır (tek başına kalan
+    boyutlar hiç okunmaz), sonra aynı boyuttakilerin ilk ve son 64 KB'ı,
+    en son da hâlâ eşleşenlerin tüm içeriği hash'lenir. Karşılaştırmaya
+    planların hedef klasörlerinde zaten bulunan aynı boyutlu dosyalar da
+    katılır (FolderSizes ile, klasör her seferinde listelenmeden). Hash'ler iş parçacığı havuzunda hesaplanır ve HashCache'e
+    yazılır; tekrar çalıştırmada değişmemiş dosyalar yeniden okunmaz.
+
+    Eylemler:
+        "skip"     kopya kaynakta bırakılır, taşınmaz
+        "hardlink" kopya taşınmaz; hedefte asıl dosyaya sabit bağlantı
+                   oluşturulup kaynak silinir (disk alanı bir kez kullanılır).
+                   Asıl aynı partideyse bağlantı, asıl taşındıktan sonra yeni
+                   yoluna kurulur; bağlantı kurulamazsa kaynak yerinde kalır
+        "move"     kopya hedefteki Duplicates klasörüne taşınır
+    """
+
+    def __init__(self, config=None, logger=None, action=None):
+        config = config if config is not None else load_config()
+        settings = config.get("dedup", {})
+        self.config = config
+        self.logger = logger or get_logger()
+        # action: None -> config; False -> kapalı; True/eylem adı -> bu çalıştırma için açık
+        if action is None:
+            self.enabled = bool(settings.get("enabled", False))
+        else:
+            self.enabled = bool(action)
+        if action is None or action is True:
+            action = settings.get("action", "skip")
+        self.action = action if self.enabled else "skip"
+        if self.action not in DEDUP_ACTIONS:
+            raise ValueError(f"Geçersiz kopya eylemi: {self.action} ({', '.join(DEDUP_ACTIONS)})")
+        self.workers = max(1, int(settings.get("workers", DEFAULT_WORKERS)))
+        # Boş dosyalar birbirinin kopyası sayılmaz
+        self.min_size = max(1, int(settings.get("min_size_kb", 0) * 1024))
+        self.folder_name = settings.get("folder", DUPLICATES_FOLDER)
+        self.last_stats: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # Hash aşamaları
+    # ------------------------------------------------------------------
+    def _digests(self, items: List[FileInfo], full: bool, stats: Dict[str, int]) -> Dict[FileInfo, str]:
+        """Öğelerin kısmi veya tam hash'leri; okunamayan dosyalar sonuçta yer almaz."""
+        cache = get_hash_cache(self.config)
+        keys = {item: cache_key(item) for item in items}
+        known = cache.lookup(key for key in keys.values() if key is not None) if cache is not None else {}
+
+        digests = {}
+        todo = []
+        for item in items:
+            edge, full_hash = known.get(keys[item], (None, None))
+            digest = full_hash if full else edge
+            if digest is not None:
+                digests[item] = digest
+                stats["cache_hits"] += 1
+            else:
+                todo.append(item)
+
+        def compute(item):
+            try:
+                return (full_digest if full else edge_digest)(item.path, item.size)
+            except OSError as e:
+                self.logger.warning(f"KOPYA KONTROLÜ ATLANDI | {item.name}: {e}")
+                return None
+
+        if len(todo) > 1 and self.workers > 1:
+            with ThreadPoolExecutor(min(self.workers, len(todo)), thread_name_prefix="dedup") as pool:
+                computed = list(pool.map(compute, todo))
+        else:
+            computed = [compute(item) for item in todo]
+
+        rows = []
+        index = get_metadata_index() if full else None
+        for item, digest in zip(todo, computed):
+            if digest is None:
+                continue
+            digests[item] = digest
+            stats["hashed_full" if full else "hashed_edge"] += 1
+            # Küçük dosyada kısmi hash zaten tam içeriğin hash'idir
+            whole = full or item.size <= 2 * EDGE_BYTES
+            if keys[item] is not None:
+                rows.append((keys[item], None if full else digest, digest if whole else None))
+            if index is not None:
+                index.set_hash(item.path, digest)
+        if cache is not None:
+            cache.store(rows)
+        return digests
+
+    def find(self, candidates: Iterable, references: Iterable = ()) -> Dict[str, Duplicate]:
+        """
+        Adaylar arasındaki ve adaylarla references (hedefte zaten olan
+        dosyalar) arasındaki kopyaları bulur. Kopya adayın yolu -> Duplicate.
+        Her grupta asıl dosya varsa referans dosya, yoksa en eski adaydır.
+        """
+        stats = {"candidates": 0, "hashed_edge": 0, "hashed_full": 0, "cache_hits": 0, "duplicates": 0}
+        self.last_stats = stats
+        by_size: Dict[int, List[Tuple[FileInfo, bool]]] = {}
+        for item in candidates:
+            item = as_file_info(item)
+            try:
+                size = item.size
+            except OSError:
+                continue
+            if size >= self.min_size:
+                by_size.setdefault(size, []).append((item, False))
+                stats["candidates"] += 1
+        if not by_size:
+            return {}
+        for item in references:
+            try:
+                group = by_size.get(item.size)
+            except OSError:
+                continue
+            if group is not None:
+                group.append((item, True))
+
+        # Aşama 1: boyut; aşama 2: ilk+son 64 KB; aşama 3: tam içerik
+        groups = list(by_size.values())
+        for full in (False, True):
+            groups = [group for group in groups if len(group) > 1 and not all(ref for _, ref in group)]
+            if not groups:
+                return {}
+            digests = self._digests([item for group in groups for item, _ in group], full, stats)
+            regrouped = {}
+            for group in groups:
+                for item, is_reference in group:
+                    digest = digests.get(item)
+                    if digest is not None:
+                        regrouped.setdefault((item.size, digest), []).append((item, is_reference))
+            groups = list(regrouped.values())
+            last_digests = digests
+
+        duplicates = {}
+        for group in groups:
+            if len(group) < 2 or all(ref for _, ref in group):
+                continue
+            references_in_group = [item for item, ref in group if ref]
+            members = sorted((item for item, ref in group if not ref), key=lambda item: (item.mtime_ns, item.name))
+            original = references_in_group[0] if references_in_group else members.pop(0)
+            for item in members:
+                duplicates[str(item.path)] = Duplicate(item, original, last_digests[item])
+        stats["duplicates"] = len(duplicates)
+        self.logger.debug(
+            f"KOPYA TARAMA | {stats['candidates']} aday, {stats['hashed_edge']} kısmi ve "
+            f"{stats['hashed_full']} tam hash, {stats['cache_hits']} önbellekten, {stats['duplicates']} kopya"
+        )
+        return duplicates
+
+    # ------------------------------------------------------------------
+    # Planlara uygulama
+    # ------------------------------------------------------------------
+    def _link_into_place(self, plan: MovePlan, duplicate: Duplicate, names: DestinationNames,
+                         original) -> bool:
+        """
+        Kopyayı taşımak yerine hedef klasörde asıl dosyaya (original: asılın
+        şu anki yolu) sabit bağlantı oluşturur ve kaynağı siler. Hedef ad
+        BatchMover ile aynı indeksten ayrılır. Başarısızlıkta kaynak yerinde
+        kalır ve False döner.
+        """
+        started = time.perf_counter()
+        destination = None
+        try:
+            plan.target_folder.mkdir(parents=True, exist_ok=True)
+            for attempt in range(MAX_NAME_ATTEMPTS):
+                destination = names.reserve(plan.target_folder, plan.clean_name)
+                try:
+                    os.link(original, destination)
+                    break
+                except FileExistsError:
+                    # İndeks dışından eklenmiş bir dosya: klasörü yeniden listele
+                    names.commit(destination)
+                    names.invalidate(plan.target_folder)
+                    destination = None
+                    if attempt == MAX_NAME_ATTEMPTS - 1:
+                        raise
+            os.unlink(duplicate.source)
+        except OSError as e:
+            if destination is not None:
+                try:
+                    os.unlink(destination)
+                except OSError:
+                    pass
+                names.release(destination)
+            self.logger.warning(f"KOPYA BAĞLANAMADI | {duplicate.source.name}: {e}")
+            return False
+        names.commit(destination)
+        _folder_sizes.record(destination)
+        self.logger.info(f"KOPYA BAĞLANDI | {plan.category} | {duplicate.source.name} -> {destination.name}")
+        record_event("duplicate", plan.category, duplicate.source, original,
+                     duplicate.size, time.perf_counter() - started)
+        # Kaynak artık hedefteki bağlantı: meta veri indeksinde yolu taşı
+        try:
+            index = get_metadata_index()
+            if index is not None:
+                index.record_move(duplicate.source, destination)
+        except Exception as e:
+            self.logger.warning(f"KOPYA | meta veri indeksi güncellenemedi: {e}")
+        return True
+
+    def _apply(self, plans: List[MovePlan], duplicates_root: Path,
+               names: DestinationNames) -> Iterator[MovePlan]:
+        # Hedef klasörden yalnızca adaylarla aynı boyuttaki dosyalar referans olur
+        sources = []
+        sizes = set()
+        for plan in plans:
+            try:
+                item = as_file_info(plan.source)
+                size = item.size
+            except OSError:
+                continue
+            sources.append(item)
+            if size >= self.min_size:
+                sizes.add(size)
+        references = _folder_sizes.same_size({plan.target_folder for plan in plans}, sizes)
+        duplicates = self.find(sources, references)
+
+        if self.action == "hardlink":
+            # Asılı bu partide taşınacak kopyalar, planlar verilmeden önce
+            # beklemeye alınır: asıl taşınınca (record_move) yeni yoluna bağlanır
+            candidates = {os.fspath(item) for item in sources}
+            with _pending_lock:
+                for plan in plans:
+                    duplicate = duplicates.get(os.fspath(plan.source))
+                    if duplicate is not None and os.fspath(duplicate.original) in candidates:
+                        _pending_links.setdefault(os.fspath(duplicate.original), []).append(
+                            (self, plan, duplicate, names))
+
+        for plan in plans:
+            duplicate = duplicates.get(os.fspath(plan.source))
+            if duplicate is None:
+                yield plan
+                continue
+            started = time.perf_counter()
+            self.logger.info(f"KOPYA | {plan.category} | {duplicate.source.name} = "
+                             f"{duplicate.original.name} ({self.action})")
+            if self.action == "hardlink":
+                if os.fspath(duplicate.original) not in candidates:
+                    self._link_into_place(plan, duplicate, names, duplicate.original)
+                continue
+            if self.action == "move":
+                yield MovePlan(plan.source, self.folder_name, Path(duplicates_root) / self.folder_name,
+                               plan.clean_name)
+            record_event("duplicate", plan.category, duplicate.source, duplicate.original,
+                         duplicate.size, time.perf_counter() - started)
+
+    def filter_plans(self, plans: Iterable[MovePlan], duplicates_root,
+                     window: int = DEDUP_WINDOW,
+                     names: Optional[DestinationNames] = None) -> Iterator[MovePlan]:
+        """
+        Planları kopya eylemine göre süzer/yönlendirir (kapalıysa aynen geçirir).
+        Planlar window büyüklüğünde gruplarla değerlendirilir; önceki
+        pencerelerden taşınmış dosyalar hedef klasörde referans olarak görülür.
+        names: planları uygulayacak BatchMover'ın ad indeksi ("hardlink"
+        bağlantıları aynı indeksten ad alır, taşımalarla çakışmaz).
+        """
+        if not self.enabled:
+            yield from plans
+            return
+        if names is None:
+            names = DestinationNames()
+        batch = []
+        for plan in plans:
+            batch.append(plan)
+            if len(batch) >= window:
+                yield from self._apply(batch, duplicates_root, names)
+                batch = []
+        if batch:
+            yield from self._apply(batch, duplicates_root, names)
+
@@ -1,10 +1,33 @@
-import shutil
-import zipfile
+import itertools
+import os
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from config_loader import load_config
 from logger import get_logger
 from cleaner import sanitize_filename
+from classifier import get_classifier
+from scanner import FileInfo, as_file_info, is_ignored_name, scan, walk
+from batch_mover import BatchMover, MovePlan, resolve_jobs
+from journal import record_event
+from metadata_index import get_metadata_index
+from planner import DEFAULT_PAGE_SIZE, iter_preview, plan_cursors, plan_from_item
+from sinks import open_sink
+from filter_expr import compile_expression
+from archiver import DEFAULT_LEVEL, ParallelZipWriter, TarArchiveWriter, tar_mode
+from compression import CompressionPolicy
+from dedup import Deduplicator, record_move
+
+# Filtre maliyet sınıfları: yalnızca ad/uzantı < stat (boyut, tarih) < içerik okuma
+COST_NAME = 0
+COST_STAT = 1
+COST_CONTENT = 2
+COST_LABELS = {COST_NAME: "name", COST_STAT: "stat", COST_CONTENT: "content"}
+
+# CompositeFilter bu kadar değerlendirmede bir sırayı gözlenen eleme oranlarına göre yeniler
+REORDER_EVERY = 1024
+# Gözlem azken tahmini seçiciliğin ağırlığı (sanal örnek sayısı)
+SELECTIVITY_PRIOR_WEIGHT = 32
 
 class FilterRules:
     """Filtreleme kurallarını tanımlar ve valide eder."""
@@ -26,6 +49,9 @@ class FilterRules:
 class SizeFilter:
     """Dosya boyutuna göre filtreleme."""
     
+    cost = COST_STAT
+    selectivity = 0.5
+    
     def __init__(self, min_size_mb: float = 0, max_size_mb: float = float('inf')):
         """
         min_size_mb: Minimum dosya boyutu (MB cinsinden)
@@ -34,14 +60,22 @@ class SizeFilter:
         self.min_bytes = min_size_mb * (1024 * 1024)
         self.max_bytes = max_size_mb * (1024 * 1024)
     
-    def matches(self, file_path: Path) -> bool:
+    def matches(self, file_path) -> bool:
         """Dosyanın boyut kriterine uyup uymadığını kontrol eder."""
-        if not file_path.exists():
+        # FileInfo tarama sırasında alınan stat sonucunu tekrar kullanır
+        try:
+            file_size = as_file_info(file_path).size
+        except OSError:
             return False
         
-        file_size = file_path.stat().st_size
         return self.min_bytes <= file_size <= self.max_bytes
     
+    def sql(self) -> Tuple[str, list]:
+        """Meta veri indeksi için eşdeğer SQL koşulu."""
+        if self.max_bytes == float('inf'):
+            return "size >= ?", [self.min_bytes]
+        return "size BETWEEN ? AND ?", [self.min_bytes, self.max_bytes]
+    
     def __repr__(self):
         return f"SizeFilter({self.min_bytes / (1024*1024):.1f}MB - {self.max_bytes / (1024*1024):.1f}MB)"
 
@@ -49,6 +83,10 @@ class SizeFilter:
 class ExtensionFilter:
     """Dosya uzantısına göre filtreleme."""
     
+    cost = COST_NAME
+    # Tipik bir indirme klasöründe birkaç uzantı dosyaların küçük bir kısmını seçer
+    selectivity = 0.2
+    
     def __init__(self, extensions: List[str]):
         """
         extensions: Filtrelenecek uzantılar (örn: [".jpg", ".png"])
@@ -56,10 +94,14 @@ class ExtensionFilter:
         # Tüm uzantıları küçük harfe çevir
         self.extensions = [ext.lower() if ext.startswith('.') else f'.{ext.lower()}' 
                           for ext in extensions]
+        self.extension_set = frozenset(self.extensions)
     
     def matches(self, file_path: Path) -> bool:
         """Dosyanın uzantı kriterine uyup uymadığını kontrol eder."""
-        return file_path.suffix.lower() in self.extensions
+        return file_path.suffix.lower() in self.extension_set
+    
+    def sql(self) -> Tuple[str, list]:
+        return f"ext IN ({', '.join('?' * len(self.extensions))})", list(self.extensions)
     
     def __repr__(self):
         return f"ExtensionFilter({self.extensions})"
@@ -68,49 +110,147 @@ class ExtensionFilter:
 class CategoryFilter:
     """Dosya kategorisine göre filtreleme (Images, Documents, vb)."""
     
+    cost = COST_NAME
+    selectivity = 0.3
+    
     def __init__(self, categories: List[str]):
         """
         categories: Filtrelenecek kategoriler (örn: ["Images", "Documents"])
         """
         self.categories = categories
+        self.category_set = frozenset(categories)
         self.config = load_config()
-        self.extensions_map = self.config.get("file_extensions", {})
+        self.classifier = get_classifier(self.config)
+        # İçerik tanıma açıksa uzantısı bilinmeyen dosyalar için dosya okunur
+        if self.classifier.sniffer is not None:
+            self.cost = COST_CONTENT
     
     def matches(self, file_path: Path) -> bool:
         """Dosyanın kategori kriterine uyup uymadığını kontrol eder."""
-        file_ext = file_path.suffix.lower()
-        
-        for category in self.categories:
-            extensions = self.extensions_map.get(category, [])
-            if file_ext in extensions:
-                return True
-        
-        return False
+        return self.classifier.classify(file_path) in self.category_set
+    
+    def sql(self) -> Tuple[str, list]:
+        return f"category IN ({', '.join('?' * len(self.categories))})", list(self.categories)
     
     def __repr__(self):
         return f"CategoryFilter({self.categories})"
 
 
+class FilterStats:
+    """CompositeFilter içindeki bir filtrenin sayaçları."""
+    
+    __slots__ = ("filter", "cost", "selectivity", "calls", "rejected", "seconds")
+    
+    def __init__(self, filter_obj):
+        self.filter = filter_obj
+        # Maliyetini bildirmeyen filtreler stat gerektiriyor kabul edilir
+        self.cost = getattr(filter_obj, "cost", COST_STAT)
+        selectivity = getattr(filter_obj, "selectivity", None)
+        self.selectivity = 0.5 if selectivity is None else selectivity
+        self.calls = 0
+        self.rejected = 0
+        self.seconds = 0.0
+    
+    def pass_rate(self) -> float:
+        """Gözlenen geçme oranı; gözlem azken tahmini seçiciliğe yakındır."""
+        passed = self.calls - self.rejected
+        return (passed + self.selectivity * SELECTIVITY_PRIOR_WEIGHT) / (self.calls + SELECTIVITY_PRIOR_WEIGHT)
+    
+    def to_dict(self) -> Dict:
+        return {
+            "filter": repr(self.filter),
+            "cost": COST_LABELS.get(self.cost, str(self.cost)),
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "pass_rate": round(self.pass_rate(), 4),
+            "avg_us": round(self.seconds / self.calls * 1e6, 3) if self.calls else 0.0,
+        }
+
+
 class CompositeFilter:
-    """Birden fazla filtreyi birleştirir (AND mantığı)."""
+    """
+    Birden fazla filtreyi birleştirir (AND mantığı).
+    
+    Filtreler eklenme sırasıyla değil, en ucuz maliyet sınıfından başlayarak
+    değerlendirilir; aynı sınıftakiler arasında en çok eleyen öne alınır. İlk
+    reddeden filtrede durulur, böylece uzantısı uymayan dosya hiç stat'lanmaz.
+    Sıra REORDER_EVERY değerlendirmede bir gözlenen eleme oranlarıyla yenilenir.
+    """
     
     def __init__(self, filters: List = None):
         """
         filters: Uygulanacak filtreler listesi
         """
         self.filters = filters or []
+        self._stats = [FilterStats(f) for f in self.filters]
+        self._order = []
+        self._evaluations = 0
+        self._reorder()
     
     def add_filter(self, filter_obj):
         """Filtre ekle."""
         self.filters.append(filter_obj)
+        self._stats.append(FilterStats(filter_obj))
+        self._reorder()
         return self
     
+    def _reorder(self):
+        self._order = sorted(self._stats, key=lambda st: (st.cost, st.pass_rate()))
+        self._next_reorder = self._evaluations + REORDER_EVERY
+    
     def matches(self, file_path: Path) -> bool:
         """Tüm filtreleri kontrol et (hepsi true olmalı)."""
-        if not self.filters:
+        if not self._order:
             return True
         
-        return all(f.matches(file_path) for f in self.filters)
+        self._evaluations += 1
+        if self._evaluations >= self._next_reorder:
+            self._reorder()
+        
+        for st in self._order:
+            started = time.perf_counter()
+            ok = st.filter.matches(file_path)
+            st.seconds += time.perf_counter() - started
+            st.calls += 1
+            if not ok:
+                st.rejected += 1
+                return False
+        return True
+    
+    def scan_depth(self) -> Optional[int]:
+        """
+        Taranması gereken alt klasör derinliği: 0 yalnızca kaynak klasör,
+        None sınırsız. Sadece derinlik koşulu içeren ifadeler 0'dan farklı döner.
+        """
+        depth = 0
+        for f in self.filters:
+            f_depth = getattr(f, "max_depth", 0)
+            if f_depth is None:
+                return None
+            depth = max(depth, f_depth)
+        return depth
+    
+    def evaluation_order(self) -> List:
+        """Filtrelerin şu anki değerlendirme sırası."""
+        return [st.filter for st in self._order]
+    
+    def stats(self) -> List[Dict]:
+        """Filtre bazında çağrı/eleme sayıları ve ortalama süre (değerlendirme sırasıyla)."""
+        return [st.to_dict() for st in self._order]
+    
+    def sql(self) -> Optional[Tuple[str, list]]:
+        """
+        Tüm filtrelerin SQL koşullarının AND birleşimi.
+        SQL karşılığı olmayan bir filtre varsa None (indeks kullanılamaz).
+        """
+        clauses, params = [], []
+        for f in self.filters:
+            if not hasattr(f, "sql"):
+                return None
+            clause, values = f.sql()
+            clauses.append(f"({clause})")
+            params.extend(values)
+        return " AND ".join(clauses), params
     
     def __repr__(self):
         return f"CompositeFilter({self.filters})"
@@ -119,138 +259,177 @@ class CompositeFilter:
 class FilterEngine:
     """Ana filtreleme motoru - tüm işlemleri koordine eder."""
     
-    def __init__(self):
+    def __init__(self, jobs: Optional[int] = None):
         self.config = load_config()
         self.logger = get_logger()
+        self.jobs = resolve_jobs(self.config, jobs)
         self.source_dir = Path(self.config["source_directory"])
         self.dest_dir = Path(self.config["destination_directory"])
         self.extensions_map = self.config.get("file_extensions", {})
+        self.classifier = get_classifier(self.config)
         self.sanitize = sanitize_filename
     
-    def scan_with_filters(self, composite_filter: CompositeFilter) -> List[Path]:
+    def iter_matching(self, composite_filter: CompositeFilter) -> Iterator[FileInfo]:
+        """
+        Filtrelere uyan dosyaları tembel (lazy) üretir. Meta veri indeksi
+        etkinse ve tüm filtrelerin SQL karşılığı varsa klasör taranmaz; aday
+        dosyalar indeksten sorgulanıp stat ile doğrulanır.
+        """
+        self.classifier.begin_scan()
+        depth = composite_filter.scan_depth()
+        if depth != 0:
+            # İndeks yalnızca kaynak klasörün kendisini tutar; alt klasörler taranır
+            yield from self._iter_walk(composite_filter, depth)
+            return
+        
+        index = get_metadata_index()
+        query = composite_filter.sql() if index is not None else None
+        if query is not None:
+            yield from self._iter_indexed(index, composite_filter, *query)
+            return
+
+        for item in scan(self.source_dir):
+            # Sistem ve rapor dosyalarını atla
+            if is_ignored_name(item.name):
+                continue
+            
+            # Filtreleri uygula
+            if composite_filter.matches(item):
+                yield item
+    
+    def _iter_walk(self, composite_filter: CompositeFilter, depth: Optional[int]) -> Iterator[FileInfo]:
+        # Hedef klasör kaynağın içindeyse taşınmış dosyalar tekrar bulunmasın
+        for item in walk(self.source_dir, depth, exclude=(self.dest_dir,)):
+            if not is_ignored_name(item.name) and composite_filter.matches(item):
+                yield item
+    
+    def _iter_indexed(self, index, composite_filter: CompositeFilter, where: str, params) -> Iterator[FileInfo]:
+        # Klasör mtime'ı değiştiyse (dosya eklendi/silindi) önce indeksi eşitle
+        index.reconcile(self.source_dir)
+        for path in index.query(self.source_dir, where, params):
+            if is_ignored_name(os.path.basename(path)):
+                continue
+            try:
+                item = FileInfo.from_path(path)
+            except OSError:
+                index.remove(path)
+                continue
+            # İndeks satırı eskimiş olabilir (yerinde değişen dosya): güncel stat ile tekrar kontrol
+            if not item.is_dir and composite_filter.matches(item):
+                yield item
+
+    def scan_with_filters(self, composite_filter: CompositeFilter) -> List[FileInfo]:
         """
         Klasörü tara ve filtreleri uygula.
-        Eşleşen dosyaların listesini döner.
+        Eşleşen dosyaların FileInfo listesini döner (her dosya en fazla bir kez stat'lanır).
         """
         if not self.source_dir.exists():
             self.logger.error(f"Kaynak klasör bulunamadı: {self.source_dir}")
             return []
         
-        matching_files = []
-        
         try:
-            for item in self.source_dir.iterdir():
-                if item.is_file():
-                    # Sistem dosyalarını atla
-                    if item.suffix in ['.tmp', '.crdownload', '.part']:
-                        continue
-                    
-                    # Rapor dosyalarını atla
-                    if item.name == "report.txt" or (item.name.startswith("report_") and item.suffix == ".txt"):
-                        continue
-                    
-                    # Filtreleri uygula
-                    if composite_filter.matches(item):
-                        matching_files.append(item)
-            
+            matching_files = list(self.iter_matching(composite_filter))
             self.logger.info(f"Filtreleme Tamamlandı: {len(matching_files)} dosya eşleşti")
+            self._log_filter_stats(composite_filter)
             return matching_files
         
         except Exception as e:
             self.logger.error(f"Tarama sırasında hata: {e}")
             return []
     
-    def _get_unique_path(self, target_folder: Path, clean_name: str) -> Path:
-        """Aynı isimde dosya varsa benzersiz isim oluştur."""
-        destination_path = target_folder / clean_name
-        
-        if not destination_path.exists():
-            return destination_path
-        
-        counter = 1
-        stem = Path(clean_name).stem
-        suffix = Path(clean_name).suffix
-        
-        while True:
-            new_name = f"{stem}_{counter}{suffix}"
-            candidate_path = target_folder / new_name
-            if not candidate_path.exists():
-                return candidate_path
-            counter += 1
+    def _log_filter_stats(self, composite_filter: CompositeFilter):
+        for entry in composite_filter.stats():
+            self.logger.debug(
+                f"FİLTRE İSTATİSTİK | {entry['filter']} [{entry['cost']}] - "
+                f"{entry['calls']} çağrı, {entry['rejected']} eleme, ort. {entry['avg_us']} µs"
+            )
     
     def _get_category_for_file(self, file_path: Path) -> str:
         """Dosyanın kategorisini belirle."""
-        file_extension = file_path.suffix.lower()
-        
-        for category, extensions in self.extensions_map.items():
-            if file_extension in extensions:
-                return category
-        
-        return "Others"
+        return self.classifier.classify(file_path)
     
-    def organize_files(self, matching_files: List[Path], use_category_folders: bool = True) -> Dict:
+    def organize_files(self, matching_files: List[FileInfo], use_category_folders: bool = True,
+                       dedup=None) -> Dict:
         """
         Eşleşen dosyaları organize et.
         
         Args:
             matching_files: Organize edilecek dosya listesi
             use_category_folders: True ise kategoriye göre klasör oluştur, False ise tek klasöre koy
+            dedup: Kopya eylemi ("skip" | "hardlink" | "move"), False ile kapalı;
+                verilmezse config "dedup" ayarı kullanılır
         
         Returns:
             İstatistikler (taşınan, hata vb.)
         """
-        stats = {
-            "moved": 0,
-            "errors": 0,
-            "details": []
-        }
-        
+        # Önce tüm taşımaları planla, kopyaları ele, sonra işçi havuzunda çalıştır
+        mover = self._new_mover()
+        plans = list(self._dedup_plans(self.plan_files(matching_files, use_category_folders), dedup, mover))
+        return mover.run(plans)
+    
+    def _dedup_plans(self, plans: Iterable[MovePlan], dedup, mover: BatchMover) -> Iterator[MovePlan]:
+        return Deduplicator(self.config, self.logger, dedup).filter_plans(plans, self.dest_dir,
+                                                                          names=mover.names)
+    
+    def plan_files(self, matching_files: Iterable[FileInfo], use_category_folders: bool = True) -> Iterator[MovePlan]:
+        """Eşleşen dosyalar için taşıma planları üretir (dosya sistemine dokunmaz)."""
         for file_path in matching_files:
-            try:
-                # Kategori belirle
-                category = self._get_category_for_file(file_path)
-                
-                # Hedef klasör
-                if use_category_folders:
-                    target_folder = self.dest_dir / category
-                else:
-                    target_folder = self.dest_dir / "Filtered_Files"
-                
-                target_folder.mkdir(parents=True, exist_ok=True)
-                
-                # İsim temizle
-                clean_name = self.sanitize(file_path.name)
-                destination_path = self._get_unique_path(target_folder, clean_name)
-                
-                # Taşı
-                shutil.move(str(file_path), str(destination_path))
-                
-                log_msg = f"FİLTRE TASINDI | {category} | {file_path.name} -> {destination_path.name}"
-                self.logger.info(log_msg)
-                
-                stats["moved"] += 1
-                stats["details"].append({
-                    "file": file_path.name,
-                    "category": category,
-                    "destination": str(destination_path)
-                })
-                
-            except PermissionError:
-                self.logger.error(f"ERİŞİM HATASI | {file_path.name}")
-                stats["errors"] += 1
-            except Exception as e:
-                self.logger.error(f"HATA | {file_path.name}: {e}")
-                stats["errors"] += 1
-        
-        return stats
+            # Kategori belirle
+            category = self._get_category_for_file(file_path)
+            
+            # Hedef klasör
+            if use_category_folders:
+                target_folder = self.dest_dir / category
+            else:
+                target_folder = self.dest_dir / "Filtered_Files"
+            
+            # İsim temizle (benzersiz ad taşıma anında ayrılır)
+            yield MovePlan(file_path, category, target_folder, self.sanitize(file_path.name))
+    
+    def _new_mover(self) -> BatchMover:
+        return BatchMover(self.logger, self.jobs, log_tag="FİLTRE TASINDI", operation="filter_move",
+                          on_moved=lambda plan, destination: record_move(destination, plan.source))
+    
+    def preview(self, filter_config: Dict, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Optional[Dict]:
+        """
+        Kuru çalıştırma (dry-run) önizlemesinin bir sayfasını döner:
+        {"items": [...], "next_cursor": ...}. Süresi dolmuş imleç için None.
+        """
+        if cursor:
+            return plan_cursors.next_page(cursor, limit)
+        if not self.source_dir.exists():
+            self.logger.error(f"Kaynak klasör bulunamadı: {self.source_dir}")
+            return {"items": [], "next_cursor": None}
+        plans = self.plan_files(self.iter_matching(self.build_filter(filter_config)),
+                                filter_config.get("use_category_folders", True))
+        return plan_cursors.paginate(iter_preview(plans), limit)
+    
+    def execute_plan(self, items: Iterable[Dict]) -> Dict:
+        """Önizlemeden seçilen kayıtları yeniden tarama yapmadan uygular."""
+        return self._new_mover().run(plan_from_item(item) for item in items)
     
-    def archive_folders(self, matching_files: List[Path], archive_name: str = "archive.zip") -> Dict:
+    def archive_folders(self, matching_files: Iterable[FileInfo], archive_name: str = "archive.zip",
+                        sink: Optional[Callable[[Dict], None]] = None, workers: Optional[int] = None,
+                        mode: Optional[str] = None) -> Dict:
         """
-        Eşleşen dosyaları ZIP dosyası içine arşivle.
+        Eşleşen dosyaları ZIP (veya .tar/.tar.gz/.tar.bz2/.tar.xz) içine arşivle.
+        ZIP'te her dosyanın yöntemi ve seviyesi compression.CompressionPolicy
+        ile seçilir (zaten sıkıştırılmış biçimler saklanır).
+        
+        Arşiv akış halinde yazılır; config archive.max_volume_mb verilmişse
+        ZIP bu boyutta ciltlere bölünür (ad.zip, ad.002.zip, ...). Kaynak
+        dosyalar ancak bulundukları cildin merkezi dizini diske yazılıp
+        fsync edildikten sonra silinir.
         
         Args:
-            matching_files: Arşivlenecek dosya listesi
-            archive_name: ZIP dosyasının adı
+            matching_files: Arşivlenecek dosyalar (liste veya tembel üreteç)
+            archive_name: Arşiv dosyasının adı; uzantısı biçimi belirler
+            sink: Verilirse her arşivlenen dosya için detay sözlüğüyle çağrılır
+            workers: Üyeleri paralel sıkıştıran iş parçacığı sayısı
+                (archiver.ParallelZipWriter); verilmezse config archive.workers
+            mode: Arşiv zaten varsa "new" (yeni ad seç), "append" (yeniden
+                sıkıştırmadan sonuna ekle) veya "overwrite"; verilmezse
+                config archive.mode
         
         Returns:
             İstatistikler
@@ -258,41 +437,77 @@ class FilterEngine:
         stats = {
             "archived": 0,
             "errors": 0,
-            "archive_path": None
+            "archive_path": None,
+            "volumes": []
         }
         
-        if not matching_files:
+        # Üreteç de olabilir: boş mu diye ilk öğeye bakılır
+        iterator = iter(matching_files)
+        first = next(iterator, None)
+        if first is None:
             return stats
+        matching_files = itertools.chain((first,), iterator)
+        
+        settings = self.config.get("archive", {})
+        if workers is None:
+            workers = settings.get("workers", 0)
+        mode = mode or settings.get("mode", "new")
+        level = settings.get("level", DEFAULT_LEVEL)
+        
+        # Arşiv dosyasının yolu (mode "new" ise yazıcı boş bir ad seçer)
+        archive_path = self.dest_dir / archive_name
         
         try:
-            # ZIP dosyasının yolu
-            archive_path = self.dest_dir / archive_name
+            if tar_mode(archive_name) is not None:
+                # tar'da sıkıştırma tüm akışa uygulanır, dosya bazlı politika yoktur
+                writer = TarArchiveWriter(archive_path, level, mode)
+            else:
+                chunk_size = int(settings.get("chunk_mb", 1) * 1024 * 1024)
+                max_volume = int(settings.get("max_volume_mb", 0) * 1024 * 1024)
+                policy = CompressionPolicy.from_config(self.config, self.classifier)
+                writer = ParallelZipWriter(archive_path, max(1, workers or 1), level, chunk_size, policy,
+                                           max_volume_bytes=max_volume, mode=mode)
+            
+            # Kategori dosya yazılmadan önce belirlenir: silindikten sonra
+            # içerik tanıma (sniffer) dosyayı okuyamaz
+            categories: Dict[str, str] = {}
+            
+            def members():
+                for f in matching_files:
+                    categories[os.fspath(f)] = self._get_category_for_file(f)
+                    # Arşiv içindeki dosya adı (klasör yapısı korunmaz, flat)
+                    yield f, f.name
             
-            with zipfile.ZipFile(str(archive_path), 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for file_path in matching_files:
+            with writer:
+                for member in writer.write_members(members()):
+                    file_path = member.source
+                    category = categories.pop(os.fspath(file_path), None)
                     try:
-                        # ZIP içindeki dosya adı (klasör yapısı korunmaz, flat)
-                        arcname = file_path.name
-                        zipf.write(str(file_path), arcname=arcname)
-                        
-                        # Orijinal dosyayı sil (isteğe bağlı)
-                        file_path.unlink()
+                        if member.error is not None:
+                            raise member.error
+                        # Orijinal dosyayı sil: üye artık diske yazılmış bir arşivde
+                        os.unlink(file_path)
                         
                         stats["archived"] += 1
-                        
+                        record_event("archive", category, file_path, member.volume, member.size, member.seconds)
+                        if sink is not None:
+                            sink({"file": file_path.name, "category": category, "archive": member.volume})
                     except Exception as e:
                         self.logger.error(f"Arşivleme hatası | {file_path.name}: {e}")
                         stats["errors"] += 1
             
-            stats["archive_path"] = str(archive_path)
-            self.logger.info(f"ARŞİVLEME TAMAMLANDI | {archive_name} - {stats['archived']} dosya")
+            stats["archive_path"] = writer.path
+            stats["volumes"] = list(writer.volumes)
+            self.logger.info(f"ARŞİVLEME TAMAMLANDI | {os.path.basename(writer.path)} - "
+                             f"{stats['archived']} dosya, {len(writer.volumes)} cilt")
             
         except Exception as e:
-            self.logger.error(f"ZIP oluşturulurken hata: {e}")
+            self.logger.error(f"Arşiv oluşturulurken hata: {e}")
         
         return stats
     
-    def execute(self, filter_config: Dict, organize_mode: str = "organize") -> Dict:
+    def execute(self, filter_config: Dict, organize_mode: str = "organize",
+                stream: bool = False, sink=None) -> Dict:
         """
         Ana işlem - filtreleri uygula ve işlem yap.
         
@@ -303,60 +518,170 @@ class FilterEngine:
                     "size_max_mb": float('inf'),
                     "extensions": [],
                     "categories": [],
+                    "expression": "",  # opsiyonel, örn. "(*.jpg, *.png) and size>1MB"
                     "use_category_folders": True,
-                    "archive_name": "archive.zip"
+                    "archive_name": "archive.zip",
+                    "archive_workers": 4,  # opsiyonel, paralel ZIP sıkıştırma (0/1 = kapalı)
+                    "archive_mode": "new",  # opsiyonel, "new" | "append" | "overwrite"
+                    "dedup": "skip",  # opsiyonel, "skip" | "hardlink" | "move" | False
+                    "jobs": 4,  # opsiyonel, paralel taşıma işçi sayısı
+                    "dry_run": False  # True ise "preview" gibi davranır
                 }
-            organize_mode: "organize" | "archive" | "both"
+            organize_mode: "organize" | "archive" | "both" | "preview"
+            stream: True ise (veya filter_config["stream"]) tarama, filtreleme,
+                taşıma ve arşivleme zincirlenmiş üreteçlerle yapılır; bellekte
+                liste tutulmaz ve sadece sayaçlar döner (bkz. execute_stream)
+            sink: Akış modunda dosya bazlı detayların hedefi (bkz. sinks.open_sink)
         
         Returns:
             İşlem sonuçları
         """
-        # Filtre oluştur
-        composite_filter = CompositeFilter()
+        if stream or filter_config.get("stream"):
+            return self.execute_stream(filter_config, organize_mode, sink)
         
-        # Boyut filtresi
-        if "size_min_mb" in filter_config or "size_max_mb" in filter_config:
-            min_size = filter_config.get("size_min_mb", 0)
-            max_size = filter_config.get("size_max_mb", float('inf'))
-            composite_filter.add_filter(SizeFilter(min_size, max_size))
-        
-        # Uzantı filtresi
-        if filter_config.get("extensions"):
-            composite_filter.add_filter(ExtensionFilter(filter_config["extensions"]))
-        
-        # Kategori filtresi
-        if filter_config.get("categories"):
-            composite_filter.add_filter(CategoryFilter(filter_config["categories"]))
+        composite_filter = self.build_filter(filter_config)
         
         # Dosyaları tara
         matching_files = self.scan_with_filters(composite_filter)
         
         if not matching_files:
             self.logger.warning("Filtrelere uygun dosya bulunamadı.")
-            return {"matched": 0, "organize": None, "archive": None}
+            return {"matched": 0, "organize": None, "archive": None,
+                    "filter_stats": composite_filter.stats()}
         
         results = {
             "matched": len(matching_files),
             "organize": None,
-            "archive": None
+            "archive": None,
+            "filter_stats": composite_filter.stats()
         }
         
-        # Organize modu
+        if filter_config.get("jobs"):
+            self.jobs = resolve_jobs(self.config, filter_config["jobs"])
+        
+        # Önizleme (dry-run) modu: sadece plan döner, hiçbir dosya taşınmaz
         use_categories = filter_config.get("use_category_folders", True)
+        if organize_mode == "preview" or filter_config.get("dry_run"):
+            results["plan"] = list(iter_preview(self.plan_files(matching_files, use_categories)))
+            return results
+        
+        # Organize modu
         if organize_mode in ["organize", "both"]:
-            results["organize"] = self.organize_files(matching_files, use_categories)
+            results["organize"] = self.organize_files(matching_files, use_categories,
+                                                      filter_config.get("dedup"))
         
-        # Archive modu (eğer organize yapıldıysa tekrar tarama gerekir)
+        # Archive modu (ilk taramanın FileInfo kayıtları kullanılır, yeniden tarama yapılmaz)
         if organize_mode in ["archive", "both"]:
-            # Archive için yeni liste oluştur (matching_files'daki dosyalar artık taşınmış olabilir)
-            if organize_mode == "archive":
-                matching_files = self.scan_with_filters(composite_filter)
-            
             if matching_files:
                 archive_name = filter_config.get("archive_name", "archive.zip")
-                results["archive"] = self.archive_folders(matching_files, archive_name)
+                results["archive"] = self.archive_folders(matching_files, archive_name,
+                                                          workers=filter_config.get("archive_workers"),
+                                                          mode=filter_config.get("archive_mode"))
+        
+        return results
+    
+    def execute_stream(self, filter_config: Dict, organize_mode: str = "organize", sink=None) -> Dict:
+        """
+        execute'un akış (streaming) modu.
+        
+        Tarama -> filtre -> plan -> taşıma -> arşiv aşamaları birbirine bağlı
+        üreteçlerdir; taşıma aşamasında en fazla jobs * 4 iş bekler. İlk dosya
+        tarama bitmeden taşınır ve bellek kullanımı dosya sayısından bağımsızdır.
+        Dosya bazlı detaylar sink'e gider (dosya yolu, açık dosya, çağrılabilir
+        veya "journal"), sonuçta sadece sayaçlar döner. "both" modunda dosyalar
+        önce taşınır, taşındıkları yerden arşivlenir.
+        """
+        results = {"matched": 0, "organize": None, "archive": None, "streamed": True}
+        if not self.source_dir.exists():
+            self.logger.error(f"Kaynak klasör bulunamadı: {self.source_dir}")
+            return results
         
+        if filter_config.get("jobs"):
+            self.jobs = resolve_jobs(self.config, filter_config["jobs"])
+        use_categories = filter_config.get("use_category_folders", True)
+        archive_name = filter_config.get("archive_name", "archive.zip")
+        
+        def counted(files):
+            for item in files:
+                results["matched"] += 1
+                yield item
+        
+        composite_filter = self.build_filter(filter_config)
+        matching = counted(self.iter_matching(composite_filter))
+        
+        with open_sink(sink) as emit:
+            if organize_mode == "preview" or filter_config.get("dry_run"):
+                planned = 0
+                for item in iter_preview(self.plan_files(matching, use_categories)):
+                    planned += 1
+                    if emit is not None:
+                        emit(item)
+                results["planned"] = planned
+            
+            elif organize_mode in ("organize", "both"):
+                organize_stats = {"moved": 0, "errors": 0}
+                results["organize"] = organize_stats
+                
+                def moved_files():
+                    mover = self._new_mover()
+                    plans = self._dedup_plans(self.plan_files(matching, use_categories),
+                                              filter_config.get("dedup"), mover)
+                    for _, detail in mover.iter_run(plans):
+                        if detail is None:
+                            organize_stats["errors"] += 1
+                            continue
+                        organize_stats["moved"] += 1
+                        if emit is not None:
+                            emit(detail)
+                        if organize_mode == "both":
+                            yield Path(detail["destination"])
+                
+                if organize_mode == "both":
+                    results["archive"] = self.archive_folders(moved_files(), archive_name, emit,
+                                                              filter_config.get("archive_workers"),
+                                                              filter_config.get("archive_mode"))
+                else:
+                    for _ in moved_files():
+                        pass
+            
+            elif organize_mode == "archive":
+                results["archive"] = self.archive_folders(matching, archive_name, emit,
+                                                          filter_config.get("archive_workers"),
+                                                          filter_config.get("archive_mode"))
+        
+        self.logger.info(f"Filtreleme Tamamlandı (akış): {results['matched']} dosya eşleşti")
+        self._log_filter_stats(composite_filter)
+        results["filter_stats"] = composite_filter.stats()
         return results
+    
+    def build_filter(self, filter_config: Dict) -> CompositeFilter:
+        """filter_config sözlüğünden birleşik filtre oluşturur."""
+        composite_filter = CompositeFilter()
+        
+        # Boyut filtresi (0 - sınırsız aralığı her dosyayı geçirir, stat'a gerek yok)
+        if "size_min_mb" in filter_config or "size_max_mb" in filter_config:
+            min_size = filter_config.get("size_min_mb", 0) or 0
+            max_size = filter_config.get("size_max_mb", float('inf'))
+            if max_size is None:
+                max_size = float('inf')
+            if min_size > 0 or max_size != float('inf'):
+                composite_filter.add_filter(SizeFilter(min_size, max_size))
+        
+        # Uzantı filtresi
+        if filter_config.get("extensions"):
+            composite_filter.add_filter(ExtensionFilter(filter_config["extensions"]))
+        
+        # Kategori filtresi
+        if filter_config.get("categories"):
+            composite_filter.add_filter(CategoryFilter(filter_config["categories"]))
+        
+        # Filtre ifadesi (diğer alanlarla AND'lenir), bkz. filter_expr.FilterExpression
+        if (filter_config.get("expression") or "").strip():
+            composite_filter.add_filter(compile_expression(filter_config["expression"],
+                                                           root=self.source_dir,
+                                                           classifier=self.classifier))
+        
+        return composite_filter
 
 
 if __name__ == "__main__":
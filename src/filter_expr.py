@@ -0,0 +1,520 @@
+import fnmatch
+import os
+import re
+import time
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+from config_loader import load_config
+from classifier import get_classifier
+from scanner import as_file_info
+
+# CompositeFilter ile aynı maliyet sınıfları (filter_engine içe aktarılmadan)
+COST_NAME = 0
+COST_STAT = 1
+
+_SIZE_UNITS = {"": 1, "b": 1, "k": 1024, "kb": 1024, "m": 1024 ** 2, "mb": 1024 ** 2,
+               "g": 1024 ** 3, "gb": 1024 ** 3, "t": 1024 ** 4, "tb": 1024 ** 4}
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+_TOKEN_RE = re.compile(r"""\s*(?:(?P<open>\()|(?P<close>\))|(?P<word>(?:[^\s()"']|"[^"]*"|'[^']*')+))""")
+_TERM_RE = re.compile(r"^([A-Za-z_]+)(<=|>=|==|!=|<|>|=|:)(.*)$", re.S)
+_LIST_ITEM_RE = re.compile(r"""(?:[^,"']|"[^"]*"|'[^']*')+""")
+_QUOTED_RE = re.compile(r""""([^"]*)"|'([^']*)'""")
+_SIZE_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*([a-z]*)$", re.I)
+_DURATION_RE = re.compile(r"^(\d+(?:\.\d+)?)([smhdw])$", re.I)
+
+_COMMA_RE = re.compile(r"\s*,")
+
+_KEYWORDS = {"and": "and", "&&": "and", "or": "or", "||": "or", "not": "not", "!": "not"}
+
+FIELDS = ("name", "path", "re", "regex", "ext", "size", "mtime", "ctime", "cat", "category", "depth")
+# Değeri virgüllü liste olabilen alanlar
+LIST_FIELDS = ("name", "path", "ext", "cat", "category")
+
+
+class FilterExpressionError(ValueError):
+    """Filtre ifadesi çözümlenemediğinde fırlatılır."""
+
+
+class _Leaf:
+    """
+    Tek bir koşul. kind "glob", "regex", "ext" ve "category" ise değerler
+    OR altında aynı türden kardeşleriyle tek bir regex / frozenset'e
+    birleştirilebilir; "pred" kendi başına derlenmiş bir fonksiyondur.
+    """
+
+    __slots__ = ("kind", "values", "cost", "is_depth", "depth_bound")
+
+    def __init__(self, kind: str, values, cost: int = COST_NAME, is_depth: bool = False, depth_bound=0):
+        self.kind = kind
+        self.values = values
+        self.cost = cost
+        self.is_depth = is_depth
+        # Derinlik koşulunun doğru olabileceği en büyük derinlik (None: sınırsız)
+        self.depth_bound = depth_bound
+
+
+# ----------------------------------------------------------------------
+# Sözcükler ve ayrıştırma
+# ----------------------------------------------------------------------
+def _unquote(value: str) -> str:
+    return _QUOTED_RE.sub(lambda m: m.group(1) if m.group(1) is not None else m.group(2), value)
+
+
+def _split_list(value: str) -> List[str]:
+    return [_unquote(item).strip() for item in _LIST_ITEM_RE.findall(value) if _unquote(item).strip()]
+
+
+def _continue_list(text: str, word: str, pos: int) -> Tuple[str, int]:
+    """
+    "cat:Images, Documents": liste alanında virgülden sonraki boşluk değer
+    listesini bölmez, sonraki sözcük listeye eklenir. Virgülden sonra başka
+    bir koşul gelirse virgül OR'dur; hiçbir değer gelmezse hata verilir.
+    """
+    if _TERM_RE.match(word).group(1) not in LIST_FIELDS:
+        return word, pos
+    while word.endswith(",") or _COMMA_RE.match(text, pos):
+        following = _TOKEN_RE.match(text, pos)
+        value = following.group("word") if following is not None else None
+        if value is None or value.lower() in _KEYWORDS:
+            raise FilterExpressionError(f"Virgülden sonra değer bekleniyor (konum {pos}): {word!r}")
+        if _TERM_RE.match(value):
+            break
+        word += value
+        pos = following.end()
+    return word, pos
+
+
+def _after_comma(text: str, tokens: List[Tuple[str, str, int]], start: int) -> bool:
+    """Önceki koşul ile bu sözcük arasında virgül var mı (varsa OR)."""
+    return bool(tokens) and tokens[-1][0] == "term" and text[tokens[-1][2]:start].rstrip().endswith(",")
+
+
+def _tokenize(text: str) -> List[Tuple[str, str, int]]:
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if match is None or match.end() == pos:
+            if text[pos:].strip():
+                raise FilterExpressionError(f"Çözümlenemeyen ifade (konum {pos}): {text[pos:]!r}")
+            break
+        pos = match.end()
+        start = match.start(match.lastgroup)
+        if match.group("open"):
+            tokens.append(("(", "(", start))
+        elif match.group("close"):
+            tokens.append((")", ")", start))
+        else:
+            word = match.group("word")
+            keyword = _KEYWORDS.get(word.lower())
+            if keyword:
+                tokens.append((keyword, word, start))
+            elif _TERM_RE.match(word):
+                if _after_comma(text, tokens, start):
+                    tokens.append(("or", ",", start))
+                word, pos = _continue_list(text, word, pos)
+                tokens.append(("term", word, start))
+            else:
+                # Alan adı olmayan sözcükler ad kalıbıdır; "*.jpg, *.png" gibi
+                # virgüllü listeler (GUI modelleri) OR olarak okunur
+                parts = _split_list(word)
+                if not parts:
+                    # Tek başına virgül
+                    if tokens and tokens[-1][0] == "term":
+                        tokens.append(("or", ",", start))
+                    continue
+                for i, part in enumerate(parts):
+                    if i or _after_comma(text, tokens, start):
+                        tokens.append(("or", ",", start))
+                    tokens.append(("term", "name:" + part, start))
+    return tokens
+
+
+class _Parser:
+    """
+    ifade := or
+    or    := and ("or" and)*
+    and   := not ("and"? not)*      (yan yana koşullar AND'lenir)
+    not   := "not" not | atom
+    atom  := "(" ifade ")" | koşul
+    """
+
+    def __init__(self, text: str, context: "_Context"):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.pos = 0
+        self.context = context
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def _next(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            return None
+        node = self._or()
+        if self.pos < len(self.tokens):
+            _, value, position = self.tokens[self.pos]
+            raise FilterExpressionError(f"Beklenmeyen '{value}' (konum {position})")
+        return node
+
+    def _or(self):
+        items = [self._and()]
+        while self._peek() == "or":
+            self._next()
+            items.append(self._and())
+        return items[0] if len(items) == 1 else ("or", items)
+
+    def _and(self):
+        items = [self._not()]
+        while self._peek() not in (None, ")", "or"):
+            if self._peek() == "and":
+                self._next()
+            items.append(self._not())
+        return items[0] if len(items) == 1 else ("and", items)
+
+    def _not(self):
+        if self._peek() == "not":
+            self._next()
+            return ("not", self._not())
+        return self._atom()
+
+    def _atom(self):
+        kind = self._peek()
+        if kind is None:
+            raise FilterExpressionError("İfade beklenirken metin bitti")
+        kind, value, position = self._next()
+        if kind == "(":
+            node = self._or()
+            if self._peek() != ")":
+                raise FilterExpressionError(f"Kapanmamış parantez (konum {position})")
+            self._next()
+            return node
+        if kind != "term":
+            raise FilterExpressionError(f"Beklenmeyen '{value}' (konum {position})")
+        field, op, raw = _TERM_RE.match(value).groups()
+        try:
+            return ("leaf", self.context.leaf(field.lower(), op, raw))
+        except FilterExpressionError as e:
+            raise FilterExpressionError(f"{e} (konum {position})") from None
+
+
+# ----------------------------------------------------------------------
+# Koşullar
+# ----------------------------------------------------------------------
+def _parse_size(value: str) -> float:
+    match = _SIZE_RE.match(value.strip())
+    if not match or match.group(2).lower() not in _SIZE_UNITS:
+        raise FilterExpressionError(f"Geçersiz boyut: {value!r} (örn. 500KB, 10MB, 1.5GB)")
+    return float(match.group(1)) * _SIZE_UNITS[match.group(2).lower()]
+
+
+def _parse_int(value: str) -> int:
+    try:
+        return int(value.strip())
+    except ValueError:
+        raise FilterExpressionError(f"Geçersiz sayı: {value!r}") from None
+
+
+def _comparison(op: str, raw: str, parse: Callable[[str], float]) -> Tuple[float, float, bool]:
+    """Karşılaştırmayı (alt, üst, eşit değil) aralığına çevirir; sınırlar dahildir."""
+    inf = float("inf")
+    if op == ":" and ".." in raw:
+        low, high = raw.split("..", 1)
+        return (parse(low) if low.strip() else -inf, parse(high) if high.strip() else inf, False)
+    value = parse(raw)
+    if op in (":", "=", "=="):
+        return value, value, False
+    if op == "!=":
+        return value, value, True
+    # < ve > için sınırın hariç tutulması _range_predicate'tedir
+    if op in ("<", "<="):
+        return -inf, value, False
+    return value, inf, False
+
+
+def _range_predicate(op: str, low: float, high: float, negate: bool) -> Callable[[float], bool]:
+    if negate:
+        return lambda v: v != low
+    if op == "<":
+        return lambda v: v < high
+    if op == ">":
+        return lambda v: v > low
+    return lambda v: low <= v <= high
+
+
+class _Context:
+    """Derleme sırasında kullanılan kök klasör, sınıflandırıcı ve 'şimdi'."""
+
+    def __init__(self, root=None, classifier=None):
+        self.root = os.path.abspath(os.fspath(root)) if root is not None else None
+        self._classifier = classifier
+        self.now = time.time()
+
+    @property
+    def classifier(self):
+        if self._classifier is None:
+            self._classifier = get_classifier(load_config())
+        return self._classifier
+
+    def _parse_time(self, value: str) -> float:
+        value = value.strip()
+        match = _DURATION_RE.match(value)
+        if match:
+            # Göreli süre: "7d" = 7 gün önce
+            return self.now - float(match.group(1)) * _DURATION_UNITS[match.group(2).lower()]
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            raise FilterExpressionError(f"Geçersiz tarih: {value!r} (örn. 2024-01-31, 7d, 12h)") from None
+
+    def _relative(self, path: str) -> str:
+        if self.root is None:
+            return path
+        return os.path.relpath(path, self.root)
+
+    def leaf(self, field: str, op: str, raw: str) -> _Leaf:
+        if field not in FIELDS:
+            raise FilterExpressionError(f"Bilinmeyen alan: {field!r} ({', '.join(FIELDS)})")
+
+        if field in ("name", "path", "ext", "cat", "category"):
+            if op not in (":", "=", "=="):
+                raise FilterExpressionError(f"'{field}' için ':' kullanın")
+            values = _split_list(raw)
+            if not values:
+                raise FilterExpressionError(f"'{field}' için değer boş")
+            if field == "name":
+                return _Leaf("glob", values)
+            if field == "ext":
+                return _Leaf("ext", {v.lower() if v.startswith(".") else f".{v.lower()}" for v in values})
+            if field in ("cat", "category"):
+                return _Leaf("category", set(values))
+            return self._path_leaf(values)
+
+        if field in ("re", "regex"):
+            if op not in (":", "=", "=="):
+                raise FilterExpressionError(f"'{field}' için ':' kullanın")
+            pattern = _unquote(raw)
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise FilterExpressionError(f"Geçersiz regex {pattern!r}: {e}") from None
+            return _Leaf("regex", [pattern])
+
+        if field == "size":
+            low, high, negate = _comparison(op, raw, _parse_size)
+            test = _range_predicate(op, low, high, negate)
+
+            def size_matches(file) -> bool:
+                try:
+                    return test(as_file_info(file).size)
+                except OSError:
+                    return False
+            return _Leaf("pred", size_matches, COST_STAT)
+
+        if field in ("mtime", "ctime"):
+            low, high, negate = _comparison(op, raw, self._parse_time)
+            test = _range_predicate(op, low, high, negate)
+            attribute = field
+
+            def time_matches(file) -> bool:
+                try:
+                    return test(getattr(as_file_info(file), attribute))
+                except OSError:
+                    return False
+            return _Leaf("pred", time_matches, COST_STAT)
+
+        # depth: kaynak klasördeki dosyalar 0, bir alt klasördekiler 1...
+        if self.root is None:
+            raise FilterExpressionError("'depth' için kök klasör gerekli")
+        low, high, negate = _comparison(op, raw, _parse_int)
+        test = _range_predicate(op, low, high, negate)
+        bound = None if negate or high == float("inf") else int(high - 1 if op == "<" else high)
+        root = self.root
+        prefix = root.rstrip(os.sep) + os.sep
+
+        def depth_matches(file) -> bool:
+            parent = os.path.dirname(os.path.abspath(os.fspath(file)))
+            if parent == root:
+                return test(0)
+            if not parent.startswith(prefix):
+                return False
+            return test(parent[len(prefix):].count(os.sep) + 1)
+        return _Leaf("pred", depth_matches, COST_NAME, is_depth=True, depth_bound=bound)
+
+    def _path_leaf(self, patterns: List[str]) -> _Leaf:
+        # Göreli yol, '/' ayırıcılı; "*" alt klasörleri de kapsar (fnmatch)
+        patterns = [p.replace("\\", "/") for p in patterns]
+        match = re.compile("|".join(fnmatch.translate(p) for p in patterns), re.I).match
+        relative = self._relative
+
+        def path_matches(file) -> bool:
+            return match(relative(os.path.abspath(os.fspath(file))).replace(os.sep, "/")) is not None
+        # Alt klasör içeren kalıplar (a/b/*) alt klasörlerin taranmasını gerektirir
+        nested = any("/" in p for p in patterns)
+        return _Leaf("pred", path_matches, COST_NAME, is_depth=nested, depth_bound=None)
+
+
+# ----------------------------------------------------------------------
+# Derleme
+# ----------------------------------------------------------------------
+def _all(predicates: List[Callable]) -> Callable:
+    if len(predicates) == 1:
+        return predicates[0]
+    if len(predicates) == 2:
+        first, second = predicates
+        return lambda file: first(file) and second(file)
+
+    def all_match(file) -> bool:
+        for predicate in predicates:
+            if not predicate(file):
+                return False
+        return True
+    return all_match
+
+
+def _any(predicates: List[Callable]) -> Callable:
+    if len(predicates) == 1:
+        return predicates[0]
+    if len(predicates) == 2:
+        first, second = predicates
+        return lambda file: first(file) or second(file)
+
+    def any_match(file) -> bool:
+        for predicate in predicates:
+            if predicate(file):
+                return True
+        return False
+    return any_match
+
+
+def _regex_predicate(patterns: List[str]) -> Callable:
+    try:
+        search = re.compile("|".join(f"(?:{p})" for p in patterns)).search
+    except re.error:
+        # Satır içi bayraklar ((?i) gibi) birleşik regex'te başta olmalı: ayrı derle
+        searches = [re.compile(p).search for p in patterns]
+        return lambda file: any(s(file.name) for s in searches)
+    return lambda file: search(file.name) is not None
+
+
+def _leaf_predicate(leaf: _Leaf, context: _Context) -> Callable:
+    if leaf.kind == "glob":
+        # Tüm kalıplar tek bir büyük/küçük harf duyarsız regex'e derlenir
+        match = re.compile("|".join(fnmatch.translate(p) for p in leaf.values), re.I).match
+        return lambda file: match(file.name) is not None
+    if leaf.kind == "regex":
+        return _regex_predicate(leaf.values)
+    if leaf.kind == "ext":
+        extensions = frozenset(leaf.values)
+        splitext = os.path.splitext
+        return lambda file: splitext(file.name)[1].lower() in extensions
+    if leaf.kind == "category":
+        categories = frozenset(leaf.values)
+        classify = context.classifier.classify
+        return lambda file: classify(file) in categories
+    return leaf.values
+
+
+def _merge_leaves(children: list) -> list:
+    """OR altındaki aynı türden koşulları tek koşulda birleştirir."""
+    merged = {}
+    rest = []
+    for child in children:
+        if child[0] == "leaf" and child[1].kind != "pred":
+            leaf = child[1]
+            if leaf.kind in merged:
+                target = merged[leaf.kind]
+                if isinstance(target.values, set):
+                    target.values |= leaf.values
+                else:
+                    target.values = target.values + leaf.values
+            else:
+                merged[leaf.kind] = _Leaf(leaf.kind, leaf.values.copy(), leaf.cost)
+        else:
+            rest.append(child)
+    return [("leaf", leaf) for leaf in merged.values()] + rest
+
+
+def _compile(node, context: _Context) -> Tuple[Callable, int]:
+    """Düğümü (fonksiyon, maliyet) çiftine derler; AND/OR çocukları ucuzdan pahalıya sıralanır."""
+    kind = node[0]
+    if kind == "leaf":
+        return _leaf_predicate(node[1], context), node[1].cost
+    if kind == "not":
+        predicate, cost = _compile(node[1], context)
+        return (lambda file: not predicate(file)), cost
+    children = _merge_leaves(node[1]) if kind == "or" else node[1]
+    compiled = sorted((_compile(child, context) for child in children), key=lambda pc: pc[1])
+    predicates = [predicate for predicate, _ in compiled]
+    cost = max(cost for _, cost in compiled)
+    return (_all(predicates) if kind == "and" else _any(predicates)), cost
+
+
+def _depth_bound(node, negated: bool = False):
+    """İfadenin doğru olabileceği en büyük klasör derinliği (0: sadece kök, None: sınırsız)."""
+    kind = node[0]
+    if kind == "leaf":
+        leaf = node[1]
+        if not leaf.is_depth:
+            return 0
+        return None if negated else leaf.depth_bound
+    if kind == "not":
+        return _depth_bound(node[1], not negated)
+    bounds = [_depth_bound(child, negated) for child in node[1]]
+    if None in bounds:
+        return None
+    return max(bounds)
+
+
+class FilterExpression:
+    """
+    Derlenmiş filtre ifadesi. CompositeFilter'a diğer filtreler gibi eklenir.
+
+    Örnekler:
+        *.jpg, *.png                     ad kalıpları (virgül = OR)
+        name:*.jpg,*.png and size>10MB
+        ext:mp4,mkv or (cat:Images and mtime>7d)
+        re:"^IMG_\\d+" and not ctime<2024-01-01
+        depth<=2 and path:"projeler/*"
+
+    Alanlar: name (glob), path (köke göreli glob), re/regex, ext, cat/category,
+    size (B/KB/MB/GB/TB, 1024 tabanlı), mtime/ctime (ISO tarih ya da "7d",
+    "12h" gibi "şu kadar önce"), depth (kaynak klasör 0). Karşılaştırmalar
+    < <= > >= = != ve ':' ile aralık (size:1MB..10MB). Operatörler and/or/not
+    (&& || !); AND, OR'dan önce bağlar ve yan yana koşullar AND'lenir. Boşluk
+    içeren değerler tırnaklanır.
+
+    İfade bir kez tek bir fonksiyona derlenir: OR altındaki ad kalıpları tek
+    regex'te, uzantılar ve kategoriler frozenset'te birleşir; AND/OR
+    çocukları stat gerektirmeyen koşullardan başlayarak değerlendirilir.
+    """
+
+    selectivity = 0.5
+
+    def __init__(self, text: str, root=None, classifier=None):
+        self.text = text
+        context = _Context(root, classifier)
+        tree = _Parser(text, context).parse()
+        if tree is None:
+            self.matches = lambda file: True
+            self.cost = COST_NAME
+            self.max_depth = 0
+            return
+        predicate, self.cost = _compile(tree, context)
+        # Örnek özniteliği: çağrı başına metot çözümlemesi yapılmaz
+        self.matches = predicate
+        self.max_depth = _depth_bound(tree)
+
+    def __repr__(self):
+        return f"FilterExpression({self.text!r})"
+
+
+def compile_expression(text: str, root=None, classifier=None) -> FilterExpression:
+    """Metni FilterExpression'a derler; hatalı ifadede FilterExpressionError fırlatır."""
+    return FilterExpression(text, root, classifier)
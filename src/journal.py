@@ -0,0 +1,323 @@
+import atexit
+import gzip
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+from config_loader import load_config
+from metadata_index import get_metadata_index
+from rollup import RollupStore
+from rotation import RotationPolicy, list_segments
+
+JOURNAL_VERSION = 1
+
+# Dosyaya en geç bu kadar kayıtta bir flush yapılır
+FLUSH_EVERY = 64
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Taşıma sayılan işlemler (raporda "taşınan dosya" olarak toplanır)
+MOVE_OPS = ("move", "filter_move", "folder_move")
+
+# Eski metin logundaki taşıma satırları: "<zaman>,<ms> - INFO - [FİLTRE |KLASÖR ]TASINDI | kategori | ad -> yeni ad"
+_LEGACY_MOVE_RE = re.compile(
+    r"^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d),(\d{3}) - \w+ - (?:(FİLTRE|KLASÖR) )?TASINDI \| (.*?) \| (.*) -> (.*)$"
+)
+_LEGACY_OPS = {None: "move", "FİLTRE": "filter_move", "KLASÖR": "folder_move"}
+# Bu süreçte yazılan log satırları zaten journal'a da kaydedilir, aktarılmaz
+_PROCESS_STARTED = time.time()
+
+
+class EventJournal:
+    """
+    Taşıma/arşivleme olaylarının yapılandırılmış, yalnızca eklenen (append-only) kaydı.
+
+    Her satır tek bir JSON nesnesidir:
+        {"ts": ..., "op": "move", "category": ..., "source": ..., "destination": ...,
+         "bytes": ..., "duration": ...}
+    Dosyanın ilk satırı sürüm bilgisini ve parçanın başlangıç zamanını taşıyan
+    bir başlık kaydıdır ({"op": "header", ...}). İnsan okuyabilir log ayrıca
+    tutulmaya devam eder; rapor ve GUI istatistikleri metin ayrıştırmadan bu
+    dosyadan toplanır. Dosya, rotation politikasına göre zaman damgalı
+    parçalara döndürülür. rollup verilirse her olay saatlik/günlük özetlere
+    de eklenir.
+    """
+
+    def __init__(self, path, flush_every: int = FLUSH_EVERY, rotation: Optional[RotationPolicy] = None,
+                 rollup: Optional[RollupStore] = None):
+        self.path = Path(path)
+        self.flush_every = max(1, flush_every)
+        self.rotation = rotation or RotationPolicy()
+        self.rollup = rollup
+        self._lock = threading.Lock()
+        self._file = None
+        self._unflushed = 0
+        self._size = 0
+        self._started_at = 0.0
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+        if self._size == 0:
+            self._started_at = time.time()
+            self._write({"op": "header", "version": JOURNAL_VERSION, "ts": self._started_at})
+        else:
+            self._started_at = _read_header_ts(self.path)
+
+    def _write(self, event: Dict):
+        line = (json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        self._file.write(line)
+        self._size += len(line)
+        self._unflushed += 1
+
+    def record(self, op: str, category: Optional[str], source, destination,
+               size: Optional[int] = None, duration: Optional[float] = None):
+        """Bir olayı tamponlu olarak dosyaya ekler."""
+        event = {
+            "ts": round(time.time(), 3),
+            "op": op,
+            "category": category,
+            "source": os.fspath(source) if source is not None else None,
+            "destination": os.fspath(destination) if destination is not None else None,
+            "bytes": size,
+            "duration": round(duration, 6) if duration is not None else None,
+        }
+        with self._lock:
+            if self._file is None:
+                self._open()
+            elif self.rotation.is_due(self._size, self._started_at):
+                self._rotate_locked()
+            self._write(event)
+            if self._unflushed >= self.flush_every:
+                self._flush_locked()
+        if self.rollup is not None:
+            self.rollup.add(event)
+
+    def _rotate_locked(self):
+        self._file.close()
+        self._file = None
+        try:
+            self.rotation.rotate(self.path)
+        except OSError as e:
+            print(f"Olay kaydı döndürülemedi: {e}")
+        self._open()
+
+    def _flush_locked(self):
+        if self._file is not None:
+            self._file.flush()
+            self._unflushed = 0
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+        if self.rollup is not None:
+            self.rollup.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self._unflushed = 0
+        if self.rollup is not None:
+            self.rollup.close()
+            self.rollup = None
+
+
+class JournalReader:
+    """
+    Journal'ı verilen byte konumundan itibaren parça parça okur.
+    Tamamlanmış satırlar olay sözlüğü olarak üretilir; okuma sonunda
+    offset, yarım kalan son satırın başını gösterir (sonraki okuma oradan
+    devam eder). Başlık ve bozuk satırlar atlanır.
+    """
+
+    def __init__(self, path, offset: int = 0):
+        self.path = Path(path)
+        self.offset = offset
+
+    def __iter__(self) -> Iterator[Dict]:
+        opener = gzip.open if self.path.suffix == ".gz" else open
+        with opener(self.path, "rb") as f:
+            f.seek(self.offset)
+            pending = b""
+            while True:
+                chunk = f.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                data = pending + chunk
+                end = data.rfind(b"\n")
+                if end == -1:
+                    pending = data
+                    continue
+                complete, pending = data[:end], data[end + 1:]
+                for line in complete.split(b"\n"):
+                    if not line:
+                        continue
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue
+                    if event.get("op") != "header":
+                        yield event
+                self.offset += end + 1
+
+
+def iter_journal(path) -> Iterator[Dict]:
+    """Döndürülmüş parçalar dahil tüm olaylar, eskiden yeniye."""
+    path = Path(path)
+    for segment in list_segments(path):
+        yield from JournalReader(segment)
+    if path.exists():
+        yield from JournalReader(path)
+
+
+def _read_header_ts(path: Path) -> float:
+    """Mevcut parçanın başlangıç zamanı (başlık kaydından; yoksa mtime)."""
+    try:
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+        if header.get("op") == "header":
+            return float(header["ts"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return time.time()
+
+
+def iter_legacy_log(log_path) -> Iterator[Dict]:
+    """
+    Journal'dan önceki sürümlerin organizer.log'undaki TASINDI satırlarını
+    (döndürülmüş parçalar dahil, eskiden yeniye) olay olarak üretir. Logda
+    yalnızca dosya adları bulunduğundan source/destination ad, bytes None olur.
+    Bu süreç başladıktan sonra yazılmış satırlar atlanır (journal'da zaten var).
+    """
+    log_path = Path(log_path)
+    segments = list_segments(log_path) + ([log_path] if log_path.exists() else [])
+    for segment in segments:
+        opener = gzip.open if segment.suffix == ".gz" else open
+        try:
+            with opener(segment, "rt", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    match = _LEGACY_MOVE_RE.match(line.rstrip("\n"))
+                    if match is None:
+                        continue
+                    try:
+                        ts = time.mktime(time.strptime(match.group(1), "%Y-%m-%d %H:%M:%S"))
+                    except ValueError:
+                        continue
+                    ts += int(match.group(2)) / 1000
+                    if ts >= _PROCESS_STARTED:
+                        continue
+                    yield {
+                        "ts": round(ts, 3),
+                        "op": _LEGACY_OPS[match.group(3)],
+                        "category": match.group(4).strip(),
+                        "source": match.group(5).strip(),
+                        "destination": match.group(6).strip(),
+                        "bytes": None,
+                        "duration": None,
+                    }
+        except OSError as e:
+            print(f"Eski log okunamadı ({segment}): {e}")
+
+
+def _backfill_from_log(journal_path: Path, log_path) -> int:
+    """
+    Journal ilk kez oluşturulurken eski metin logundaki taşımaları bir kez
+    aktarır; böylece sürüm yükseltmesinden sonra raporlar sıfırlanmaz.
+    Dosya geçici adla yazılıp yerine konur: yarıda kalırsa sonraki açılışta
+    yeniden denenir. Özet deposu ardından _open_rollup ile journal'dan dolar.
+    """
+    temp = journal_path.with_name(journal_path.name + ".tmp")
+    count = 0
+    journal_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(temp, "wb") as f:
+        for event in itertools.chain(({"op": "header", "version": JOURNAL_VERSION, "ts": time.time()},),
+                                     iter_legacy_log(log_path)):
+            f.write((json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8"))
+            count += 1
+        f.flush()
+        os.fsync(f.fileno())
+    if count == 1:
+        # Aktarılacak kayıt yok: journal ilk olayla normal yoldan oluşsun
+        os.unlink(temp)
+        return 0
+    os.replace(temp, journal_path)
+    return count - 1
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_journal() -> EventJournal:
+    """Süreç genelinde paylaşılan EventJournal örneğini döner."""
+    global _journal
+    config = load_config()
+    path = Path(config.get("journal_file_path", "events.jsonl"))
+    with _journal_lock:
+        if _journal is None or _journal.path != path:
+            if _journal is not None:
+                _journal.close()
+            if not path.exists() and not list_segments(path):
+                try:
+                    _backfill_from_log(path, config.get("log_file_path", "organizer.log"))
+                except OSError as e:
+                    print(f"Eski log journal'a aktarılamadı: {e}")
+            _journal = EventJournal(path, rotation=RotationPolicy.from_config(config),
+                                    rollup=_open_rollup(config, path))
+        return _journal
+
+
+def _open_rollup(config, journal_path: Path) -> Optional[RollupStore]:
+    """Özet deposunu açar; yeni oluşturulduysa mevcut journal'dan bir kez doldurur."""
+    try:
+        rollup = RollupStore(config.get("rollup_file_path", "rollup.db"))
+        if rollup.created:
+            rollup.add_many(iter_journal(journal_path))
+        return rollup
+    except Exception as e:
+        print(f"Özet deposu açılamadı, sadece journal yazılacak: {e}")
+        return None
+
+
+def record_event(op: str, category: Optional[str], source, destination,
+                 size: Optional[int] = None, duration: Optional[float] = None):
+    """Olay kaydeder; journal yazılamazsa taşıma işlemi etkilenmez."""
+    try:
+        get_journal().record(op, category, source, destination, size, duration)
+    except Exception as e:
+        print(f"Olay kaydı yazılamadı: {e}")
+
+    # Meta veri indeksi (etkinse) her taşımada artımlı güncellenir
+    try:
+        index = get_metadata_index()
+        if index is not None and source is not None:
+            if op == "archive":
+                index.remove(source)
+            elif op in MOVE_OPS:
+                # "duplicate" olaylarının hedefi asıl dosyadır; kopyanın yolu
+                # değişmediyse (skip) veya mover taşıyacaksa (move) indekse dokunulmaz
+                index.record_move(source, destination)
+    except Exception as e:
+        print(f"Meta veri indeksi güncellenemedi: {e}")
+
+
+def flush_journal():
+    if _journal is not None:
+        _journal.flush()
+
+
+def _close_journal():
+    if _journal is not None:
+        _journal.close()
+
+
+atexit.register(_close_journal)
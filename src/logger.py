@@ -1,41 +1,192 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
-from pathlib import Path
-from config_loader import load_config
+import threading
+import time
+from config_loader import load_config, config_service
+from rotation import RotationPolicy
 
-def get_logger(name="OrganizerLogger"):
+# Dosyaya en geç bu kadar kayıtta bir flush yapılır (kuyruk boşalınca da yapılır)
+FLUSH_EVERY = 64
+
+_listener = None
+_log_queue = None
+_file_handler = None
+_handlers = []
+_setup_lock = threading.Lock()
+
+
+class BatchingFileHandler(logging.FileHandler):
     """
-    Konfigürasyondaki ayara göre bir logger döner.
-    Hem dosyaya hem de konsola log basar.
+    Her kayıttan sonra değil, FLUSH_EVERY kayıtta bir (veya kuyruk boşaldığında)
+    flush yapan dosya handler'ı. Sadece arka plan yazıcı thread'inden çağrılır.
+    Rotation politikası verilirse dosya boyut/yaş sınırında döndürülür.
     """
-    config = load_config()
-    log_file_path = config.get("log_file_path", "organizer.log")
 
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    def __init__(self, filename, flush_every=FLUSH_EVERY, encoding='utf-8', rotation=None):
+        super().__init__(filename, encoding=encoding)
+        self.flush_every = max(1, flush_every)
+        self.rotation = rotation or RotationPolicy()
+        self._unflushed = 0
+        self._size = self.stream.tell()
+        self._started_at = _first_record_time(self.baseFilename) if self._size else time.time()
 
-    # Eğer daha önce handler eklendiyse tekrar ekleme (Multiprocess/import sismesi onlemi)
-    if logger.hasHandlers():
-        return logger
+    def emit(self, record):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            if self.rotation.is_due(self._size, self._started_at):
+                self.do_rollover()
+            line = self.format(record) + self.terminator
+            self.stream.write(line)
+            self._size += len(line)
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def do_rollover(self):
+        self.stream.close()
+        self.stream = None
+        try:
+            self.rotation.rotate(self.baseFilename)
+        except OSError as e:
+            print(f"Log dosyası döndürülemedi: {e}")
+        self.stream = self._open()
+        self._size = self.stream.tell()
+        self._started_at = time.time()
+
+    def flush(self):
+        super().flush()
+        self._unflushed = 0
+
+
+class _BatchingQueueListener(logging.handlers.QueueListener):
+    """Kuyruk boşaldığında, beklemeye geçmeden önce handler'ları flush eder."""
+
+    def dequeue(self, block):
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            if not block:
+                raise
+        for handler in self.handlers:
+            handler.flush()
+        return self.queue.get(block)
+
+
+def _first_record_time(path) -> float:
+    """Mevcut log dosyasının ilk kaydının zamanı (zaman tabanlı döndürme için)."""
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            return time.mktime(time.strptime(f.readline()[:19], "%Y-%m-%d %H:%M:%S"))
+    except (OSError, ValueError):
+        return time.time()
+
+
+def _resolve_level(config):
+    level_name = str(config.get("log_level", "INFO")).upper()
+    level = logging.getLevelName(level_name)
+    if not isinstance(level, int):
+        print(f"Geçersiz log_level: {level_name}, INFO kullanılıyor.")
+        return logging.INFO
+    return level
+
+
+def _start_listener(config):
+    """Arka plan yazıcıyı bir kez kurar (dosya + isteğe bağlı konsol)."""
+    global _listener, _log_queue, _file_handler, _handlers
 
-    # Format
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    handlers = []
 
     # 1. Dosya Handler
     try:
-        file_handler = logging.FileHandler(log_file_path, encoding='utf-8')
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        _file_handler = BatchingFileHandler(config.get("log_file_path", "organizer.log"),
+                                            rotation=RotationPolicy.from_config(config))
+        _file_handler.setFormatter(formatter)
+        handlers.append(_file_handler)
     except Exception as e:
         print(f"Log dosyası oluşturulamadı: {e}")
 
-    # 2. Konsol Handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    # 2. Konsol Handler (config'de "log_console": false ile kapatılabilir)
+    if config.get("log_console", True):
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+
+    _handlers = handlers
+    _log_queue = queue.Queue()
+    _listener = _BatchingQueueListener(_log_queue, *handlers, respect_handler_level=False)
+    _listener.start()
+
+
+def get_logger(name="OrganizerLogger"):
+    """
+    Konfigürasyondaki ayara göre bir logger döner.
+    Kayıtlar kuyruğa atılır; dosyaya ve (isteğe bağlı) konsola yazma tek bir
+    arka plan thread'inde yapılır, böylece taşıma yapan thread'ler log I/O'su
+    için beklemez. Seviye config'deki log_level'dan alınır.
+    """
+    logger = logging.getLogger(name)
+
+    # Eğer daha önce handler eklendiyse tekrar ekleme (Multiprocess/import sismesi onlemi)
+    if logger.hasHandlers():
+        return logger
+
+    config = load_config()
+    with _setup_lock:
+        if logger.hasHandlers():
+            return logger
+        if _listener is None:
+            _start_listener(config)
+            config_service.subscribe(_on_config_reload)
+        logger.setLevel(_resolve_level(config))
+        logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+        # Kök logger'a ikinci kez yazılmasın
+        logger.propagate = False
 
     return logger
 
+
+def _on_config_reload(config):
+    """log_level değişikliğini yeniden başlatmadan uygular."""
+    level = _resolve_level(config)
+    for logger in list(logging.Logger.manager.loggerDict.values()):
+        if isinstance(logger, logging.Logger) and any(
+                isinstance(h, logging.handlers.QueueHandler) for h in logger.handlers):
+            logger.setLevel(level)
+
+
+def flush_logging():
+    """Kuyruktaki tüm kayıtlar yazılana kadar bekler ve dosyayı flush eder."""
+    if _listener is None:
+        return
+    _log_queue.join()
+    if _file_handler is not None:
+        _file_handler.flush()
+
+
+def shutdown_logging():
+    """Yazıcıyı durdurur; kuyrukta kalan kayıtlar kaybolmadan dosyaya yazılır."""
+    global _listener
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        _listener = None
+        for handler in _handlers:
+            handler.flush()
+            if handler is _file_handler:
+                handler.close()
+
+
+atexit.register(shutdown_logging)
+
+
 if __name__ == "__main__":
     log = get_logger()
-    log.info("Logger test mesajı: Sistem çalışıyor.")
\ No newline at end of file
+    log.info("Logger test mesajı: Sistem çalışıyor.")
@@ -0,0 +1,239 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence
+from config_loader import load_config
+from classifier import CategoryClassifier, get_classifier
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER,
+    dev INTEGER,
+    ext TEXT NOT NULL,
+    category TEXT NOT NULL,
+    hash TEXT
+);
+CREATE INDEX IF NOT EXISTS files_dir_ext ON files (dir, ext);
+CREATE INDEX IF NOT EXISTS files_dir_size ON files (dir, size);
+CREATE INDEX IF NOT EXISTS files_dir_category ON files (dir, category);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    scanned_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_UPSERT = """
+INSERT INTO files (path, dir, name, size, mtime_ns, inode, dev, ext, category, hash)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL)
+ON CONFLICT (path) DO UPDATE SET
+    dir = excluded.dir, name = excluded.name, size = excluded.size,
+    inode = excluded.inode, dev = excluded.dev, ext = excluded.ext,
+    category = excluded.category,
+    -- İçerik değiştiyse bilinen hash geçersizdir
+    hash = CASE WHEN files.size = excluded.size AND files.mtime_ns = excluded.mtime_ns
+                THEN files.hash ELSE NULL END,
+    mtime_ns = excluded.mtime_ns
+"""
+
+
+def _ext_of(name: str) -> str:
+    # ExtensionFilter ile aynı anlam: son uzantı, küçük harf
+    return os.path.splitext(name)[1].lower()
+
+
+def _classifier_signature(classifier: CategoryClassifier) -> str:
+    return json.dumps(sorted(classifier.table.items()), ensure_ascii=False)
+
+
+class MetadataIndex:
+    """
+    Kaynak ve hedef klasörlerdeki dosyaların isteğe bağlı SQLite meta veri indeksi.
+
+    Satırlar (yol, boyut, mtime, inode, uzantı, kategori, biliniyorsa içerik
+    hash'i) taşımalarda ve watcher olaylarında artımlı güncellenir. Bir
+    klasör sorgulanmadan önce yalnızca klasörün mtime'ı indekstekiyle
+    karşılaştırılır; değişmediyse (dosya eklenmedi/silinmedi/yeniden
+    adlandırılmadı) klasör hiç listelenmez. Yerinde değiştirilen dosyaların
+    boyutu klasör mtime'ını değiştirmez; bu yüzden sorgu sonuçları
+    kullanılmadan önce stat ile doğrulanır.
+    """
+
+    def __init__(self, path, classifier: CategoryClassifier):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self.classifier = None
+        self.set_classifier(classifier)
+
+    # ------------------------------------------------------------------
+    # Kategori tablosu
+    # ------------------------------------------------------------------
+    def set_classifier(self, classifier: CategoryClassifier):
+        """Uzantı tablosu değiştiyse kayıtlı kategorileri yeniden hesaplar."""
+        if classifier is self.classifier:
+            return
+        self.classifier = classifier
+        signature = _classifier_signature(classifier)
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'classifier'").fetchone()
+            if row and row[0] == signature:
+                return
+            rows = self._conn.execute("SELECT path, name FROM files").fetchall()
+            with self._conn:
+                self._conn.executemany("UPDATE files SET category = ? WHERE path = ?",
+                                       [(classifier.classify(path), path) for path, _ in rows])
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('classifier', ?)",
+                                   (signature,))
+
+    # ------------------------------------------------------------------
+    # Güncelleme
+    # ------------------------------------------------------------------
+    def _row(self, path: str, st: os.stat_result):
+        name = os.path.basename(path)
+        return (path, os.path.dirname(path), name, st.st_size, st.st_mtime_ns,
+                st.st_ino, st.st_dev, _ext_of(name), self.classifier.classify(path))
+
+    def upsert(self, path):
+        """Dosyanın satırını diskteki haliyle günceller; dosya yoksa satırı siler."""
+        path = os.path.abspath(os.fspath(path))
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.remove(path)
+            return
+        if not os.path.isfile(path):
+            return
+        with self._lock, self._conn:
+            self._conn.execute(_UPSERT, self._row(path, st))
+
+    def remove(self, path):
+        path = os.path.abspath(os.fspath(path))
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def record_move(self, source, destination):
+        """Taşıma sonrası: kaynak satırı silinir, hedef satırı eklenir (hash korunur)."""
+        source = os.path.abspath(os.fspath(source))
+        destination = os.path.abspath(os.fspath(destination))
+        try:
+            st = os.stat(destination)
+        except OSError:
+            self.remove(source)
+            return
+        with self._lock, self._conn:
+            known = self._conn.execute("SELECT hash FROM files WHERE path = ?", (source,)).fetchone()
+            self._conn.execute("DELETE FROM files WHERE path = ?", (source,))
+            if os.path.isfile(destination):
+                self._conn.execute(_UPSERT, self._row(destination, st))
+                if known and known[0]:
+                    self._conn.execute("UPDATE files SET hash = ? WHERE path = ?", (known[0], destination))
+
+    def set_hash(self, path, digest: str):
+        path = os.path.abspath(os.fspath(path))
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE files SET hash = ? WHERE path = ?", (digest, path))
+
+    def reconcile(self, directory) -> bool:
+        """
+        Klasörün mtime'ı indekstekinden farklıysa klasörü bir kez listeleyip
+        yalnızca yeni/değişmiş satırları yazar, kaybolanları siler.
+        Klasör yeniden tarandıysa True döner.
+        """
+        directory = os.path.abspath(os.fspath(directory))
+        try:
+            dir_mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM files WHERE dir = ?", (directory,))
+                self._conn.execute("DELETE FROM dirs WHERE path = ?", (directory,))
+            return True
+
+        with self._lock:
+            row = self._conn.execute("SELECT mtime_ns FROM dirs WHERE path = ?", (directory,)).fetchone()
+        if row and row[0] == dir_mtime:
+            return False
+
+        with self._lock:
+            known = {path: (size, mtime_ns) for path, size, mtime_ns in self._conn.execute(
+                "SELECT path, size, mtime_ns FROM files WHERE dir = ?", (directory,))}
+
+        # Sadece yeni veya değişmiş dosyalar yazılır; kaybolanlar silinir
+        changed = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                previous = known.pop(entry.path, None)
+                if previous != (st.st_size, st.st_mtime_ns):
+                    changed.append(self._row(entry.path, st))
+
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM files WHERE path = ?", ((path,) for path in known))
+            self._conn.executemany(_UPSERT, changed)
+            self._conn.execute("INSERT OR REPLACE INTO dirs (path, mtime_ns, scanned_at) VALUES (?, ?, ?)",
+                               (directory, dir_mtime, time.time()))
+        return True
+
+    # ------------------------------------------------------------------
+    # Sorgu
+    # ------------------------------------------------------------------
+    def query(self, directory, where: str = "", params: Sequence = ()) -> List[str]:
+        """Klasördeki (alt klasörler hariç) koşula uyan dosya yolları."""
+        directory = os.path.abspath(os.fspath(directory))
+        sql = "SELECT path FROM files WHERE dir = ?"
+        if where:
+            sql += f" AND ({where})"
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql, (directory, *params))]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_metadata_index() -> Optional[MetadataIndex]:
+    """config'de metadata_index.enabled ise paylaşılan indeksi döner, değilse None."""
+    global _index
+    config = load_config()
+    settings = config.get("metadata_index", {})
+    if not settings.get("enabled", False):
+        return None
+    path = Path(config.get("metadata_index_path", "index.db"))
+    with _index_lock:
+        if _index is None or _index.path != path:
+            if _index is not None:
+                _index.close()
+            try:
+                _index = MetadataIndex(path, get_classifier(config))
+            except sqlite3.Error as e:
+                print(f"Meta veri indeksi açılamadı, klasör taranacak: {e}")
+                _index = None
+                return None
+        index = _index
+    index.set_classifier(get_classifier(config))
+    return index
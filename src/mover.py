@@ -0,0 +1,207 @@
+import errno
+import os
+import shutil
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+# os.link'in desteklenmediği dosya sistemlerinde dönen hata kodları (FAT, bazı SMB vb.)
+_LINK_UNSUPPORTED = {errno.EPERM, errno.EACCES, errno.EMLINK, errno.ENOTSUP, errno.EOPNOTSUPP, errno.ENOSYS}
+# Çekirdek içi kopyalama (copy_file_range/sendfile) desteklenmiyorsa dönen hata kodları
+_FAST_COPY_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.ENOTSUP, errno.EOPNOTSUPP, errno.EBADF}
+
+# Cihazlar arası kopyalamada tek çağrıda aktarılan bayt (ilerleme de bu aralıkla bildirilir)
+COPY_CHUNK = 8 * 1024 * 1024
+
+# İlerleme bildirimi: (kopyalanan bayt, toplam bayt)
+ProgressCallback = Callable[[int, int], None]
+
+# (kaynak cihaz, hedef cihaz) -> aynı dosya sisteminde mi (rename çalışıyor mu)
+_same_filesystem: Dict[Tuple[int, int], bool] = {}
+# Hedef klasör -> cihaz numarası (her klasör bir kez stat'lanır)
+_folder_devices: Dict[str, int] = {}
+
+
+def _rename_no_clobber(source, destination):
+    """
+    Hedef varsa üzerine yazmadan yeniden adlandırır; varsa FileExistsError.
+    Windows'ta os.rename zaten üzerine yazmaz. POSIX'te os.link + unlink
+    atomik bir "yoksa oluştur" sağlar; link desteklenmiyorsa kontrol edip rename yapılır.
+    """
+    if os.name == "nt":
+        os.rename(source, destination)
+        return
+    try:
+        os.link(source, destination, follow_symlinks=False)
+    except OSError as e:
+        if e.errno not in _LINK_UNSUPPORTED:
+            raise
+        if os.path.lexists(destination):
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), destination)
+        os.rename(source, destination)
+        return
+    try:
+        os.unlink(source)
+    except OSError:
+        # Kaynak silinemiyorsa yarım taşıma bırakma
+        os.unlink(destination)
+        raise
+
+
+def _fsync_dir(folder):
+    # Yeni dizin girdisinin kalıcı olması için (Windows'ta klasör açılamaz)
+    if os.name == "nt":
+        return
+    fd = os.open(folder or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _copy_data(fd_in: int, fd_out: int, total: int, progress: Optional[ProgressCallback]) -> int:
+    """
+    fd_in'in geri kalanını fd_out'a kopyalar. Önce copy_file_range, sonra
+    sendfile denenir (veri kullanıcı alanına taşınmaz); ikisi de yoksa
+    büyük parçalarla okuyup yazılır. Hızlı yöntem desteklenmezse veya
+    total'a varmadan 0 dönerse (bazı FUSE/ağ dosya sistemleri) kalan kısım
+    bir sonraki yöntemle sürer; dosya sonu yalnızca read'in 0 dönmesiyle
+    ya da total'a ulaşılınca kabul edilir. Kopyalanan bayt sayısını döner.
+    """
+    methods = []
+    if hasattr(os, "copy_file_range"):
+        methods.append("copy_file_range")
+    if hasattr(os, "sendfile") and os.name != "nt":
+        methods.append("sendfile")
+    copied = 0
+    while True:
+        if methods:
+            try:
+                if methods[0] == "copy_file_range":
+                    count = os.copy_file_range(fd_in, fd_out, COPY_CHUNK)
+                else:
+                    count = os.sendfile(fd_out, fd_in, None, COPY_CHUNK)
+            except OSError as e:
+                if e.errno not in _FAST_COPY_UNSUPPORTED:
+                    raise
+                count = 0
+            if not count:
+                if copied >= total:
+                    return copied
+                # Dosya konumları ortak: kalan kısım sıradaki yöntemle sürer
+                methods.pop(0)
+                continue
+        else:
+            data = os.read(fd_in, COPY_CHUNK)
+            count = len(data)
+            if not count:
+                return copied
+            with memoryview(data) as view:
+                written = 0
+                while written < count:
+                    written += os.write(fd_out, view[written:])
+        copied += count
+        if progress is not None:
+            progress(copied, total)
+
+
+def copy_across(source, destination, progress: Optional[ProgressCallback] = None):
+    """
+    Dosyayı başka bir dosya sistemine taşır: önce hedef klasörde geçici
+    bir '.part' dosyasına kopyalanır ve fsync edilir, kaynak kopyalama
+    sırasında değişmediyse geçici dosya atomik olarak hedef ada alınır
+    (üzerine yazmadan) ve ancak bundan sonra kaynak silinir. Yarıda kesilen
+    bir taşıma hedefte yalnızca '.part' dosyası bırakır, kaynak hep yerindedir.
+    """
+    source = os.fspath(source)
+    destination = os.fspath(destination)
+    folder, name = os.path.split(destination)
+    temp = os.path.join(folder, f".{name}.{os.getpid()}.{threading.get_ident()}.part")
+
+    with open(source, "rb") as fin:
+        before = os.fstat(fin.fileno())
+        try:
+            with open(temp, "xb") as fout:
+                copied = _copy_data(fin.fileno(), fout.fileno(), before.st_size, progress)
+                after = os.fstat(fin.fileno())
+                if (copied != before.st_size or after.st_size != before.st_size
+                        or after.st_mtime_ns != before.st_mtime_ns):
+                    raise OSError(errno.EAGAIN, "Kaynak kopyalama sırasında değişti", source)
+                shutil.copystat(source, temp)
+                os.fsync(fout.fileno())
+            _rename_no_clobber(temp, destination)
+        except BaseException:
+            try:
+                os.unlink(temp)
+            except OSError:
+                pass
+            raise
+    _fsync_dir(folder)
+
+    try:
+        os.unlink(source)
+    except OSError:
+        # Kaynak silinemiyorsa aynı dosyanın iki kopyası kalmasın
+        os.unlink(destination)
+        raise
+
+
+def _device_pair(source, info, folder: str) -> Tuple[int, int]:
+    source_dev = info.dev if info is not None else os.stat(source).st_dev
+    folder_dev = _folder_devices.get(folder)
+    if folder_dev is None:
+        folder_dev = os.stat(folder).st_dev
+        _folder_devices[folder] = folder_dev
+    return source_dev, folder_dev
+
+
+def move_file(source, destination, progress: Optional[ProgressCallback] = None):
+    """
+    Dosyayı taşır, hedefte aynı adlı dosya varsa üzerine yazmaz (FileExistsError).
+
+    Cihaz sınırı her (kaynak cihaz, hedef cihaz) çifti için bir kez
+    öğrenilir: aynı dosya sisteminde doğrudan yeniden adlandırılır,
+    farklıysa (EXDEV) rename denenmeden copy_across ile kopyalanıp
+    kaynak silinir. progress verilirse (kopyalanan, toplam) baytla çağrılır.
+    """
+    # Taramadan gelen FileInfo'nun cihaz numarası ek stat gerektirmez
+    info = source if hasattr(source, "dev") else None
+    source = os.fspath(source)
+    destination = os.fspath(destination)
+    folder = os.path.dirname(destination)
+    try:
+        pair = _device_pair(source, info, folder)
+    except FileNotFoundError:
+        # Hedef klasör çalışma sırasında silinmiş olabilir
+        if not os.path.exists(source) or os.path.isdir(folder):
+            raise
+        os.makedirs(folder, exist_ok=True)
+        pair = _device_pair(source, info, folder)
+
+    if _same_filesystem.get(pair, True):
+        try:
+            try:
+                _rename_no_clobber(source, destination)
+            except FileNotFoundError:
+                if not os.path.exists(source) or os.path.isdir(folder):
+                    raise
+                _folder_devices.pop(folder, None)
+                os.makedirs(folder, exist_ok=True)
+                _rename_no_clobber(source, destination)
+            _same_filesystem[pair] = True
+            if progress is not None:
+                size = os.stat(destination).st_size
+                progress(size, size)
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            # Aynı cihaz numarasında EXDEV (bind mount) çift için genellenemez
+            if pair[0] != pair[1]:
+                _same_filesystem[pair] = False
+
+    if os.path.lexists(destination):
+        raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), destination)
+    copy_across(source, destination, progress)
+
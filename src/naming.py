@@ -0,0 +1,124 @@
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+
+# "rapor_12" -> ("rapor", 12)
+_SUFFIX_PATTERN = re.compile(r"^(.*)_(\d+)$")
+
+# Windows ve macOS'ta dosya adları varsayılan olarak büyük/küçük harf duyarsızdır
+_CASE_INSENSITIVE = sys.platform in ("win32", "darwin")
+
+
+def _key(name: str) -> str:
+    return name.casefold() if _CASE_INSENSITIVE else name
+
+
+class _FolderIndex:
+    """Tek bir hedef klasörün ad indeksi: dolu adlar ve her kök için en yüksek ek."""
+
+    __slots__ = ("folder", "taken", "pending", "max_suffix")
+
+    def __init__(self, folder: Path):
+        self.folder = folder
+        self.taken = set()      # diskteki + bu çalışmada ayrılmış adlar
+        self.pending = set()    # ayrılmış ama henüz taşınmamış adlar
+        self.max_suffix = {}    # (kök, uzantı) -> görülen en yüksek _N
+        self.reload()
+
+    def reload(self):
+        """Klasörü bir kez listeler; bekleyen rezervasyonlar korunur."""
+        self.taken = set(self.pending)
+        self.max_suffix = {}
+        try:
+            with os.scandir(self.folder) as entries:
+                for entry in entries:
+                    self.taken.add(_key(entry.name))
+        except FileNotFoundError:
+            pass
+        for name in self.taken:
+            self._note_suffix(name)
+
+    def _note_suffix(self, name: str):
+        stem, suffix = os.path.splitext(name)
+        match = _SUFFIX_PATTERN.match(stem)
+        if match:
+            key = (match.group(1), suffix)
+            number = int(match.group(2))
+            if number > self.max_suffix.get(key, 0):
+                self.max_suffix[key] = number
+
+    def reserve(self, clean_name: str) -> str:
+        name = clean_name
+        if _key(name) in self.taken:
+            stem, suffix = os.path.splitext(clean_name)
+            key = (_key(stem), _key(suffix))
+            # Görülen en yüksek ekten devam et: O(1), ek stat yok
+            counter = self.max_suffix.get(key, 0) + 1
+            while True:
+                name = f"{stem}_{counter}{suffix}"
+                if _key(name) not in self.taken:
+                    break
+                counter += 1
+            self.max_suffix[key] = counter
+
+        self.taken.add(_key(name))
+        self.pending.add(_key(name))
+        return name
+
+
+class DestinationNames:
+    """
+    Hedef klasörler için bellek içi ad indeksi ve benzersiz ad ayırma.
+
+    Her hedef klasör ilk kullanımda bir kez listelenir; dolu adlar kümesi ve
+    her kök için görülen en yüksek '_N' eki tutulur, böylece yeni ad O(1)
+    sürede verilir. Ad seçimi tek bir kilit altında yapılır: aynı anda
+    çalışan işçiler aynı adı alamaz. İndeks bu çalışmadaki taşımalarla
+    güncel kalır; dışarıdan eklenen bir dosya yüzünden taşıma
+    FileExistsError verirse klasör invalidate() ile yeniden listelenir.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._folders = {}  # klasör -> _FolderIndex
+
+    def _index(self, folder: Path) -> _FolderIndex:
+        index = self._folders.get(folder)
+        if index is None:
+            index = _FolderIndex(folder)
+            self._folders[folder] = index
+        return index
+
+    def reserve(self, target_folder, clean_name: str) -> Path:
+        """Klasörde boş bir ad bulur, ayırır ve tam yolu döner."""
+        target_folder = Path(target_folder)
+        with self._lock:
+            return target_folder / self._index(target_folder).reserve(clean_name)
+
+    def commit(self, destination_path):
+        """Taşıma tamamlandı; ad dolu olarak kalır, bekleyenlerden çıkar."""
+        destination_path = Path(destination_path)
+        with self._lock:
+            index = self._folders.get(destination_path.parent)
+            if index is not None:
+                index.pending.discard(_key(destination_path.name))
+
+    def release(self, destination_path):
+        """Kullanılmayan (taşıma başarısız) bir rezervasyonu geri verir."""
+        destination_path = Path(destination_path)
+        with self._lock:
+            index = self._folders.get(destination_path.parent)
+            if index is not None:
+                name = _key(destination_path.name)
+                index.pending.discard(name)
+                index.taken.discard(name)
+
+    def invalidate(self, target_folder):
+        """Klasör dışarıdan değişti; bir sonraki ayırmadan önce yeniden listele."""
+        target_folder = Path(target_folder)
+        with self._lock:
+            index = self._folders.get(target_folder)
+            if index is not None:
+                index.reload()
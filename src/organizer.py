@@ -1,9 +1,17 @@
 import shutil
+import time
 from pathlib import Path
 from config_loader import load_config
 from logger import get_logger
-from reporter import generate_report
-from typing import Dict, Optional
+from classifier import get_classifier
+from rule_engine import get_rule_engine
+from reporter import schedule_report, flush_report
+from journal import record_event
+from scanner import FileInfo, is_ignored_name, scan
+from typing import Dict, Iterator, List, Optional
+from batch_mover import BatchMover, MovePlan, resolve_jobs
+from dedup import Deduplicator, record_move
+from planner import DEFAULT_PAGE_SIZE, iter_preview, plan_cursors, plan_from_item
 
 # Optional import: FilterEngine (enabling filter-based runs from Organizer)
 try:
@@ -12,14 +20,16 @@ except Exception:
     FilterEngine = None
 
 class Organizer:
-    def __init__(self):
+    def __init__(self, jobs=None):
         # Config ve Logger yükle (Hata almamak için güvenli yükleme)
-        self.config = load_config()
         self.logger = get_logger()
-        
-        self.source_dir = Path(self.config["source_directory"])
-        self.dest_dir = Path(self.config["destination_directory"])
-        self.extensions_map = self.config["file_extensions"]
+        self.apply_config(load_config())
+
+        # Toplu taşıma motoru (--jobs veya config'deki batch.jobs kadar işçi)
+        self.jobs = resolve_jobs(self.config, jobs)
+        self.mover = BatchMover(self.logger, self.jobs, on_moved=self._on_moved)
+        # Taşıma sonrası haber verilecekler (ör. Watcher kendi ürettiği olayları eler)
+        self.move_listeners = []
         
         # Cleaner kontrolü
         try:
@@ -28,79 +38,115 @@ class Organizer:
         except ImportError:
             self.sanitize_filename = lambda name: name.lower().replace(" ", "_")
 
-    def _get_unique_path(self, target_folder, clean_name):
-        """Generates a unique path to avoid overwriting existing files."""
-        destination_path = target_folder / clean_name
-        
-        if not destination_path.exists():
-            return destination_path
-            
-        counter = 1
-        stem = Path(clean_name).stem
-        suffix = Path(clean_name).suffix
-        
-        while True:
-            new_name = f"{stem}_{counter}{suffix}"
-            candidate_path = target_folder / new_name
-            if not candidate_path.exists():
-                return candidate_path
-            counter += 1
+    def apply_config(self, config):
+        """Config anlık görüntüsünü uygular (Watcher sıcak yeniden yükleme için de kullanır)."""
+        self.config = config
+        self.source_dir = Path(self.config["source_directory"])
+        self.dest_dir = Path(self.config["destination_directory"])
+        self.extensions_map = self.config["file_extensions"]
+        self.classifier = get_classifier(config)
+        # GUI'de tanımlanan modeller (config "models"): uyan dosya modelin hedef klasörüne gider
+        self.rules = get_rule_engine(config)
+        # Kopya dosya kontrolü (config "dedup"): kapalıysa planlar aynen geçer
+        self.dedup = Deduplicator(config, self.logger)
+
+    def plan_file(self, file_path, dest_dir=None) -> Optional[MovePlan]:
+        """
+        Dosya için taşıma planı oluşturur (kategori, hedef klasör, temiz ad).
+        Taramadan gelen FileInfo kaydı kabul edilir; Path/str için tek bir stat yapılır.
+        Atlanması gereken dosyalar için None döner.
+        """
+        if not isinstance(file_path, FileInfo):
+            file_path = Path(file_path)
+
+        # Geçici ve rapor dosyalarını görmezden gel (isimden, stat gerekmeden)
+        if is_ignored_name(file_path.name):
+            return None
 
-    def organize_file(self, file_path):
-        """Watcher için tekil dosya organizasyonu."""
-        file_path = Path(file_path)
-        
         # Temel kontroller
-        if not file_path.exists() or file_path.is_dir():
+        if not isinstance(file_path, FileInfo):
+            try:
+                file_path = FileInfo.from_path(file_path)
+            except OSError:
+                print(f"Atlandı (Klasör veya Yok): {file_path}")
+                return None
+        if file_path.is_dir:
             print(f"Atlandı (Klasör veya Yok): {file_path}")
-            return False
-            
-        if file_path.suffix in ['.tmp', '.crdownload', '.part']:
-            return False
+            return None
 
-        # Rapor dosyalarını görmezden gel (Sonsuz döngüyü önlemek için)
-        if file_path.name == "report.txt" or (file_path.name.startswith("report_") and file_path.suffix == ".txt"):
-            return False
+        # 1. Kategori Bulma (derlenmiş uzantı tablosundan tek arama)
+        found_category = self.classifier.classify(file_path)
+
+        # 2. Hedef Klasör: uyan model varsa modelin hedefi, yoksa kategori klasörü
+        rule = self.rules.match(file_path)
+        target_folder = Path(dest_dir or self.dest_dir) / (rule.target if rule is not None else found_category)
 
-        # 1. Kategori Bulma
-        file_extension = file_path.suffix.lower()
-        found_category = "Others"
-        
-        for category, extensions in self.extensions_map.items():
-            if file_extension in extensions:
-                found_category = category
-                break
-        
-        # 2. Hedef Klasör
-        target_folder = self.dest_dir / found_category
-        target_folder.mkdir(parents=True, exist_ok=True)
-        
         # 3. İsim Temizleme
+        # (benzersiz ad taşıma anında BatchMover tarafından kilit altında ayrılır)
         clean_name = self.sanitize_filename(file_path.name)
-        destination_path = self._get_unique_path(target_folder, clean_name)
-        
-        # 4. Taşıma
+        return MovePlan(file_path, found_category, target_folder, clean_name)
+
+    def iter_plan(self, source=None, dest=None) -> Iterator[MovePlan]:
+        """Kaynak klasördeki dosyalar için taşıma planlarını tembel (lazy) üretir."""
+        source_dir = Path(source) if source else self.source_dir
+        # Hedef verilmezse dosyalar kaynak klasör içinde kategorilere ayrılır
+        dest_dir = Path(dest) if dest else source_dir
+        for item in scan(source_dir):
+            plan = self.plan_file(item, dest_dir)
+            if plan is not None:
+                yield plan
+
+    def get_preview(self, source=None, dest=None) -> List[Dict]:
+        """Tüm önizleme kayıtlarını liste olarak döner (dosya sistemine dokunmaz)."""
+        return list(iter_preview(self.iter_plan(source, dest)))
+
+    def get_preview_page(self, source=None, dest=None, limit=DEFAULT_PAGE_SIZE, cursor=None) -> Optional[Dict]:
+        """
+        Önizlemenin bir sayfasını döner: {"items": [...], "next_cursor": ...}.
+        İlk sayfa tarama bitmeden hazır olur; cursor ile kalan sayfalar istenir.
+        Süresi dolmuş imleç için None döner.
+        """
+        if cursor:
+            return plan_cursors.next_page(cursor, limit)
+        return plan_cursors.paginate(iter_preview(self.iter_plan(source, dest)), limit)
+
+    def move_specific_files(self, items, dest=None) -> int:
+        """
+        Önizlemeden seçilen kayıtları yeniden tarama yapmadan taşır.
+        Hedef klasör önizlemede çözülmüş olandır; taşınan dosya sayısını döner.
+        """
+        stats = self.mover.run((plan_from_item(item) for item in items), collect_details=False)
+        flush_report()
+        return stats["moved"]
+
+    def _on_moved(self, plan, destination_path):
+        print(f"✔ [OK] {plan.category}: {destination_path.name}")
+        # Kopya denetimi hedef klasörü yeniden listelemesin; bu dosyayı bekleyen kopyalar bağlanır
+        record_move(destination_path, plan.source)
+        for listener in self.move_listeners:
+            listener(plan, destination_path)
+
+        # --- Raporu Güncelle (Kullanıcı İsteği) ---
+        # Rapor her taşımada değil, debounce aralığında bir kez yazılır
         try:
-            shutil.move(str(file_path), str(destination_path))
-            
-            log_msg = f"TASINDI | {found_category} | {file_path.name} -> {destination_path.name}"
-            self.logger.info(log_msg)
-            print(f"✔ [OK] {found_category}: {destination_path.name}")
-            
-            # --- Raporu Güncelle (Kullanıcı İsteği) ---
-            try:
-                generate_report()
-            except Exception as e:
-                print(f"Rapor güncellenemedi: {e}")
-                
-            return True
-            
-        except PermissionError:
-            self.logger.error(f"ERİŞİM HATASI | {file_path.name} dosyası kullanımda.")
+            schedule_report()
         except Exception as e:
-            self.logger.error(f"HATA | {file_path.name} taşınamadı: {e}")
-        
-        return False
+            print(f"Rapor güncellenemedi: {e}")
+
+    def organize_file(self, file_path):
+        """Watcher için tekil dosya organizasyonu."""
+        self.classifier.begin_scan()
+        plan = self.plan_file(file_path)
+        if plan is None:
+            return False
+
+        # 4. Kopya kontrolü (hedef klasördeki aynı boyutlu dosyalarla)
+        plan = next(self.dedup.filter_plans([plan], self.dest_dir, names=self.mover.names), None)
+        if plan is None:
+            return False
+
+        # 5. Taşıma
+        return self.mover.execute(plan) is not None
 
     def organize_folder(self, folder_path):
         """Klasörleri organize eder."""
@@ -114,6 +160,8 @@ class Organizer:
         # JSON'daki tanımlı kategorileri al
         defined_categories = set(self.extensions_map.keys())
         defined_categories.add("Others")  # Others kategorisi de dahil
+        defined_categories.update(self.rules.targets())  # Model hedef klasörleri
+        defined_categories.add(self.dedup.folder_name)  # Kopyalar klasörü
         
         # Eğer klasör adı tanımlı kategorilerden biriyse, atla
         if folder_path.name in defined_categories or folder_path.name == "folders":
@@ -140,15 +188,19 @@ class Organizer:
         
         # Taşıma
         try:
+            started = time.perf_counter()
             shutil.move(str(folder_path), str(destination_path))
             
             log_msg = f"KLASÖR TASINDI | folders | {folder_path.name} -> {destination_path.name}"
             self.logger.info(log_msg)
+            # Klasör boyutu hesaplanmaz (tüm ağacı gezmek gerekir)
+            record_event("folder_move", "folders", folder_path, destination_path,
+                         None, time.perf_counter() - started)
             print(f"✔ [OK] Klasör: {destination_path.name}")
             
             # Raporu güncelle
             try:
-                generate_report()
+                schedule_report()
             except Exception as e:
                 print(f"Rapor güncellenemedi: {e}")
             
@@ -170,16 +222,27 @@ class Organizer:
             print("HATA: Kaynak klasör bulunamadı!")
             return
 
-        file_count = 0
         folder_count = 0
+        plans = []
+        self.classifier.begin_scan()
         
-        for item in self.source_dir.iterdir():
-            if item.is_file():
-                if self.organize_file(item):
-                    file_count += 1
-            elif item.is_dir():
-                if self.organize_folder(item):
+        # Önce tüm taşımaları planla, klasörleri sırayla taşı
+        for item in scan(self.source_dir, include_dirs=True):
+            if item.is_dir:
+                if self.organize_folder(item.path):
                     folder_count += 1
+            else:
+                plan = self.plan_file(item)
+                if plan is not None:
+                    plans.append(plan)
+
+        # Dosya taşımalarını işçi havuzunda çalıştır
+        plans = self.dedup.filter_plans(plans, self.dest_dir, names=self.mover.names)
+        stats = self.mover.run(plans, collect_details=False)
+        file_count = stats["moved"]
+
+        # Toplu işlem sonunda raporu tek seferde yaz
+        flush_report()
                 
         print("-" * 50)
         print(f"✨ Tarama Bitti. Dosya: {file_count}, Klasör: {folder_count}")
@@ -0,0 +1,100 @@
+import itertools
+import secrets
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+from batch_mover import MovePlan
+from naming import DestinationNames
+
+DEFAULT_PAGE_SIZE = 500
+
+
+def iter_preview(plans: Iterable[MovePlan]) -> Iterator[Dict]:
+    """
+    Planları önizleme kayıtlarına çevirir; dosya sisteminde değişiklik yapmaz.
+    Hedef adlar önizlemeye özel bir ad indeksiyle çözülür (klasör oluşturulmaz,
+    dosya taşınmaz), böylece önizlemedeki çakışmalar da '_N' ile gösterilir.
+    """
+    names = DestinationNames()
+    for plan in plans:
+        try:
+            size = plan.source.size if hasattr(plan.source, "size") else Path(plan.source).stat().st_size
+        except OSError:
+            # Önizleme sırasında silinen dosyalar
+            continue
+        destination = names.reserve(plan.target_folder, plan.clean_name)
+        yield {
+            "path": str(plan.source),
+            "filename": plan.source.name,
+            "category": plan.category,
+            "clean_name": plan.clean_name,
+            "target_folder": str(plan.target_folder),
+            "destination": str(destination),
+            "size": size,
+        }
+
+
+def plan_from_item(item: Dict) -> MovePlan:
+    """Önizleme kaydından (GUI/Flask'tan dönen) yeniden tarama yapmadan plan oluşturur."""
+    return MovePlan(Path(item["path"]), item["category"], Path(item["target_folder"]), item["clean_name"])
+
+
+class PlanCursors:
+    """
+    Sayfalı önizleme için sunucu tarafı imleçler.
+
+    Her imleç canlı bir önizleme üretecini tutar; bir sonraki sayfa istendiğinde
+    tarama kaldığı yerden devam eder. Kullanılmayan imleçler ttl sonunda atılır.
+    """
+
+    def __init__(self, ttl_seconds: float = 600, max_cursors: int = 64):
+        self.ttl_seconds = ttl_seconds
+        self.max_cursors = max_cursors
+        self._lock = threading.Lock()
+        self._cursors = {}  # token -> [iterator, son erişim]
+
+    def _prune(self):
+        now = time.monotonic()
+        expired = [t for t, (_, last) in self._cursors.items() if now - last > self.ttl_seconds]
+        for token in expired:
+            del self._cursors[token]
+        # Çok fazla açık imleç varsa en eskileri at
+        while len(self._cursors) >= self.max_cursors:
+            oldest = min(self._cursors, key=lambda t: self._cursors[t][1])
+            del self._cursors[oldest]
+
+    def paginate(self, iterator: Iterator[Dict], limit: int = DEFAULT_PAGE_SIZE) -> Dict:
+        """İlk sayfayı döner; devamı varsa imleç açar."""
+        items = list(itertools.islice(iterator, limit))
+        return {"items": items, "next_cursor": self._open(iterator) if len(items) == limit else None}
+
+    def next_page(self, token: str, limit: int = DEFAULT_PAGE_SIZE) -> Optional[Dict]:
+        """İmlecin bir sonraki sayfasını döner; imleç yoksa (süresi dolmuş) None."""
+        with self._lock:
+            entry = self._cursors.pop(token, None)
+        if entry is None:
+            return None
+        iterator = entry[0]
+        items = list(itertools.islice(iterator, limit))
+        next_cursor = None
+        if len(items) == limit:
+            with self._lock:
+                self._cursors[token] = [iterator, time.monotonic()]
+            next_cursor = token
+        return {"items": items, "next_cursor": next_cursor}
+
+    def _open(self, iterator: Iterator[Dict]) -> str:
+        token = secrets.token_urlsafe(12)
+        with self._lock:
+            self._prune()
+            self._cursors[token] = [iterator, time.monotonic()]
+        return token
+
+    def close(self, token: str):
+        with self._lock:
+            self._cursors.pop(token, None)
+
+
+# GUI ve Flask tarafından paylaşılan imleç deposu
+plan_cursors = PlanCursors()
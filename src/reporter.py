@@ -1,55 +1,442 @@
+import json
 import os
-from collections import Counter
+import time
+import threading
+import atexit
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
 from config_loader import load_config
+from journal import MOVE_OPS, JournalReader, flush_journal, get_journal
+from rollup import day_start, week_start
+from rotation import list_segments, segment_id
 
-def generate_report():
-    config = load_config()
-    log_path = config.get("log_file_path", "organizer.log")
-    
-    if not os.path.exists(log_path):
-        print(f"Log dosyası bulunamadı: {log_path}")
-        return
+REPORT_FILE = "report.txt"
+CHECKPOINT_FILE_NAME = "report_checkpoint.json"
+CHECKPOINT_VERSION = 2
+# GUI'de gösterilen son işlem sayısı
+RECENT_LIMIT = 20
+# Zaman aralıklı istatistikler için dönemler (GUI/Flask "period" parametresi)
+STATS_PERIODS = ("24h", "7d", "week", "30d")
+# Bu sayıdan az yeni parça varsa süreç havuzu açılmaz (başlatma maliyeti)
+PARALLEL_MIN_SEGMENTS = 2
 
-    total_moved = 0
-    categories = Counter()
 
-    print(f"\n--- RAPOR OLUŞTURULUYOR ---")
-    print(f"Kaynak Log: {log_path}\n")
+def format_bytes(size):
+    """Byte sayısını okunur birime çevirir (örn. 2.4 GB)."""
+    if size < 1024:
+        return f"{size} B"
+    for unit in ("KB", "MB", "GB", "TB"):
+        size /= 1024
+        if size < 1024 or unit == "TB":
+            return f"{size:.1f} {unit}"
 
-    try:
-        with open(log_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                if "TASINDI" in line:
-                    total_moved += 1
-                    # Log format: ... - TASINDI | Category | File -> ...
-                    parts = line.split("|")
-                    if len(parts) >= 2:
-                        category = parts[1].strip()
-                        categories[category] += 1
-        
+
+class ReportTotals:
+    """Bir journal parçasının (veya tümünün) sayaçları; parçalar arasında toplanabilir."""
+
+    __slots__ = ("moved", "bytes", "archived", "categories", "category_bytes")
+
+    def __init__(self):
+        self.moved = 0
+        self.bytes = 0
+        self.archived = 0
+        self.categories = Counter()
+        self.category_bytes = Counter()
+
+    def add_event(self, event) -> bool:
+        """Olayı sayar; rapora giren bir olaysa True döner."""
+        op = event.get("op")
+        if op in MOVE_OPS:
+            size = event.get("bytes") or 0
+            category = event.get("category") or "Others"
+            self.moved += 1
+            self.bytes += size
+            self.categories[category] += 1
+            self.category_bytes[category] += size
+            return True
+        if op == "archive":
+            self.archived += 1
+            return True
+        return False
+
+    def merge(self, other: "ReportTotals"):
+        self.moved += other.moved
+        self.bytes += other.bytes
+        self.archived += other.archived
+        self.categories.update(other.categories)
+        self.category_bytes.update(other.category_bytes)
+
+    def to_dict(self) -> Dict:
+        return {
+            "moved": self.moved,
+            "bytes": self.bytes,
+            "archived": self.archived,
+            "categories": dict(self.categories),
+            "category_bytes": dict(self.category_bytes),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ReportTotals":
+        totals = cls()
+        totals.moved = int(data.get("moved", 0))
+        totals.bytes = int(data.get("bytes", 0))
+        totals.archived = int(data.get("archived", 0))
+        totals.categories = Counter(data.get("categories", {}))
+        totals.category_bytes = Counter(data.get("category_bytes", {}))
+        return totals
+
+
+def aggregate_segment(path) -> Dict:
+    """Döndürülmüş (sabit) bir journal parçasının sayaçları. Süreç havuzunda çalışır."""
+    totals = ReportTotals()
+    for event in JournalReader(path):
+        totals.add_event(event)
+    return totals.to_dict()
+
+
+class IncrementalReporter:
+    """
+    Olay journal'ını (events.jsonl ve döndürülmüş parçaları) artımlı okuyan raporlayıcı.
+
+    Döndürülmüş parçalar (sıkıştırılmış olanlar dahil) değişmediği için her
+    biri yalnızca bir kez, birden fazla yeni parça varsa süreç havuzunda
+    paralel olarak toplanır; sonuçları parça kimliğiyle checkpoint'e yazılır.
+    Aktif dosyanın yalnızca son okunan byte konumundan (offset) sonraki kısmı
+    okunur. Kayıtlar yapılandırılmış olduğundan metin ayrıştırma yapılmaz.
+    report.txt en fazla debounce aralığında bir kez (veya toplu işlem sonunda
+    flush ile) yeniden yazılır.
+    """
+
+    def __init__(self, journal_path, checkpoint_path, debounce_seconds=2.0):
+        self.journal_path = Path(journal_path)
+        self.checkpoint_path = Path(checkpoint_path)
+        self.debounce_seconds = debounce_seconds
+
+        self.segments: Dict[str, ReportTotals] = {}  # parça kimliği -> sayaçlar
+        self.active = ReportTotals()
+        self.recent = deque(maxlen=RECENT_LIMIT)
+        self.offset = 0
+        self.file_id = None  # (st_dev, st_ino): aktif dosya döndürüldü mü?
+
+        self._lock = threading.RLock()
+        self._timer = None
+        self._dirty = False
+
+        self._load_checkpoint()
+
+    # ------------------------------------------------------------------
+    # Checkpoint
+    # ------------------------------------------------------------------
+    def _load_checkpoint(self):
+        if not self.checkpoint_path.exists():
+            return
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != CHECKPOINT_VERSION or data.get("journal_path") != str(self.journal_path):
+                return
+            self.offset = int(data.get("offset", 0))
+            self.active = ReportTotals.from_dict(data.get("active", {}))
+            self.segments = {key: ReportTotals.from_dict(value)
+                             for key, value in data.get("segments", {}).items()}
+            self.recent.extend(data.get("recent", []))
+            file_id = data.get("file_id")
+            self.file_id = tuple(file_id) if file_id else None
+        except Exception as e:
+            print(f"Rapor checkpoint okunamadı, journal baştan okunacak: {e}")
+            self._reset()
+
+    def _save_checkpoint(self):
+        data = {
+            "version": CHECKPOINT_VERSION,
+            "journal_path": str(self.journal_path),
+            "offset": self.offset,
+            "file_id": list(self.file_id) if self.file_id else None,
+            "active": self.active.to_dict(),
+            "segments": {key: totals.to_dict() for key, totals in self.segments.items()},
+            "recent": list(self.recent),
+        }
+        tmp_path = self.checkpoint_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _reset(self):
+        self.offset = 0
+        self.file_id = None
+        self.active = ReportTotals()
+        self.segments = {}
+        self.recent.clear()
+
+    # ------------------------------------------------------------------
+    # Journal okuma
+    # ------------------------------------------------------------------
+    def _ingest_segments(self):
+        """Henüz toplanmamış döndürülmüş parçaları (gerekirse paralel) toplar."""
+        pending = [p for p in list_segments(self.journal_path) if segment_id(p) not in self.segments]
+        if not pending:
+            return
+
+        if len(pending) < PARALLEL_MIN_SEGMENTS:
+            results = []
+            for path in pending:
+                try:
+                    results.append((path, aggregate_segment(path)))
+                except OSError:
+                    # Sıkıştırma sırasında yeniden adlandırıldı: sonraki yenilemede
+                    pass
+        else:
+            workers = min(len(pending), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [(path, pool.submit(aggregate_segment, path)) for path in pending]
+                results = []
+                for path, future in futures:
+                    try:
+                        results.append((path, future.result()))
+                    except OSError:
+                        pass
+
+        for path, data in results:
+            self.segments[segment_id(path)] = ReportTotals.from_dict(data)
+
+    def _consume_event(self, event):
+        if not self.active.add_event(event):
+            return
+        self.recent.append({
+            "ts": event.get("ts"),
+            "op": event.get("op"),
+            "category": event.get("category") or "Others",
+            "name": os.path.basename(event.get("destination") or event.get("source") or ""),
+        })
+
+    def refresh(self):
+        """Yeni parçaları ve aktif journal'ın yalnızca yeni eklenen kısmını okur."""
+        # Tamponda bekleyen olaylar önce dosyaya yazılsın
+        flush_journal()
+        with self._lock:
+            # Önce parçalar: aktif dosya arada döndürülürse iki kez sayılmasın
+            self._ingest_segments()
+
+            if not self.journal_path.exists():
+                return bool(self.segments)
+
+            st = self.journal_path.stat()
+            file_id = (st.st_dev, st.st_ino)
+
+            # Aktif dosya döndürüldüyse (içeriği artık bir parçada) veya kısaldıysa baştan oku
+            if self.file_id != file_id or st.st_size < self.offset:
+                self.active = ReportTotals()
+                self.offset = 0
+                self.file_id = file_id
+
+            if st.st_size == self.offset:
+                return True
+
+            reader = JournalReader(self.journal_path, self.offset)
+            for event in reader:
+                self._consume_event(event)
+            self.offset = reader.offset
+            return True
+
+    def totals(self) -> ReportTotals:
+        """Tüm parçaların ve aktif dosyanın birleştirilmiş sayaçları."""
+        combined = ReportTotals()
+        for totals in self.segments.values():
+            combined.merge(totals)
+        combined.merge(self.active)
+        return combined
+
+    def summary(self):
+        """GUI/Flask için sayaçların anlık özeti (dosya yazmadan)."""
+        with self._lock:
+            self.refresh()
+            totals = self.totals()
+            return {
+                "total_moved": totals.moved,
+                "total_bytes": totals.bytes,
+                "archived": totals.archived,
+                "categories": {
+                    cat: {"count": count, "bytes": totals.category_bytes[cat]}
+                    for cat, count in totals.categories.most_common()
+                },
+                "recent": list(reversed(self.recent)),
+            }
+
+    # ------------------------------------------------------------------
+    # Rapor yazma
+    # ------------------------------------------------------------------
+    def render(self):
+        totals = self.totals()
         report_lines = []
         report_lines.append("=" * 40)
-        report_lines.append(f" TOPLAM TAŞINAN DOSYA SAYISI: {total_moved}")
+        report_lines.append(f" TOPLAM TAŞINAN DOSYA SAYISI: {totals.moved}")
+        report_lines.append(f" TOPLAM BOYUT: {format_bytes(totals.bytes)}")
+        if totals.archived:
+            report_lines.append(f" ARŞİVLENEN DOSYA SAYISI: {totals.archived}")
         report_lines.append("=" * 40)
         report_lines.append("KATEGORİ DAĞILIMI:")
         report_lines.append("-" * 40)
-        for cat, count in categories.most_common():
-            report_lines.append(f" {cat:<20} : {count}")
+        for cat, count in totals.categories.most_common():
+            report_lines.append(f" {cat:<20} : {count:<8} ({format_bytes(totals.category_bytes[cat])})")
         report_lines.append("-" * 40)
         report_lines.append("Rapor sonu.\n")
+        return "\n".join(report_lines)
+
+    def write_report(self, verbose=False):
+        """Sayaçları yeniler, report.txt dosyasını ve checkpoint'i yazar."""
+        with self._lock:
+            self._cancel_timer()
+            self._dirty = False
+
+            if not self.refresh():
+                if verbose:
+                    print(f"Olay kaydı bulunamadı: {self.journal_path}")
+                return None
+
+            output_text = self.render()
+            with open(REPORT_FILE, "w", encoding="utf-8") as report_file:
+                report_file.write(f"--- RAPOR --- (Kaynak: {self.journal_path})\n")
+                report_file.write(output_text)
+            self._save_checkpoint()
+            return output_text
+
+    def request_write(self):
+        """
+        Rapor yazımını debounce aralığı kadar erteler.
+        Aralık içinde gelen tüm istekler tek bir yazımda birleştirilir.
+        """
+        with self._lock:
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.debounce_seconds, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Bekleyen bir rapor yazımı varsa hemen yapar (toplu işlem sonu)."""
+        with self._lock:
+            if self._dirty:
+                self.write_report()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+            if self._dirty:
+                try:
+                    self.write_report()
+                except Exception as e:
+                    print(f"Rapor güncellenemedi: {e}")
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+_reporter = None
+_reporter_lock = threading.Lock()
+
+
+def get_reporter():
+    """Süreç genelinde paylaşılan IncrementalReporter örneğini döner."""
+    global _reporter
+    config = load_config()
+    journal_path = Path(config.get("journal_file_path", "events.jsonl"))
+
+    with _reporter_lock:
+        if _reporter is None or _reporter.journal_path != journal_path:
+            debounce = config.get("report", {}).get("debounce_seconds", 2.0)
+            checkpoint_path = journal_path.parent / CHECKPOINT_FILE_NAME
+            _reporter = IncrementalReporter(journal_path, checkpoint_path, debounce)
+        return _reporter
+
+
+def schedule_report():
+    """Taşıma sonrası çağrılır; raporu debounce ile günceller."""
+    get_reporter().request_write()
+
+
+def flush_report():
+    """Toplu işlem sonunda bekleyen rapor yazımını tamamlar."""
+    if _reporter is not None:
+        _reporter.flush()
 
+
+atexit.register(flush_report)
+
+
+def get_summary():
+    """Rapor sayaçlarının özeti (GUI panosu için)."""
+    return get_reporter().summary()
+
+
+def _period_start(period: str, now: float) -> float:
+    if period == "24h":
+        return now - 86400
+    if period == "7d":
+        return day_start(now - 6 * 86400)
+    if period == "week":
+        return week_start(now)
+    if period == "30d":
+        return day_start(now - 29 * 86400)
+    raise ValueError(f"Geçersiz dönem: {period} (geçerli: {', '.join(STATS_PERIODS)})")
+
+
+def get_stats(period: str = "24h", top: int = 10) -> Optional[Dict]:
+    """
+    Saatlik/günlük özet deposundan dönem istatistikleri: kategori (yalnızca
+    taşımalar) ve işlem bazında dosya/byte, zaman çizelgesi ve hacme göre en
+    çok dosya gelen kaynak klasörler. Ham olaylar okunmaz. Özet deposu yoksa
+    None döner.
+    """
+    rollup = get_journal().rollup
+    if rollup is None:
+        return None
+    now = time.time()
+    since = _period_start(period, now)
+    return {
+        "period": period,
+        "since": since,
+        # Kategori toplamları yalnızca taşımaları sayar (arşiv/kopya olayları by_op'ta)
+        "by_category": rollup.totals_by("category", since, now, ops=MOVE_OPS),
+        "by_op": rollup.totals_by("op", since, now),
+        "timeline": rollup.timeline(since, now),
+        "top_sources": rollup.top_sources(since, top),
+    }
+
+
+def generate_report():
+    reporter = get_reporter()
+    flush_journal()
+    journal_path = reporter.journal_path
+
+    if not journal_path.exists() and not list_segments(journal_path):
+        print(f"Olay kaydı bulunamadı: {journal_path}")
+        return
+
+    print(f"\n--- RAPOR OLUŞTURULUYOR ---")
+    print(f"Kaynak: {journal_path}\n")
+
+    try:
         # Hem ekrana yaz hem dosyaya kaydet
-        output_text = "\n".join(report_lines)
+        output_text = reporter.write_report(verbose=True)
+        if output_text is None:
+            return
         print(output_text)
-        
-        with open("report.txt", "w", encoding="utf-8") as report_file:
-            report_file.write(f"--- RAPOR --- (Kaynak: {log_path})\n")
-            report_file.write(output_text)
-        
-        print(f"\n>> Rapor dosyası oluşturuldu: {os.path.abspath('report.txt')}")
+
+        stats = get_stats("24h", top=5)
+        if stats and stats["by_category"]:
+            print("SON 24 SAAT:")
+            for cat, info in stats["by_category"].items():
+                print(f" {cat:<20} : {info['files']:<8} ({format_bytes(info['bytes'])})")
+            for source in stats["top_sources"]:
+                print(f" Kaynak: {source['source']} -> {source['files']} dosya ({format_bytes(source['bytes'])})")
+        print(f"\n>> Rapor dosyası oluşturuldu: {os.path.abspath(REPORT_FILE)}")
 
     except Exception as e:
         print(f"Rapor oluşturulurken hata: {e}")
 
 if __name__ == "__main__":
-    generate_report()
\ No newline at end of file
+    generate_report()
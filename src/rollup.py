@@ -0,0 +1,196 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+HOUR = "hour"
+DAY = "day"
+
+# Bellekte bu kadar farklı anahtar birikince SQLite'a yazılır
+FLUSH_EVERY = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollup (
+    kind TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    op TEXT NOT NULL,
+    files INTEGER NOT NULL,
+    bytes INTEGER NOT NULL,
+    PRIMARY KEY (kind, bucket, category, op)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS source_rollup (
+    bucket INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    files INTEGER NOT NULL,
+    bytes INTEGER NOT NULL,
+    PRIMARY KEY (bucket, source)
+) WITHOUT ROWID;
+"""
+
+_UPSERT = """
+INSERT INTO rollup (kind, bucket, category, op, files, bytes) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (kind, bucket, category, op)
+DO UPDATE SET files = files + excluded.files, bytes = bytes + excluded.bytes
+"""
+
+_UPSERT_SOURCE = """
+INSERT INTO source_rollup (bucket, source, files, bytes) VALUES (?, ?, ?, ?)
+ON CONFLICT (bucket, source)
+DO UPDATE SET files = files + excluded.files, bytes = bytes + excluded.bytes
+"""
+
+
+def hour_start(ts: float) -> int:
+    """Yerel saate göre saatin başlangıcı (epoch saniye)."""
+    tm = time.localtime(ts)
+    return int(time.mktime((tm.tm_year, tm.tm_mon, tm.tm_mday, tm.tm_hour, 0, 0, 0, 0, -1)))
+
+
+def day_start(ts: float) -> int:
+    """Yerel saate göre günün başlangıcı (gece yarısı, epoch saniye)."""
+    tm = time.localtime(ts)
+    return int(time.mktime((tm.tm_year, tm.tm_mon, tm.tm_mday, 0, 0, 0, 0, 0, -1)))
+
+
+def week_start(ts: float) -> int:
+    """Haftanın başlangıcı (pazartesi gece yarısı)."""
+    tm = time.localtime(ts)
+    return int(time.mktime((tm.tm_year, tm.tm_mon, tm.tm_mday - tm.tm_wday, 0, 0, 0, 0, 0, -1)))
+
+
+class RollupStore:
+    """
+    Olayların saatlik ve günlük özetleri (SQLite).
+
+    Her olay (kategori, işlem) bazında saat ve gün kovalarına eklenir;
+    kaynak klasör hacmi günlük tutulur. Olaylar önce bellekte birleştirilir,
+    FLUSH_EVERY farklı anahtarda bir (veya flush ile) tek bir işlemde UPSERT
+    edilir. Sorgular ham olayları değil yalnızca bu özet satırlarını okur.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.created = not self.path.exists()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._pending = Counter()         # (kind, bucket, category, op) -> [files, bytes]
+        self._pending_bytes = Counter()
+        self._pending_sources = Counter()  # (bucket, source) -> files
+        self._pending_source_bytes = Counter()
+
+    # ------------------------------------------------------------------
+    # Yazma
+    # ------------------------------------------------------------------
+    def add(self, event: Dict):
+        ts = event.get("ts") or time.time()
+        category = event.get("category") or "Others"
+        op = event.get("op") or "move"
+        size = event.get("bytes") or 0
+        hour, day = hour_start(ts), day_start(ts)
+        source = event.get("source")
+        with self._lock:
+            for key in ((HOUR, hour, category, op), (DAY, day, category, op)):
+                self._pending[key] += 1
+                self._pending_bytes[key] += size
+            if source:
+                key = (day, os.path.dirname(source))
+                self._pending_sources[key] += 1
+                self._pending_source_bytes[key] += size
+            if len(self._pending) + len(self._pending_sources) >= FLUSH_EVERY:
+                self._flush_locked()
+
+    def add_many(self, events: Iterable[Dict]):
+        for event in events:
+            self.add(event)
+        self.flush()
+
+    def _flush_locked(self):
+        if not self._pending and not self._pending_sources:
+            return
+        rows = [key + (files, self._pending_bytes[key]) for key, files in self._pending.items()]
+        source_rows = [key + (files, self._pending_source_bytes[key])
+                       for key, files in self._pending_sources.items()]
+        with self._conn:
+            self._conn.executemany(_UPSERT, rows)
+            self._conn.executemany(_UPSERT_SOURCE, source_rows)
+        self._pending.clear()
+        self._pending_bytes.clear()
+        self._pending_sources.clear()
+        self._pending_source_bytes.clear()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Sorgular
+    # ------------------------------------------------------------------
+    def _query(self, sql: str, params) -> List[tuple]:
+        with self._lock:
+            self._flush_locked()
+            return self._conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _kind_for(since: float, until: Optional[float]) -> str:
+        # Birkaç günden kısa aralıklar saatlik, daha uzunları günlük kovalardan
+        span = (until or time.time()) - since
+        return HOUR if span <= 3 * 86400 else DAY
+
+    @staticmethod
+    def _bucket_floor(kind: str, since: float) -> int:
+        return hour_start(since) if kind == HOUR else day_start(since)
+
+    def totals_by(self, field: str, since: float, until: Optional[float] = None,
+                  ops: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        """
+        category veya op bazında {ad: {"files", "bytes"}} (büyükten küçüğe).
+        ops verilirse yalnızca bu işlemler sayılır (ör. arşivleme ve kopya
+        olayları hariç tutulup bir dosya iki kez sayılmaz).
+        """
+        if field not in ("category", "op"):
+            raise ValueError(f"Geçersiz gruplama: {field}")
+        kind = self._kind_for(since, until)
+        params = [kind, self._bucket_floor(kind, since), until or time.time() + 1]
+        op_filter = ""
+        if ops is not None:
+            ops = list(ops)
+            op_filter = f" AND op IN ({', '.join('?' for _ in ops)})"
+            params.extend(ops)
+        rows = self._query(
+            f"SELECT {field}, SUM(files), SUM(bytes) FROM rollup "
+            f"WHERE kind = ? AND bucket >= ? AND bucket < ?{op_filter} GROUP BY {field} ORDER BY SUM(files) DESC",
+            params,
+        )
+        return {name: {"files": files, "bytes": size} for name, files, size in rows}
+
+    def timeline(self, since: float, until: Optional[float] = None) -> List[Dict]:
+        """Kova başına toplamlar (grafik için), eskiden yeniye."""
+        kind = self._kind_for(since, until)
+        rows = self._query(
+            "SELECT bucket, SUM(files), SUM(bytes) FROM rollup "
+            "WHERE kind = ? AND bucket >= ? AND bucket < ? GROUP BY bucket ORDER BY bucket",
+            (kind, self._bucket_floor(kind, since), until or time.time() + 1),
+        )
+        return [{"bucket": bucket, "kind": kind, "files": files, "bytes": size} for bucket, files, size in rows]
+
+    def top_sources(self, since: float, limit: int = 10) -> List[Dict]:
+        """Hacme göre en çok dosya gelen kaynak klasörler."""
+        rows = self._query(
+            "SELECT source, SUM(files), SUM(bytes) FROM source_rollup WHERE bucket >= ? "
+            "GROUP BY source ORDER BY SUM(bytes) DESC LIMIT ?",
+            (day_start(since), limit),
+        )
+        return [{"source": source, "files": files, "bytes": size} for source, files, size in rows]
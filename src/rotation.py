@@ -0,0 +1,136 @@
+import gzip
+import os
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# Döndürülmüş parça adı: <ad>.<YYYYmmdd-HHMMSS>[-N]<uzantı>[.gz]
+_STAMP_FORMAT = "%Y%m%d-%H%M%S"
+_SEGMENT_PATTERN = r"^{stem}\.(\d{{8}}-\d{{6}}(?:-\d+)?){suffix}(\.gz)?$"
+
+
+class RotationPolicy:
+    """
+    Log/journal dosyaları için boyut ve/veya zaman tabanlı döndürme ayarları.
+
+    config.json "rotation" bölümünden okunur:
+        {"max_mb": 10, "interval_hours": 24, "backup_count": 0, "compress": true}
+    max_mb veya interval_hours 0 ise o ölçüt kullanılmaz; backup_count 0 ise
+    eski parçalar silinmez.
+    """
+
+    def __init__(self, max_bytes: int = 0, interval_seconds: float = 0,
+                 backup_count: int = 0, compress: bool = True):
+        self.max_bytes = max_bytes
+        self.interval_seconds = interval_seconds
+        self.backup_count = backup_count
+        self.compress = compress
+
+    @classmethod
+    def from_config(cls, config) -> "RotationPolicy":
+        section = config.get("rotation", {})
+        return cls(
+            max_bytes=int(float(section.get("max_mb", 0)) * 1024 * 1024),
+            interval_seconds=float(section.get("interval_hours", 0)) * 3600,
+            backup_count=int(section.get("backup_count", 0)),
+            compress=bool(section.get("compress", True)),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.max_bytes or self.interval_seconds)
+
+    def is_due(self, size: int, started_at: float) -> bool:
+        """Aktif dosya döndürülmeli mi? (boyut veya yaş sınırı aşıldıysa)"""
+        if self.max_bytes and size >= self.max_bytes:
+            return True
+        return bool(self.interval_seconds and size and time.time() - started_at >= self.interval_seconds)
+
+    def rotate(self, path) -> Optional[Path]:
+        """
+        Aktif dosyayı zaman damgalı bir parçaya yeniden adlandırır (kapalı olmalıdır).
+        Sıkıştırma ve eski parçaların silinmesi arka planda yapılır, böylece
+        yazan thread beklemez. Yeni parçanın yolunu döner.
+        """
+        path = Path(path)
+        if not path.exists():
+            return None
+        stamp = time.strftime(_STAMP_FORMAT)
+        segment = path.with_name(f"{path.stem}.{stamp}{path.suffix}")
+        counter = 1
+        while segment.exists() or Path(f"{segment}.gz").exists():
+            segment = path.with_name(f"{path.stem}.{stamp}-{counter}{path.suffix}")
+            counter += 1
+        os.replace(path, segment)
+
+        if self.compress or self.backup_count:
+            threading.Thread(target=self._finish, args=(path, segment),
+                             name="log-rotation", daemon=True).start()
+        return segment
+
+    def _finish(self, path: Path, segment: Path):
+        if self.compress:
+            compress_segment(segment)
+        if self.backup_count:
+            for old in list_segments(path)[:-self.backup_count]:
+                try:
+                    os.unlink(old)
+                except OSError:
+                    pass
+
+
+def compress_segment(segment: Path) -> Path:
+    """Parçayı gzip'ler; .gz dosyası tamamlanınca (os.replace) ham parça silinir."""
+    target = Path(f"{segment}.gz")
+    tmp = Path(f"{target}.tmp")
+    try:
+        with open(segment, "rb") as src, gzip.open(tmp, "wb", compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        os.replace(tmp, target)
+        os.unlink(segment)
+        return target
+    except OSError as e:
+        print(f"Log parçası sıkıştırılamadı: {segment} ({e})")
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        return segment
+
+
+def segment_id(segment) -> str:
+    """Parçanın sıkıştırılmadan önceki ve sonraki hali için aynı kimlik."""
+    name = Path(segment).name
+    return name[:-3] if name.endswith(".gz") else name
+
+
+def list_segments(path) -> List[Path]:
+    """
+    Aktif dosyaya ait döndürülmüş parçaları eskiden yeniye sıralı döner.
+    Sıkıştırma sürerken hem ham hem .gz bulunursa ham parça tercih edilir
+    (.gz henüz tamamlanmamış olabilir).
+    """
+    path = Path(path)
+    pattern = re.compile(_SEGMENT_PATTERN.format(stem=re.escape(path.stem), suffix=re.escape(path.suffix)))
+    found = {}
+    try:
+        entries = list(os.scandir(path.parent))
+    except OSError:
+        return []
+    for entry in entries:
+        match = pattern.match(entry.name)
+        if not match:
+            continue
+        key = segment_id(entry.name)
+        if key not in found or not entry.name.endswith(".gz"):
+            found[key] = (_sort_key(match.group(1)), Path(entry.path))
+    return [p for _, p in sorted(found.values())]
+
+
+def _sort_key(stamp: str):
+    # "20261018-095612-2" -> ("20261018", "095612", 2)
+    parts = stamp.split("-")
+    return (parts[0], parts[1], int(parts[2]) if len(parts) > 2 else 0)
@@ -0,0 +1,180 @@
+import fnmatch
+import os
+import re
+import threading
+from pathlib import PurePath
+from typing import Dict, List, Optional
+from config_loader import load_config, save_config_value
+from logger import get_logger
+from scanner import FileInfo
+from filter_expr import FIELDS, FilterExpressionError, compile_expression
+
+_WILDCARDS = re.compile(r"[*?\[]")
+# Glob listesi değil de filtre ifadesi olduğunu gösteren işaretler: parantez veya
+# bir sözcüğün başında alan:değer / alan>değer (boşluk tek başına işaret değildir)
+_EXPRESSION_HINT = re.compile(r"[()]|(?:^|\s)(?:%s)(<=|>=|==|!=|<|>|=|:)" % "|".join(FIELDS))
+
+
+class Rule:
+    """GUI'deki bir organizasyon modeli: kalıba uyan dosyalar target klasörüne gider."""
+
+    __slots__ = ("id", "name", "pattern", "target", "priority", "order", "rank")
+
+    def __init__(self, model: Dict, order: int):
+        self.id = model.get("id")
+        self.name = model.get("name") or ""
+        self.pattern = model.get("pattern") or ""
+        self.target = (model.get("target") or "").strip()
+        self.priority = int(model.get("priority", 0) or 0)
+        self.order = order
+        # Küçük olan kazanır: önce yüksek öncelik, eşitlikte listedeki sıra
+        self.rank = (-self.priority, order)
+
+    def __repr__(self):
+        return f"Rule({self.name!r}, {self.pattern!r} -> {self.target!r})"
+
+
+def _glob_test(glob: str):
+    match = re.compile(fnmatch.translate(glob)).match
+    return lambda lname, file: match(lname) is not None
+
+
+def _split_pattern(pattern: str) -> Optional[List[str]]:
+    """
+    '*.jpg, *.png' -> ['*.jpg', '*.png']; filtre ifadesiyse None.
+    Önce virgülle bölünür; 'my file*.pdf' gibi boşluklu parçalar glob kalır.
+    """
+    globs = [part.strip().lower() for part in pattern.split(",") if part.strip()]
+    if any(_EXPRESSION_HINT.search(glob) for glob in globs):
+        return None
+    return globs
+
+
+class RuleEngine:
+    """
+    Aktif modelleri dosya adlarına karşı değerlendirir.
+
+    Her glob bir kez sınıflandırılıp indekslenir: '*.jpg' gibi sabit uzantılı
+    kalıplar uzantı sözlüğüne, 'IMG_*' gibi sabit önekliler önek sözlüğüne,
+    jokersiz adlar tam ad sözlüğüne gider. Dosya başına yalnızca kendi
+    uzantısı, öneki ve adı için kayıtlı adaylar (ve indekslenemeyen birkaç
+    kalıp) denenir; kural sayısı binleri bulsa da maliyet sabit kalır.
+    Birden fazla kural uyarsa önceliği yüksek olan, eşitlikte listede önce
+    gelen kazanır.
+    """
+
+    def __init__(self, models, logger=None):
+        self.logger = logger or get_logger()
+        self.rules: List[Rule] = []
+        self._by_ext: Dict[str, list] = {}
+        self._by_prefix: Dict[str, list] = {}
+        self._by_name: Dict[str, list] = {}
+        self._prefix_lengths: List[int] = []
+        self._generic: list = []
+        for order, model in enumerate(models or ()):
+            if model.get("active", True):
+                self._add(Rule(model, order))
+        self._prefix_lengths = sorted({len(prefix) for prefix in self._by_prefix})
+        # Kovalar sıralıdır: bir kovadaki ilk eşleşme o kovanın kazananıdır
+        for index in (self._by_ext, self._by_prefix, self._by_name):
+            for bucket in index.values():
+                bucket.sort(key=lambda entry: entry[0])
+        self._generic.sort(key=lambda entry: entry[0])
+
+    def _add(self, rule: Rule):
+        target = PurePath(rule.target)
+        if not rule.target or target.is_absolute() or ".." in target.parts:
+            self.logger.warning(f"KURAL ATLANDI | {rule.name}: geçersiz hedef klasör {rule.target!r}")
+            return
+        globs = _split_pattern(rule.pattern)
+        if globs is None:
+            try:
+                expression = compile_expression(rule.pattern)
+            except FilterExpressionError as e:
+                self.logger.warning(f"KURAL ATLANDI | {rule.name}: {e}")
+                return
+            self._generic.append((rule.rank, rule, lambda lname, file: expression.matches(
+                FileInfo(file) if isinstance(file, str) else file)))
+            self.rules.append(rule)
+            return
+        if not globs:
+            self.logger.warning(f"KURAL ATLANDI | {rule.name}: kalıp boş")
+            return
+
+        for glob in globs:
+            entry = (rule.rank, rule, _glob_test(glob))
+            wildcard = _WILDCARDS.search(glob)
+            if wildcard is None:
+                self._by_name.setdefault(glob, []).append(entry)
+                continue
+            tail = glob[glob.rfind("*") + 1:] if "*" in glob else ""
+            if tail and not _WILDCARDS.search(tail) and "." in tail:
+                # '*.tar.gz' -> '.gz' kovası, tam kalıp aday üzerinde doğrulanır
+                self._by_ext.setdefault(tail[tail.rfind("."):], []).append(entry)
+            elif wildcard.start() > 0:
+                self._by_prefix.setdefault(glob[:wildcard.start()], []).append(entry)
+            else:
+                self._generic.append(entry)
+        self.rules.append(rule)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def targets(self) -> List[str]:
+        """Kuralların hedef klasör adları (organize_folder bunları kategori gibi atlar)."""
+        return [PurePath(rule.target).parts[0] for rule in self.rules]
+
+    def match(self, file) -> Optional[Rule]:
+        """Dosyaya (isim, Path veya FileInfo) uyan kazanan kuralı, yoksa None döner."""
+        if not self.rules:
+            return None
+        lname = (os.path.basename(file) if isinstance(file, str) else file.name).lower()
+
+        best = None
+        best_rank = None
+        buckets = [self._by_ext.get(os.path.splitext(lname)[1]), self._by_name.get(lname), self._generic]
+        for length in self._prefix_lengths:
+            if length > len(lname):
+                break
+            buckets.append(self._by_prefix.get(lname[:length]))
+
+        for bucket in buckets:
+            if not bucket:
+                continue
+            for rank, rule, test in bucket:
+                # Kova listeleri sıralı: bu kovada daha iyi aday kalmadı
+                if best_rank is not None and rank >= best_rank:
+                    break
+                if test(lname, file):
+                    best, best_rank = rule, rank
+                    break
+        return best
+
+
+def load_models(config=None) -> List[Dict]:
+    """config'deki modelleri değiştirilebilir sözlük listesi olarak döner (GUI için)."""
+    config = config if config is not None else load_config()
+    return [dict(model) for model in config.get("models", ())]
+
+
+def save_models(models: List[Dict]):
+    """Modelleri config.json'a yazar; çalışan Watcher/Organizer yeni kuralları hemen kullanır."""
+    save_config_value("models", [dict(model) for model in models])
+
+
+_cached_config = None
+_cached_engine: Optional[RuleEngine] = None
+_cache_lock = threading.Lock()
+
+
+def get_rule_engine(config=None) -> RuleEngine:
+    """Config anlık görüntüsü için derlenmiş kural motorunu döner (bkz. get_classifier)."""
+    global _cached_config, _cached_engine
+    config = config if config is not None else load_config()
+
+    with _cache_lock:
+        if _cached_config is not config:
+            _cached_engine = RuleEngine(config.get("models", ()))
+            _cached_config = config
+        return _cached_engine
+
@@ -0,0 +1,153 @@
+import os
+import stat
+from pathlib import Path
+from typing import Iterator, Optional
+
+# Henüz yazılmakta olan (indirme/geçici) dosyaların uzantıları
+TEMP_SUFFIXES = ('.tmp', '.crdownload', '.part')
+
+
+class FileInfo:
+    """
+    Tarama sırasında bir dosya için tutulan küçük kayıt.
+
+    os.scandir'in DirEntry nesnesinden oluşturulur; stat sonucu (size, mtime,
+    inode, dev) ilk erişimde bir kez alınıp saklanır. Filtreler ve taşıyıcılar
+    bu kaydı kullanarak dosyayı tekrar stat'lamaz.
+    """
+
+    __slots__ = ("path", "name", "is_dir", "_entry", "_size", "_mtime", "_mtime_ns", "_ctime", "_inode", "_dev")
+
+    def __init__(self, path, name: Optional[str] = None, is_dir: bool = False,
+                 entry: Optional[os.DirEntry] = None, stat_result: Optional[os.stat_result] = None):
+        self.path = Path(path)
+        self.name = name if name is not None else self.path.name
+        self.is_dir = is_dir
+        self._entry = entry
+        self._size = None
+        if stat_result is not None:
+            self._apply_stat(stat_result)
+
+    @classmethod
+    def from_path(cls, path) -> "FileInfo":
+        """Tek dosya için (Watcher vb.) tek bir os.stat ile kayıt oluşturur."""
+        st = os.stat(path)
+        return cls(path, is_dir=stat.S_ISDIR(st.st_mode), stat_result=st)
+
+    def _apply_stat(self, st: os.stat_result):
+        self._size = st.st_size
+        self._mtime = st.st_mtime
+        self._mtime_ns = st.st_mtime_ns
+        self._ctime = st.st_ctime
+        self._inode = st.st_ino
+        self._dev = st.st_dev
+        self._entry = None
+
+    def _load(self):
+        if self._size is None:
+            st = self._entry.stat() if self._entry is not None else os.stat(self.path)
+            self._apply_stat(st)
+
+    @property
+    def size(self) -> int:
+        self._load()
+        return self._size
+
+    @property
+    def mtime(self) -> float:
+        self._load()
+        return self._mtime
+
+    @property
+    def mtime_ns(self) -> int:
+        self._load()
+        return self._mtime_ns
+
+    @property
+    def ctime(self) -> float:
+        self._load()
+        return self._ctime
+
+    @property
+    def inode(self) -> int:
+        self._load()
+        return self._inode
+
+    @property
+    def dev(self) -> int:
+        self._load()
+        return self._dev
+
+    @property
+    def suffix(self) -> str:
+        return self.path.suffix
+
+    def __fspath__(self):
+        return str(self.path)
+
+    def __str__(self):
+        return str(self.path)
+
+    def __repr__(self):
+        return f"FileInfo({str(self.path)!r})"
+
+
+def as_file_info(file) -> FileInfo:
+    """Path/str gelirse FileInfo'ya çevirir, FileInfo ise aynen döner."""
+    if isinstance(file, FileInfo):
+        return file
+    return FileInfo.from_path(file)
+
+
+def is_ignored_name(name: str) -> bool:
+    """Geçici indirme dosyalarını ve rapor dosyalarını eler."""
+    if os.path.splitext(name)[1] in TEMP_SUFFIXES:
+        return True
+    # Rapor dosyalarını görmezden gel (Sonsuz döngüyü önlemek için)
+    return name == "report.txt" or (name.startswith("report_") and name.endswith(".txt"))
+
+
+def scan(directory, include_dirs: bool = False) -> Iterator[FileInfo]:
+    """
+    Klasörü os.scandir ile tarar ve her öğe için FileInfo üretir.
+    Stat bilgisi yalnızca ihtiyaç duyulduğunda (ör. boyut filtresi) alınır.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            try:
+                # is_file()/is_dir() çoğu sistemde d_type'tan gelir, ek syscall gerektirmez
+                if entry.is_file():
+                    yield FileInfo(entry.path, entry.name, False, entry=entry)
+                elif include_dirs and entry.is_dir():
+                    yield FileInfo(entry.path, entry.name, True, entry=entry)
+            except OSError:
+                # Tarama sırasında silinen öğeler
+                continue
+
+
+def walk(directory, max_depth: Optional[int] = None, exclude=()) -> Iterator[FileInfo]:
+    """
+    Klasörü alt klasörleriyle birlikte os.scandir ile tarar (yalnızca dosyalar).
+    max_depth: 0 sadece klasörün kendisi, None sınırsız. exclude içindeki
+    klasörlere (ör. kaynağın içindeki hedef klasör) girilmez. Sembolik
+    bağlantılı klasörler izlenmez.
+    """
+    excluded = {os.path.normcase(os.path.abspath(os.fspath(path))) for path in exclude}
+    stack = [(os.fspath(directory), 0)]
+    while stack:
+        current, depth = stack.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        yield FileInfo(entry.path, entry.name, False, entry=entry)
+                    elif (entry.is_dir(follow_symlinks=False)
+                          and (max_depth is None or depth < max_depth)
+                          and os.path.normcase(os.path.abspath(entry.path)) not in excluded):
+                        stack.append((entry.path, depth + 1))
+                except OSError:
+                    continue
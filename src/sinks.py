@@ -0,0 +1,35 @@
+import json
+import os
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+# Taşıma/arşivleme olayları zaten journal'a yazılır; bu hedef ek çıktı üretmez
+JOURNAL_SINK = "journal"
+
+
+def _json_line_writer(stream) -> Callable[[Dict], None]:
+    def write(detail: Dict):
+        stream.write(json.dumps(detail, ensure_ascii=False, separators=(",", ":")) + "\n")
+    return write
+
+
+@contextmanager
+def open_sink(target=None) -> Iterator[Optional[Callable[[Dict], None]]]:
+    """
+    Dosya bazlı detayların gönderileceği hedefi açar ve bir çağrılabilir döner.
+
+    target:
+        None veya "journal" -> ek çıktı yok (detaylar events.jsonl'de)
+        çağrılabilir        -> her detay için çağrılır
+        write() metodu olan -> JSON satırı olarak yazılır (açık dosya, sys.stdout...)
+        dosya yolu          -> JSON satırları dosyaya eklenir
+    """
+    if target is None or target == JOURNAL_SINK:
+        yield None
+    elif callable(target):
+        yield target
+    elif hasattr(target, "write"):
+        yield _json_line_writer(target)
+    else:
+        with open(os.fspath(target), "a", encoding="utf-8") as stream:
+            yield _json_line_writer(stream)
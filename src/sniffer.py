@@ -0,0 +1,245 @@
+import os
+import stat
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# Dosyanın yalnızca bu kadar baytı okunur (tar'ın 'ustar' işareti 257. baytta)
+SNIFF_BYTES = 512
+# Bir tarama boyunca içerik okumaya ayrılan en fazla bayt (0 = sınırsız)
+SCAN_BUDGET_BYTES = 16 * 1024 * 1024
+CACHE_SIZE = 65536
+
+# İmzalar 0. bayttan başlayan ilk iki bayta göre sözlükte gruplanır
+_KEY_LENGTH = 2
+
+
+def _riff(head: bytes) -> Optional[str]:
+    return {b"WEBP": ".webp", b"WAVE": ".wav", b"AVI ": ".avi"}.get(head[8:12])
+
+
+def _ftyp(head: bytes) -> str:
+    brand = head[8:12]
+    if brand == b"qt  ":
+        return ".mov"
+    if brand in (b"M4A ", b"M4B "):
+        return ".m4a"
+    if brand in (b"heic", b"heix", b"mif1", b"msf1"):
+        return ".heic"
+    if brand == b"avif":
+        return ".avif"
+    return ".mp4"
+
+
+def _zip(head: bytes) -> str:
+    # İlk üyenin adı ve (mimetype ise) içeriği ilk birkaç yüz baytta bulunur
+    if head[30:38] == b"mimetype":
+        if b"application/epub+zip" in head:
+            return ".epub"
+        for mime, ext in ((b"opendocument.text", ".odt"), (b"opendocument.spreadsheet", ".ods"),
+                          (b"opendocument.presentation", ".odp")):
+            if mime in head:
+                return ext
+    for marker, ext in ((b"word/", ".docx"), (b"xl/", ".xlsx"), (b"ppt/", ".pptx"),
+                        (b"AndroidManifest.xml", ".apk"), (b"META-INF/", ".jar")):
+        if marker in head:
+            return ext
+    return ".zip"
+
+
+def _ebml(head: bytes) -> str:
+    return ".webm" if b"webm" in head[:64] else ".mkv"
+
+
+def _shebang(head: bytes) -> str:
+    line = head.split(b"\n", 1)[0]
+    if b"python" in line:
+        return ".py"
+    if b"node" in line:
+        return ".js"
+    return ".sh"
+
+
+# (konum, sihirli baytlar, uzantı veya başlığa bakıp uzantı seçen fonksiyon)
+SIGNATURES: List[Tuple[int, bytes, object]] = [
+    (0, b"%PDF-", ".pdf"),
+    (0, b"\x89PNG\r\n\x1a\n", ".png"),
+    (0, b"\xff\xd8\xff", ".jpg"),
+    (0, b"GIF87a", ".gif"),
+    (0, b"GIF89a", ".gif"),
+    (0, b"II*\x00", ".tiff"),
+    (0, b"MM\x00*", ".tiff"),
+    (0, b"RIFF", _riff),
+    (4, b"ftyp", _ftyp),
+    (0, b"PK\x03\x04", _zip),
+    (0, b"PK\x05\x06", ".zip"),
+    (0, b"Rar!\x1a\x07", ".rar"),
+    (0, b"7z\xbc\xaf\x27\x1c", ".7z"),
+    (0, b"\x1f\x8b", ".gz"),
+    (0, b"BZh", ".bz2"),
+    (0, b"\xfd7zXZ\x00", ".xz"),
+    (257, b"ustar", ".tar"),
+    (0, b"\x7fELF", ".elf"),
+    (0, b"MZ", ".exe"),
+    (0, b"\xcf\xfa\xed\xfe", ".macho"),
+    (0, b"\xce\xfa\xed\xfe", ".macho"),
+    (0, b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", ".doc"),
+    (0, b"{\\rtf", ".rtf"),
+    (0, b"ID3", ".mp3"),
+    (0, b"\xff\xfb", ".mp3"),
+    (0, b"\xff\xf3", ".mp3"),
+    (0, b"\xff\xf2", ".mp3"),
+    (0, b"fLaC", ".flac"),
+    (0, b"OggS", ".ogg"),
+    (0, b"\x1a\x45\xdf\xa3", _ebml),
+    (0, b"\x30\x26\xb2\x75\x8e\x66\xcf\x11", ".wmv"),
+    (0, b"FLV\x01", ".flv"),
+    (0, b"#!", _shebang),
+    (0, b"<?xml", ".xml"),
+    (0, b"<!DOCTYPE html", ".html"),
+    (0, b"<!doctype html", ".html"),
+    (0, b"<html", ".html"),
+]
+
+# Uzantı config'deki tabloda yoksa kullanılacak kategori (config'de tanımlıysa)
+FALLBACK_CATEGORIES: Dict[str, str] = {
+    ".elf": "Executables", ".macho": "Executables",
+    ".webp": "Images", ".heic": "Images", ".avif": "Images",
+    ".epub": "Documents", ".ods": "Documents", ".odp": "Documents",
+    ".xz": "Archives", ".jar": "Archives",
+    ".webm": "Video", ".ogg": "Audio",
+}
+
+
+def _compile(signatures) -> Tuple[Dict[bytes, list], list]:
+    """İmzaları ilk iki bayta göre sözlüğe dizer; uzun imza önce denenir."""
+    by_prefix: Dict[bytes, list] = {}
+    offset_signatures = []
+    for offset, magic, result in signatures:
+        if offset == 0:
+            by_prefix.setdefault(magic[:_KEY_LENGTH], []).append((magic, result))
+        else:
+            offset_signatures.append((offset, magic, result))
+    for candidates in by_prefix.values():
+        candidates.sort(key=lambda entry: -len(entry[0]))
+    return by_prefix, offset_signatures
+
+
+_BY_PREFIX, _OFFSET_SIGNATURES = _compile(SIGNATURES)
+
+
+def sniff_bytes(head: bytes) -> Optional[str]:
+    """Dosya başından (en az SNIFF_BYTES önerilir) tahmin edilen uzantıyı döner; bilinmiyorsa None."""
+    for magic, result in _BY_PREFIX.get(head[:_KEY_LENGTH], ()):
+        if head.startswith(magic):
+            return result(head) if callable(result) else result
+    for offset, magic, result in _OFFSET_SIGNATURES:
+        if head[offset:offset + len(magic)] == magic:
+            return result(head) if callable(result) else result
+    return None
+
+
+class ContentSniffer:
+    """
+    Uzantısı olmayan veya bilinmeyen dosyaların türünü ilk baytlarından bulur.
+
+    Dosyanın ilk SNIFF_BYTES baytı okunur ve imza tablosunda aranır; bulunan
+    uzantı sınıflandırıcının tablosuyla kategoriye çevrilir. Sonuçlar
+    (cihaz, inode, mtime) anahtarıyla bellekte tutulur; aynı dosya tekrar
+    okunmaz. Her taramada en fazla budget_bytes okunur (begin_scan ile
+    sıfırlanır); bütçe bitince dosyalar okunmadan Others kalır.
+    """
+
+    def __init__(self, read_bytes: int = SNIFF_BYTES, budget_bytes: int = SCAN_BUDGET_BYTES,
+                 cache_size: int = CACHE_SIZE):
+        self.read_bytes = max(_KEY_LENGTH, int(read_bytes))
+        self.budget_bytes = max(0, int(budget_bytes))
+        self.cache_size = max(1, int(cache_size))
+        self._cache: "OrderedDict[tuple, Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._remaining = self.budget_bytes
+        self.reads = 0
+        self.cache_hits = 0
+        self.skipped = 0
+
+    @classmethod
+    def from_config(cls, config) -> Optional["ContentSniffer"]:
+        """config'de content_sniffing.enabled ise sniffer, değilse None döner."""
+        settings = config.get("content_sniffing", {})
+        if not settings.get("enabled", False):
+            return None
+        return cls(
+            read_bytes=settings.get("read_bytes", SNIFF_BYTES),
+            budget_bytes=int(settings.get("scan_budget_mb", SCAN_BUDGET_BYTES / (1024 * 1024)) * 1024 * 1024),
+            cache_size=settings.get("cache_size", CACHE_SIZE),
+        )
+
+    def begin_scan(self):
+        """Yeni bir tarama için okuma bütçesini yeniler."""
+        with self._lock:
+            self._remaining = self.budget_bytes
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if not self.budget_bytes:
+                return True
+            if self._remaining < self.read_bytes:
+                self.skipped += 1
+                return False
+            self._remaining -= self.read_bytes
+            return True
+
+    def _key(self, file) -> Optional[tuple]:
+        # FileInfo taramadan gelen stat'ı kullanır; diğerleri için tek bir stat
+        if hasattr(file, "mtime_ns"):
+            if file.is_dir:
+                return None
+            dev, inode, mtime_ns = file.dev, file.inode, file.mtime_ns
+        else:
+            st = os.stat(file)
+            if not stat.S_ISREG(st.st_mode):
+                return None
+            dev, inode, mtime_ns = st.st_dev, st.st_ino, st.st_mtime_ns
+        # inode bilinmiyorsa (ör. Windows'ta DirEntry) yol kullanılır
+        return (dev, inode, mtime_ns) if inode else (os.fspath(file), mtime_ns)
+
+    def extension_of(self, file) -> Optional[str]:
+        """Dosyanın içeriğine göre uzantısı ('.pdf' gibi); bilinmiyor/okunamıyorsa None."""
+        try:
+            key = self._key(file)
+        except OSError:
+            return None
+        if key is None:
+            return None
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return self._cache[key]
+        if not self._take_budget():
+            return None
+        try:
+            with open(file, "rb") as f:
+                head = f.read(self.read_bytes)
+        except OSError:
+            return None
+        ext = sniff_bytes(head)
+        with self._lock:
+            self.reads += 1
+            self._cache[key] = ext
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return ext
+
+    def category_of(self, file, table: Dict[str, str], categories) -> Optional[str]:
+        """İçerikten bulunan uzantının kategorisi (uzantı tablosu, sonra FALLBACK_CATEGORIES)."""
+        ext = self.extension_of(file)
+        if ext is None:
+            return None
+        category = table.get(ext)
+        if category is None:
+            category = FALLBACK_CATEGORIES.get(ext)
+            if category not in categories:
+                return None
+        return category
+
@@ -0,0 +1,205 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+def can_open_exclusively(path: str) -> bool:
+    """
+    Dosyanın başka bir süreç tarafından yazılmak üzere tutulmadığını kontrol eder.
+    Windows'ta yazma modunda açma, paylaşım ihlalinde başarısız olur. POSIX'te
+    fcntl.flock ile (yazan süreç de kilit kullanıyorsa) denetlenir. Kontrol
+    yapılamıyorsa True döner.
+    """
+    if os.name == "nt":
+        if not os.access(path, os.W_OK):
+            return True  # Salt okunur dosya: kontrol edilemez
+        try:
+            fd = os.open(path, os.O_RDWR)
+        except PermissionError:
+            return False
+        except OSError:
+            return True
+        os.close(fd)
+        return True
+
+    if fcntl is None:
+        return True
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return True
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        return True
+    except BlockingIOError:
+        return False
+    except OSError:
+        return True
+    finally:
+        os.close(fd)
+
+
+class _Pending:
+    """Takip edilen bir dosyanın durumu."""
+
+    __slots__ = ("signature", "unchanged_since", "interval", "generation")
+
+    def __init__(self, interval: float):
+        self.signature = None         # (st_size, st_mtime_ns)
+        self.unchanged_since = 0.0    # imza ilk görüldüğünde (monotonic)
+        self.interval = interval      # dosya değişirken kullanılan yoklama aralığı
+        self.generation = 0
+
+
+class StabilityTracker:
+    """
+    Yazımı süren dosyaları izleyip, sessiz kaldıklarında organizatöre verir.
+
+    Dosyanın boyutu ve mtime'ı stable_seconds boyunca değişmediğinde (ve
+    mümkünse özel olarak açılabildiğinde) on_stable(path) çağrılır. Dosya
+    değişmeye devam ettikçe yoklama aralığı üstel olarak büyür (backoff),
+    böylece büyük indirmeler sık stat'lanmaz; küçük dosyalar ise tek bir
+    stable_seconds aralığından sonra geçer. Tüm bekleyen dosyalar tek bir thread ve tek bir zaman
+    yığını (heap) ile izlenir.
+    """
+
+    def __init__(self, on_stable: Callable[[str], None], logger, stable_seconds: float = 1.0,
+                 min_interval: float = 0.05, max_interval: float = 5.0, backoff: float = 2.0,
+                 exclusive_check: bool = True):
+        self.on_stable = on_stable
+        self.logger = logger
+        self.stable_seconds = stable_seconds
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.exclusive_check = exclusive_check
+
+        self._pending: Dict[str, _Pending] = {}
+        self._heap = []  # (zaman, sıra, yol, nesil)
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    # ------------------------------------------------------------------
+    # Dış API
+    # ------------------------------------------------------------------
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="stability-tracker", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def track(self, path: str):
+        """
+        Dosyayı takibe alır. Zaten takipteyse olay birleştirilir: mevcut kontrol
+        planı korunur, değişiklik bir sonraki stat'ta zaten görülür.
+        """
+        with self._cond:
+            if path in self._pending:
+                return
+            state = _Pending(self.min_interval)
+            self._pending[path] = state
+            self._schedule(path, state, self.min_interval)
+
+    def untrack(self, path: str):
+        with self._cond:
+            self._pending.pop(path, None)
+
+    def is_tracked(self, path: str) -> bool:
+        return path in self._pending
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    # ------------------------------------------------------------------
+    # İç işleyiş
+    # ------------------------------------------------------------------
+    def _schedule(self, path: str, state: _Pending, delay: float):
+        # Eski heap kayıtları nesil numarasıyla geçersiz kılınır (lazy delete)
+        state.generation += 1
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._sequence), path, state.generation))
+        self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    due = self._heap[0][0] - time.monotonic()
+                    if due > 0:
+                        self._cond.wait(due)
+                        continue
+                    break
+                if not self._running:
+                    return
+                _, _, path, generation = heapq.heappop(self._heap)
+                state = self._pending.get(path)
+                if state is None or state.generation != generation:
+                    continue
+
+            # stat ve açma denemesi kilit dışında yapılır
+            delay = self._check(path, state)
+
+            with self._cond:
+                if self._pending.get(path) is not state or state.generation != generation:
+                    continue
+                if delay is None:
+                    del self._pending[path]
+                else:
+                    self._schedule(path, state, delay)
+                    continue
+
+            if os.path.exists(path):
+                try:
+                    self.on_stable(path)
+                except Exception as e:
+                    self.logger.error(f"HATA | {path} kuyruğa alınamadı: {e}")
+
+    def _check(self, path: str, state: _Pending) -> Optional[float]:
+        """Dosya hazırsa (veya silinmişse) None, değilse bir sonraki kontrol gecikmesini döner."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None  # Silindi/yeniden adlandırıldı: on_stable'a exists() karar verir
+
+        now = time.monotonic()
+        signature = (st.st_size, st.st_mtime_ns)
+        still_writing = state.signature is not None and signature != state.signature
+        if signature != state.signature:
+            state.signature = signature
+            state.unchanged_since = now
+
+        # Ne kadar süredir sessiz? Yalnızca gözlenen süre sayılır: mtime eski olsa
+        # da (ör. kopyalanırken korunmuş) en az bir stable_seconds aralığı boyunca
+        # imzanın değişmediği görülmelidir, ilk stat tek başına yeterli değildir
+        quiet_for = now - state.unchanged_since
+        if quiet_for < self.stable_seconds:
+            if still_writing:
+                # Dosya hâlâ yazılıyor: bir sonraki kontrolü seyrekleştir
+                state.interval = min(state.interval * self.backoff, self.max_interval)
+                return state.interval
+            return max(self.min_interval, self.stable_seconds - quiet_for)
+
+        if self.exclusive_check and not can_open_exclusively(path):
+            state.interval = min(state.interval * self.backoff, self.max_interval)
+            return state.interval
+        return None
@@ -1,27 +1,118 @@
+import os
+import threading
 import time
 from pathlib import Path
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
-from config_loader import load_config
+from config_loader import load_config, config_service
 from organizer import Organizer
 from logger import get_logger
+from reporter import flush_report
+from scanner import is_ignored_name, scan
+from work_queue import OrganizeQueue
+from stability import StabilityTracker
+from metadata_index import get_metadata_index
+
+# Kuyruk metriklerinin loglanma aralığı (saniye)
+METRICS_LOG_INTERVAL = 30
+
+# Organizatörün ürettiği yolların olaylarının yok sayılacağı süre (saniye)
+PRODUCED_TTL = 10
+
+
+class RecentPaths:
+    """Süreli (TTL) yol kümesi: organizatörün kendi ürettiği dosyaları hatırlar."""
+    def __init__(self, ttl_seconds: float = PRODUCED_TTL):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._paths = {}  # yol -> son geçerlilik (monotonic)
+
+    def add(self, path):
+        now = time.monotonic()
+        with self._lock:
+            # Süresi dolanları ara sıra temizle
+            if len(self._paths) > 1024:
+                self._paths = {p: t for p, t in self._paths.items() if t > now}
+            self._paths[os.path.normcase(str(path))] = now + self.ttl_seconds
+
+    def __contains__(self, path) -> bool:
+        key = os.path.normcase(str(path))
+        with self._lock:
+            expires = self._paths.get(key)
+            if expires is None:
+                return False
+            if expires < time.monotonic():
+                del self._paths[key]
+                return False
+            return True
+
 
 class OrganizationHandler(FileSystemEventHandler):
-    """Event handler that triggers organization on file creation."""
-    def __init__(self, organizer):
-        self.organizer = organizer
+    """
+    Event handler that hands files to the stability tracker.
+
+    created/modified/moved olayları yol bazında birleştirilir (tracker aynı
+    yolu bir kez izler); indirme geçici adları (.crdownload, .part) son
+    adlarına yeniden adlandırılınca takip edilir; organizatörün ürettiği
+    yollar ve izlenen klasör dışındaki (ör. kategori alt klasörü) yollar
+    yok sayılır.
+    """
+    def __init__(self, tracker, directory, produced: RecentPaths):
+        self.tracker = tracker
+        self.directory = os.path.normcase(os.path.abspath(directory))
+        self.produced = produced
         self.logger = get_logger()
 
+    def _accepts(self, path) -> bool:
+        if os.path.normcase(os.path.dirname(os.path.abspath(path))) != self.directory:
+            return False
+        if is_ignored_name(os.path.basename(path)):
+            return False  # Geçici ad: yeniden adlandırılınca (on_moved) ele alınır
+        return path not in self.produced
+
+    def _track(self, path):
+        if not self._accepts(path):
+            return
+        self.logger.info(f"YENİ DOSYA TESPİT EDİLDİ: {path}")
+        print(f"\nAlgılandı: {Path(path).name}")
+        # Yazım bitince tracker dosyayı işçi kuyruğuna verir (olay thread'i bloklanmaz)
+        self.tracker.track(path)
+
     def on_created(self, event):
         if event.is_directory:
             return
-            
-        self.logger.info(f"YENİ DOSYA TESPİT EDİLDİ: {event.src_path}")
-        print(f"\nAlgılandı: {Path(event.src_path).name}")
-        
-        time.sleep(1) # Wait for file write to complete
-        
-        self.organizer.organize_file(event.src_path)
+        self._track(event.src_path)
+
+    def on_modified(self, event):
+        if event.is_directory:
+            return
+        # Zaten takipteki dosyalar için ek iş yok (olay birleştirilir)
+        if self.tracker.is_tracked(event.src_path):
+            return
+        self._track(event.src_path)
+
+    def on_moved(self, event):
+        if event.is_directory:
+            return
+        # Eski ad artık yok; yeni adı (ör. indirme tamamlandı) takip et
+        self.tracker.untrack(event.src_path)
+        self._forget(event.src_path)
+        self._track(event.dest_path)
+
+    def on_deleted(self, event):
+        if event.is_directory:
+            return
+        self.tracker.untrack(event.src_path)
+        self._forget(event.src_path)
+
+    def _forget(self, path):
+        # Meta veri indeksi (etkinse) silinen/yeniden adlandırılan dosyayı unutur
+        index = get_metadata_index()
+        if index is not None:
+            try:
+                index.remove(path)
+            except Exception as e:
+                self.logger.error(f"HATA | Meta veri indeksi güncellenemedi: {e}")
 
 class Watcher:
     """Main Watcher class that handles scanning and monitoring."""
@@ -29,7 +120,38 @@ class Watcher:
         self.directory = Path(directory)
         self.organizer = Organizer()
         self.observer = Observer()
-        self.handler = OrganizationHandler(self.organizer)
+
+        monitoring = self.organizer.config.get("monitoring", {})
+        self.work_queue = OrganizeQueue(
+            self.organizer.organize_file,
+            get_logger(),
+            workers=monitoring.get("workers", 4),
+            max_size=monitoring.get("queue_size", 1000),
+            enqueue_timeout=monitoring.get("enqueue_timeout", 30.0),
+        )
+        # Sabit 1 sn bekleme yerine: boyut/mtime sessizleşince kuyruğa ver
+        self.tracker = StabilityTracker(
+            self.work_queue.submit,
+            get_logger(),
+            stable_seconds=monitoring.get("stable_seconds", 1.0),
+            min_interval=monitoring.get("poll_min_interval", 0.05),
+            max_interval=monitoring.get("poll_max_interval", 5.0),
+            exclusive_check=monitoring.get("exclusive_check", True),
+        )
+        self.produced = RecentPaths()
+        self.organizer.move_listeners.append(self._on_file_moved)
+        self.handler = OrganizationHandler(self.tracker, self.directory, self.produced)
+
+    def _on_file_moved(self, plan, destination_path):
+        # Kendi taşımalarımızın ürettiği olaylar yeniden işlenmesin
+        self.produced.add(destination_path)
+
+    def _on_config_reload(self, config):
+        """config.json değiştiğinde yeni kuralları yeniden başlatmadan uygular."""
+        self.organizer.apply_config(config)
+        self.handler.logger.info("CONFIG YENİDEN YÜKLENDİ | Yeni kurallar uygulandı")
+        if Path(config["source_directory"]) != self.directory:
+            print("Uyarı: source_directory değişikliği için izlemeyi yeniden başlatın.")
 
     def scan_existing(self):
         """Scans and organizes existing files in the directory."""
@@ -37,11 +159,14 @@ class Watcher:
             return
 
         print(f"--- Mevcut Dosyalar Taranıyor: {self.directory} ---")
-        count = 0
-        for item in self.directory.iterdir():
-            if item.is_file():
-                if self.organizer.organize_file(item):
-                    count += 1
+        # scan_directory ile aynı yol: içerik önbelleği sıfırlanır, kopyalar elenir
+        self.organizer.classifier.begin_scan()
+        plans = (self.organizer.plan_file(item) for item in scan(self.directory))
+        plans = self.organizer.dedup.filter_plans((p for p in plans if p is not None), self.organizer.dest_dir,
+                                                names=self.organizer.mover.names)
+        stats = self.organizer.mover.run(plans, collect_details=False)
+        count = stats["moved"]
+        flush_report()
         print(f"--- Tarama Tamamlandı. Düzenlenen: {count} ---")
 
     def start(self):
@@ -54,22 +179,49 @@ class Watcher:
         self.scan_existing()
 
         # 2. Start Monitoring
+        self.work_queue.start()
+        self.tracker.start()
         self.observer.schedule(self.handler, str(self.directory), recursive=False)
         self.observer.start()
+        config_service.subscribe(self._on_config_reload)
 
         print(f"İzleme başlatıldı (Kaynak: {self.directory})")
         print("Watcher modu aktif... Durdurmak için Ctrl+C")
         
+        last_metrics = time.monotonic()
         try:
             while True:
                 time.sleep(1)
+                # config.json değiştiyse yeniden yükle (sadece stat maliyeti)
+                config_service.refresh()
+
+                if time.monotonic() - last_metrics >= METRICS_LOG_INTERVAL:
+                    last_metrics = time.monotonic()
+                    self._log_metrics()
         except KeyboardInterrupt:
             self.stop()
 
+    def _log_metrics(self):
+        stats = self.work_queue.stats()
+        if stats["enqueued"] or stats["depth"]:
+            self.handler.logger.info(
+                f"KUYRUK | derinlik: {stats['depth']} (en fazla {stats['max_depth']}) | "
+                f"yazımı süren: {self.tracker.pending_count()} | "
+                f"işlenen: {stats['processed']} | düzenlenen: {stats['organized']} | "
+                f"hata: {stats['failed']} | düşürülen: {stats['dropped']} | "
+                f"birleştirilen: {stats['coalesced']}"
+            )
+
     def stop(self):
         print("\nİzleme durduruluyor...")
+        config_service.unsubscribe(self._on_config_reload)
         self.observer.stop()
         self.observer.join()
+        self.tracker.stop()
+        # Kuyrukta bekleyen dosyaları bitir
+        self.work_queue.stop()
+        self._log_metrics()
+        flush_report()
 
 def start_watching():
     """Entry point used by main.py."""
@@ -0,0 +1,119 @@
+import queue
+import threading
+import time
+from typing import Callable, Dict
+
+
+class OrganizeQueue:
+    """
+    Watcher olayları için sınırlı kuyruk ve işçi havuzu.
+
+    Olay işleyici (watchdog thread'i) sadece yolu kuyruğa ekler; bekleme ve
+    organize etme işçi thread'lerinde yapılır. Kuyruk doluysa ekleme
+    enqueue_timeout kadar bekler (geri basınç); süre dolarsa olay düşürülür
+    ve dosya bir sonraki taramada ele alınır. Kuyrukta veya işlenmekte olan
+    bir yol tekrar eklenmez (bir dosya için tek organize denemesi).
+    """
+
+    def __init__(self, process: Callable[[str], bool], logger, workers: int = 4,
+                 max_size: int = 1000, settle_seconds: float = 0.0, enqueue_timeout: float = 30.0):
+        self.process = process
+        self.logger = logger
+        self.workers = max(1, workers)
+        self.settle_seconds = settle_seconds
+        self.enqueue_timeout = enqueue_timeout
+        self.queue = queue.Queue(maxsize=max(1, max_size))
+
+        self._threads = []
+        self._active = set()  # kuyrukta bekleyen veya işlenen yollar
+        self._metrics_lock = threading.Lock()
+        self.metrics = {
+            "enqueued": 0,
+            "processed": 0,
+            "organized": 0,
+            "failed": 0,
+            "dropped": 0,
+            "coalesced": 0,
+            "max_depth": 0,
+        }
+
+    def start(self):
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"organize-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, path: str) -> bool:
+        """Yolu kuyruğa ekler. Kuyruk dolu kalırsa False döner (olay düşürüldü)."""
+        with self._metrics_lock:
+            if path in self._active:
+                self.metrics["coalesced"] += 1
+                return True
+            self._active.add(path)
+        try:
+            self.queue.put((path, time.monotonic()), timeout=self.enqueue_timeout)
+        except queue.Full:
+            with self._metrics_lock:
+                self._active.discard(path)
+            self._count("dropped")
+            self.logger.warning(f"KUYRUK DOLU | Olay düşürüldü: {path}")
+            return False
+
+        depth = self.queue.qsize()
+        with self._metrics_lock:
+            self.metrics["enqueued"] += 1
+            if depth > self.metrics["max_depth"]:
+                self.metrics["max_depth"] = depth
+        return True
+
+    def _count(self, key: str):
+        with self._metrics_lock:
+            self.metrics[key] += 1
+
+    def _worker(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                path, enqueued_at = item
+
+                # İsteğe bağlı ek bekleme (StabilityTracker kullanılıyorsa gerekmez)
+                remaining = enqueued_at + self.settle_seconds - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+
+                try:
+                    if self.process(path):
+                        self._count("organized")
+                except Exception as e:
+                    self._count("failed")
+                    self.logger.error(f"HATA | {path} işlenemedi: {e}")
+                with self._metrics_lock:
+                    self._active.discard(path)
+                self._count("processed")
+            finally:
+                self.queue.task_done()
+
+    def stats(self) -> Dict:
+        """Kuyruk derinliği dahil anlık metrikler."""
+        with self._metrics_lock:
+            stats = dict(self.metrics)
+        stats["depth"] = self.queue.qsize()
+        stats["workers"] = self.workers
+        return stats
+
+    def stop(self, drain: bool = True):
+        """İşçileri durdurur; drain=True ise kuyruktaki işler önce tamamlanır."""
+        if not drain:
+            try:
+                while True:
+                    self.queue.get_nowait()
+                    self.queue.task_done()
+            except queue.Empty:
+                pass
+        for _ in self._threads:
+            self.queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+import config_loader  # noqa: E402
+
+
+@pytest.fixture
+def make_config(tmp_path, monkeypatch):
+    """
+    config.json'u geçici klasörlere yönlendirir; load_config() bu anlık
+    görüntüyü döner. Üst düzey anahtarlar overrides ile değiştirilebilir.
+    """
+    def make(**overrides):
+        config = config_loader._parse_config(config_loader.CONFIG_FILE_PATH)
+        logs = tmp_path / "logs"
+        logs.mkdir(exist_ok=True)
+        config["source_directory"] = str(tmp_path / "in")
+        config["destination_directory"] = str(tmp_path / "out")
+        config["log_console"] = False
+        for key in ("log_file_path", "journal_file_path", "rollup_file_path",
+                    "metadata_index_path", "dedup_cache_path"):
+            config[key] = str(logs / Path(config.get(key, key)).name)
+        config.update(overrides)
+        (tmp_path / "in").mkdir(exist_ok=True)
+        (tmp_path / "out").mkdir(exist_ok=True)
+        snapshot = config_loader._freeze(config)
+        monkeypatch.setattr(config_loader.config_service, "get", lambda: snapshot)
+        # report.txt çalışma klasörüne yazılır
+        monkeypatch.chdir(tmp_path)
+        return snapshot
+    return make
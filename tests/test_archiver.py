@@ -0,0 +1,51 @@
+import os
+import zipfile
+
+from archiver import ParallelZipWriter
+
+
+def _members(tmp_path, names):
+    paths = []
+    for name in names:
+        path = tmp_path / name
+        path.write_bytes(os.urandom(2000) + b"a" * 6000)
+        paths.append(path)
+    return paths
+
+
+def _write(archive, paths, mode):
+    with ParallelZipWriter(archive, workers=2, mode=mode) as writer:
+        for member in writer.write_members((path, path.name) for path in paths):
+            assert member.error is None
+
+
+def test_append_rewrites_the_central_directory_in_place(tmp_path):
+    paths = _members(tmp_path, [f"dosya_{i}.txt" for i in range(6)])
+    appended = tmp_path / "eklenen.zip"
+    _write(appended, paths[:2], "overwrite")
+    _write(appended, paths[2:4], "append")
+    _write(appended, paths[4:], "append")
+
+    with zipfile.ZipFile(appended) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == [path.name for path in paths]
+        for path in paths:
+            assert archive.read(path.name) == path.read_bytes()
+
+    # Eski dizinlerin ölü kopyaları kalmaz: tek seferde yazılan arşivle aynı boyut
+    fresh = tmp_path / "tek.zip"
+    _write(fresh, paths, "overwrite")
+    assert appended.stat().st_size == fresh.stat().st_size
+
+
+def test_append_without_new_members_keeps_archive_valid(tmp_path):
+    paths = _members(tmp_path, ["a.txt", "b.txt"])
+    archive_path = tmp_path / "arsiv.zip"
+    _write(archive_path, paths, "overwrite")
+    size = archive_path.stat().st_size
+
+    _write(archive_path, [], "append")
+    assert archive_path.stat().st_size == size
+    with zipfile.ZipFile(archive_path) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == ["a.txt", "b.txt"]
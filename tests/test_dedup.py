@@ -0,0 +1,124 @@
+import os
+
+import pytest
+
+from dedup import Deduplicator
+from metadata_index import get_metadata_index
+from organizer import Organizer
+
+CONTENT = b"ayni icerik " * 1000
+
+
+def _write(path, data=CONTENT):
+    path.write_bytes(data)
+    return path
+
+
+def _organizer(make_config, action, **overrides):
+    config = make_config(dedup={"enabled": True, "action": action}, models=[], **overrides)
+    return Organizer(jobs=1), config
+
+
+def _files(folder):
+    return sorted(p.name for p in folder.iterdir()) if folder.exists() else []
+
+
+def test_skip_leaves_duplicate_in_source(make_config, tmp_path):
+    organizer, _ = _organizer(make_config, "skip")
+    _write(tmp_path / "in" / "a.txt")
+    _write(tmp_path / "in" / "b.txt")
+    organizer.scan_directory()
+
+    assert len(_files(tmp_path / "out" / "Documents")) == 1
+    assert len(_files(tmp_path / "in")) == 1
+
+
+def test_move_sends_duplicate_to_duplicates_folder(make_config, tmp_path):
+    organizer, _ = _organizer(make_config, "move")
+    _write(tmp_path / "in" / "a.txt")
+    _write(tmp_path / "in" / "b.txt")
+    _write(tmp_path / "in" / "c.txt", b"farkli")
+    organizer.scan_directory()
+
+    assert _files(tmp_path / "in") == []
+    assert len(_files(tmp_path / "out" / "Documents")) == 2
+    assert len(_files(tmp_path / "out" / "Duplicates")) == 1
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_hardlink_with_original_in_same_batch(make_config, tmp_path, jobs):
+    make_config(dedup={"enabled": True, "action": "hardlink"}, models=[])
+    organizer = Organizer(jobs=jobs)
+    for name in ("a.txt", "b.txt", "c.txt"):
+        _write(tmp_path / "in" / name)
+    # Taramada ilk gelen dosya en eskisi olsun: asılın planı kopyalarınkinden önce verilir
+    listed = [entry.path for entry in os.scandir(tmp_path / "in")]
+    for age, path in enumerate(listed):
+        os.utime(path, (1000 + age, 1000 + age))
+    organizer.scan_directory()
+
+    target = tmp_path / "out" / "Documents"
+    assert _files(tmp_path / "in") == []
+    assert _files(target) == ["a.txt", "b.txt", "c.txt"]
+    inodes = {os.stat(target / name).st_ino for name in _files(target)}
+    assert len(inodes) == 1
+
+
+def test_hardlink_with_original_in_destination(make_config, tmp_path):
+    organizer, _ = _organizer(make_config, "hardlink")
+    target = tmp_path / "out" / "Documents"
+    target.mkdir(parents=True)
+    original = _write(target / "a.txt")
+    source = _write(tmp_path / "in" / "a.txt")
+
+    assert organizer.organize_file(source) is False
+    assert not source.exists()
+    assert _files(target) == ["a.txt", "a_1.txt"]
+    assert os.stat(target / "a_1.txt").st_ino == os.stat(original).st_ino
+
+
+def test_hardlink_failure_keeps_source(make_config, tmp_path, monkeypatch):
+    organizer, _ = _organizer(make_config, "hardlink")
+    target = tmp_path / "out" / "Documents"
+    target.mkdir(parents=True)
+    _write(target / "a.txt")
+    source = _write(tmp_path / "in" / "b.txt")
+
+    def refuse(*args, **kwargs):
+        raise PermissionError(1, "link desteklenmiyor")
+
+    monkeypatch.setattr(os, "link", refuse)
+    organizer.organize_file(source)
+    assert source.exists()
+    assert _files(target) == ["a.txt"]
+
+
+def test_skip_keeps_metadata_index_row(make_config, tmp_path):
+    organizer, _ = _organizer(make_config, "skip", metadata_index={"enabled": True})
+    _write(tmp_path / "in" / "a.txt")
+    _write(tmp_path / "in" / "b.txt")
+    index = get_metadata_index()
+    index.reconcile(tmp_path / "in")
+    organizer.scan_directory()
+
+    remaining = [str(tmp_path / "in" / name) for name in _files(tmp_path / "in")]
+    assert len(remaining) == 1
+    assert index.query(tmp_path / "in") == remaining
+
+
+def test_hash_cache_is_reused(make_config, tmp_path):
+    config = make_config(dedup={"enabled": True, "action": "skip"})
+    folder = tmp_path / "in"
+    files = [_write(folder / f"{i}.bin", CONTENT * 30) for i in range(3)]
+    _write(folder / "other.bin", b"x" * len(CONTENT * 30))
+
+    first = Deduplicator(config)
+    assert len(first.find(files + [folder / "other.bin"])) == 2
+    assert first.last_stats["hashed_full"] == 3
+    assert first.last_stats["cache_hits"] == 0
+
+    second = Deduplicator(config)
+    assert len(second.find(files + [folder / "other.bin"])) == 2
+    assert second.last_stats["hashed_edge"] == 0
+    assert second.last_stats["hashed_full"] == 0
+    assert second.last_stats["cache_hits"] > 0
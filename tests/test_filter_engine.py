@@ -0,0 +1,20 @@
+import os
+
+import pytest
+
+from filter_engine import FilterEngine
+from scanner import scan
+
+
+@pytest.mark.parametrize("archive_name", ["arsiv.zip", "arsiv.tar.gz"])
+def test_archived_members_are_classified_by_content(make_config, tmp_path, archive_name):
+    make_config(content_sniffing={"enabled": True, "read_bytes": 512, "scan_budget_mb": 0})
+    (tmp_path / "in" / "belge").write_bytes(b"%PDF-1.7\n" + os.urandom(512))
+    (tmp_path / "in" / "resim").write_bytes(b"\x89PNG\r\n\x1a\n" + os.urandom(512))
+
+    details = []
+    stats = FilterEngine().archive_folders(list(scan(tmp_path / "in")), archive_name, details.append)
+
+    assert stats["archived"] == 2
+    assert list(scan(tmp_path / "in")) == []
+    assert {d["file"]: d["category"] for d in details} == {"belge": "Documents", "resim": "Images"}
@@ -0,0 +1,31 @@
+import pytest
+
+from filter_expr import FilterExpressionError, _tokenize
+
+
+def _terms(text):
+    return [(kind, value) for kind, value, _ in _tokenize(text)]
+
+
+@pytest.mark.parametrize("text", ["cat:Images, Documents", "cat:Images,Documents",
+                                  "cat:Images , Documents", "cat:Images ,Documents"])
+def test_comma_list_survives_spaces(text):
+    assert _terms(text) == [("term", "cat:Images,Documents")]
+
+
+def test_comma_before_another_field_is_or():
+    assert _terms("ext:png, name:x*") == [("term", "ext:png,"), ("or", ","), ("term", "name:x*")]
+
+
+def test_bare_glob_list_is_or():
+    assert _terms("*.jpg, *.png") == [("term", "name:*.jpg"), ("or", ","), ("term", "name:*.png")]
+
+
+def test_list_continues_then_next_condition_is_and():
+    assert _terms("ext:jpg, png size>1m") == [("term", "ext:jpg,png"), ("term", "size>1m")]
+
+
+@pytest.mark.parametrize("text", ["cat:Images,", "cat:Images, (name:x)", "cat:Images, or name:x"])
+def test_trailing_comma_is_an_error(text):
+    with pytest.raises(FilterExpressionError):
+        _tokenize(text)
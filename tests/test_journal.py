@@ -0,0 +1,46 @@
+import time
+
+import journal
+
+LEGACY_LOG = """\
+2025-01-02 10:00:00,123 - INFO - TASINDI | Images | a.png -> a.png
+2025-01-02 10:00:01,000 - INFO - Başka bir satır
+2025-01-02 10:00:02,500 - INFO - FİLTRE TASINDI | Documents | b.pdf -> b_1.pdf
+2025-01-02 10:00:03,000 - INFO - KLASÖR TASINDI | folders | proje -> proje
+2025-01-02 10:00:04,000 - ERROR - HATA | c.txt taşınamadı: erişim
+"""
+
+
+def test_new_journal_is_backfilled_from_legacy_log(make_config, tmp_path):
+    config = make_config()
+    current = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time() + 60))
+    with open(config["log_file_path"], "w", encoding="utf-8") as f:
+        f.write(LEGACY_LOG)
+        # Bu süreçte yazılmış satır journal'a zaten kaydedilir, aktarılmaz
+        f.write(f"{current},000 - INFO - TASINDI | Images | yeni.png -> yeni.png\n")
+
+    events = list(journal.iter_journal(journal.get_journal().path))
+    assert [(e["op"], e["category"], e["destination"]) for e in events] == [
+        ("move", "Images", "a.png"),
+        ("filter_move", "Documents", "b_1.pdf"),
+        ("folder_move", "folders", "proje"),
+    ]
+    assert events[0]["ts"] == round(time.mktime((2025, 1, 2, 10, 0, 0, 0, 0, -1)) + 0.123, 3)
+
+    # Özet deposu journal'dan dolar
+    totals = journal.get_journal().rollup.totals_by("op", events[0]["ts"], events[-1]["ts"] + 1)
+    assert {op: v["files"] for op, v in totals.items()} == {"move": 1, "filter_move": 1, "folder_move": 1}
+
+
+def test_existing_journal_is_not_backfilled_again(make_config):
+    config = make_config()
+    with open(config["log_file_path"], "w", encoding="utf-8") as f:
+        f.write(LEGACY_LOG)
+    first = journal.get_journal()
+    first.record("move", "Images", "/in/x.png", "/out/x.png")
+    first.flush()
+    first.close()
+    journal._journal = None
+
+    events = list(journal.iter_journal(journal.get_journal().path))
+    assert len(events) == 4
@@ -0,0 +1,53 @@
+import errno
+import os
+
+import pytest
+
+import mover
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "kaynak.bin"
+    path.write_bytes(os.urandom(3 * 1024 * 1024 + 17))
+    return path
+
+
+def _copy(source, destination):
+    with open(source, "rb") as fin, open(destination, "wb") as fout:
+        return mover._copy_data(fin.fileno(), fout.fileno(), os.fstat(fin.fileno()).st_size, None)
+
+
+def test_early_zero_from_fast_copy_falls_back_to_read_write(tmp_path, source, monkeypatch):
+    monkeypatch.setattr(mover, "COPY_CHUNK", 1024 * 1024)
+    real = getattr(os, "copy_file_range", None)
+    calls = []
+
+    def stalls_after_first_chunk(fd_in, fd_out, count):
+        calls.append(count)
+        return real(fd_in, fd_out, count) if len(calls) == 1 and real else 0
+
+    monkeypatch.setattr(os, "copy_file_range", stalls_after_first_chunk, raising=False)
+    monkeypatch.setattr(os, "sendfile", lambda *args: 0, raising=False)
+
+    destination = tmp_path / "hedef.bin"
+    assert _copy(source, destination) == source.stat().st_size
+    assert destination.read_bytes() == source.read_bytes()
+
+
+def test_unsupported_fast_copy_falls_back_to_read_write(tmp_path, source, monkeypatch):
+    def unsupported(*args):
+        raise OSError(errno.EXDEV, "cihazlar arası")
+
+    monkeypatch.setattr(os, "copy_file_range", unsupported, raising=False)
+    monkeypatch.setattr(os, "sendfile", unsupported, raising=False)
+
+    destination = tmp_path / "hedef.bin"
+    assert _copy(source, destination) == source.stat().st_size
+    assert destination.read_bytes() == source.read_bytes()
+
+
+def test_empty_file_copies_nothing(tmp_path):
+    empty = tmp_path / "bos.bin"
+    empty.write_bytes(b"")
+    assert _copy(empty, tmp_path / "hedef.bin") == 0
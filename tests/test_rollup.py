@@ -0,0 +1,20 @@
+import time
+
+from journal import MOVE_OPS
+from rollup import RollupStore
+
+
+def _event(op, category="Images", size=100):
+    return {"ts": time.time(), "op": op, "category": category, "source": "/in/a.png", "bytes": size}
+
+
+def test_category_totals_can_be_limited_to_moves(tmp_path):
+    rollup = RollupStore(tmp_path / "rollup.db")
+    # Aynı dosya taşınıp sonra arşivlendi; bir kopyası da atlandı
+    rollup.add_many([_event("move"), _event("archive"), _event("duplicate")])
+    since = time.time() - 3600
+
+    assert rollup.totals_by("category", since)["Images"]["files"] == 3
+    assert rollup.totals_by("category", since, ops=MOVE_OPS) == {"Images": {"files": 1, "bytes": 100}}
+    assert set(rollup.totals_by("op", since)) == {"move", "archive", "duplicate"}
+    rollup.close()
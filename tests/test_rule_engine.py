@@ -0,0 +1,30 @@
+import logging
+
+import pytest
+
+from rule_engine import RuleEngine, _split_pattern
+
+
+def _engine(pattern):
+    model = {"name": "model", "pattern": pattern, "target": "Hedef", "active": True}
+    return RuleEngine([model], logging.getLogger("test"))
+
+
+@pytest.mark.parametrize("pattern, globs", [
+    ("my file*.pdf", ["my file*.pdf"]),
+    ("*.jpg, *.png", ["*.jpg", "*.png"]),
+    ("report final.docx, IMG_*", ["report final.docx", "img_*"]),
+])
+def test_globs_with_spaces_stay_globs(pattern, globs):
+    assert _split_pattern(pattern) == globs
+
+
+@pytest.mark.parametrize("pattern", ["ext:pdf", "size>1m and *.pdf", "(a or b)", "name:x*, *.png"])
+def test_field_terms_and_parentheses_make_an_expression(pattern):
+    assert _split_pattern(pattern) is None
+
+
+def test_glob_with_space_matches_file():
+    engine = _engine("my file*.pdf")
+    assert engine.match("My File 2024.pdf") is not None
+    assert engine.match("other.pdf") is None
@@ -0,0 +1,40 @@
+import logging
+import os
+
+from stability import StabilityTracker, _Pending
+
+
+def _tracker(**kwargs):
+    return StabilityTracker(lambda path: None, logging.getLogger("test"), exclusive_check=False, **kwargs)
+
+
+def test_old_mtime_is_not_stable_on_first_stat(tmp_path):
+    path = tmp_path / "eski.bin"
+    path.write_bytes(b"veri")
+    # Zaman damgası korunarak kopyalanmış gibi: mtime çok eski
+    os.utime(path, (1000, 1000))
+    tracker = _tracker(stable_seconds=1.0)
+    state = _Pending(tracker.min_interval)
+
+    delay = tracker._check(str(path), state)
+    assert delay is not None and delay > 0
+
+    # Bir stable_seconds aralığı boyunca değişmediği gözlendi
+    state.unchanged_since -= tracker.stable_seconds
+    assert tracker._check(str(path), state) is None
+
+
+def test_change_restarts_the_quiet_interval(tmp_path):
+    path = tmp_path / "yaziliyor.bin"
+    path.write_bytes(b"a")
+    tracker = _tracker(stable_seconds=1.0)
+    state = _Pending(tracker.min_interval)
+    tracker._check(str(path), state)
+    state.unchanged_since -= tracker.stable_seconds
+
+    path.write_bytes(b"ab")
+    assert tracker._check(str(path), state) is not None
+
+
+def test_default_waits_at_least_one_second():
+    assert _tracker().stable_seconds >= 1.0
@@ -8,8 +8,17 @@ sys.path.append(str(ROOT / 'src'))
 
 try:
     from filter_engine import FilterEngine
+    from filter_expr import FilterExpressionError
+    from planner import DEFAULT_PAGE_SIZE
 except Exception as e:
     FilterEngine = None
+    FilterExpressionError = ValueError
+    DEFAULT_PAGE_SIZE = 500
+
+try:
+    from reporter import get_stats, get_summary
+except Exception:
+    get_stats = get_summary = None
 
 app = Flask(__name__)
 
@@ -18,10 +27,79 @@ def run_filter():
     if not FilterEngine:
         return jsonify({'error': 'FilterEngine not available'}), 500
 
+    payload = normalize_payload(request.get_json(force=True))
+    mode = request.args.get('mode') or payload.get('organize_mode', 'organize')
+
+    engine = FilterEngine()
+    try:
+        results = engine.execute(payload, organize_mode=mode)
+        return jsonify(results)
+    except FilterExpressionError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/preview', methods=['POST'])
+def preview():
+    """Dry-run preview, one page at a time. Pass ?cursor=... to fetch the next page."""
+    if not FilterEngine:
+        return jsonify({'error': 'FilterEngine not available'}), 500
+
+    payload = normalize_payload(request.get_json(silent=True) or {})
+    try:
+        limit = max(1, int(request.args.get('limit', DEFAULT_PAGE_SIZE)))
+    except ValueError:
+        limit = DEFAULT_PAGE_SIZE
+
+    engine = FilterEngine()
+    try:
+        page = engine.preview(payload, limit=limit, cursor=request.args.get('cursor'))
+        if page is None:
+            return jsonify({'error': 'cursor expired'}), 410
+        return jsonify(page)
+    except FilterExpressionError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/execute-plan', methods=['POST'])
+def execute_plan():
+    """Apply a chosen subset of preview items without rescanning."""
+    if not FilterEngine:
+        return jsonify({'error': 'FilterEngine not available'}), 500
+
     payload = request.get_json(force=True)
+    engine = FilterEngine()
+    try:
+        return jsonify(engine.execute_plan(payload.get('items', [])))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/stats', methods=['GET'])
+def stats():
+    """Aggregated stats from the rollup store: ?period=24h|7d|week|30d&top=10"""
+    if not get_stats:
+        return jsonify({'error': 'reporter not available'}), 500
+
+    period = request.args.get('period', '24h')
+    try:
+        top = max(1, int(request.args.get('top', 10)))
+    except ValueError:
+        top = 10
+    try:
+        result = get_stats(period, top=top)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if result is None:
+        return jsonify({'error': 'rollup store not available'}), 503
+    result['all_time'] = get_summary()
+    return jsonify(result)
+
+def normalize_payload(payload):
     # Basic normalization
     payload.setdefault('extensions', [])
     payload.setdefault('categories', [])
+    payload.setdefault('expression', '')
     payload.setdefault('use_category_folders', True)
 
     # sizes
@@ -37,15 +115,7 @@ def run_filter():
 
     payload['size_min_mb'] = min_mb
     payload['size_max_mb'] = max_mb
-
-    mode = request.args.get('mode') or payload.get('organize_mode', 'organize')
-
-    engine = FilterEngine()
-    try:
-        results = engine.execute(payload, organize_mode=mode)
-        return jsonify(results)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    return payload
 
 if __name__ == '__main__':
     app.run(port=5000, debug=True)
@@ -83,10 +83,10 @@ def main():
         if event == 'Preview':
             # Try local first, otherwise remote
             if FilterEngine:
-                # For preview, call engine.scan_with_filters via execute (engine returns results)
-                run_local(payload, mode='organize')
+                # Dry-run: returns the plan without moving any file
+                run_local(payload, mode='preview')
             else:
-                post_remote(payload, mode)
+                post_remote(payload, 'preview')
 
         if event == 'Run':
             if FilterEngine: